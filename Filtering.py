@@ -1,16 +1,19 @@
 import os
 import glob
-import re
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from corpus_io import open_text
+from instrumentation import DISABLED, Instrumentation
+from keyword_matcher import KeywordMatcher
+from lexicon import load_lexicon
+from run_manifest import RunManifest
 
-# Anahtar kelimeler (kök + ek halleri)
-keywords = [r"\benflasyon\w*", r"\bzam\w*"]
+# Anahtar kelimeler (kök + ek halleri), inflation_lexicon.json'dan
+keywords = load_lexicon()["filter_keywords"]
 
-# Ana klasör
-base_path = r"C:\work\4th-Grade-Fall\CS401\DropboxBackUp\Ekonomi"
-
-# Çıktı klasörü
-output_dir = os.path.join(base_path, "Filtrelenmis_Haberler_Sadece_Kelimeler")
-os.makedirs(output_dir, exist_ok=True)
+# Tüm kalıplar tek regex'te derlenir; her satır tek aramayla taranır
+keyword_matcher = KeywordMatcher(keywords)
 
 def extract_keyword_blocks(lines, window=2):
     """
@@ -20,13 +23,9 @@ def extract_keyword_blocks(lines, window=2):
     - Yakın bloklar (<=5 satır) birleştirilir
     """
     matches = []
-    indices = []
 
-    # Anahtar kelimenin geçtiği satırları bul
-    for i, line in enumerate(lines):
-        lower_line = line.lower()
-        if any(re.search(pattern, lower_line) for pattern in keywords):
-            indices.append(i)
+    # Anahtar kelimenin geçtiği satırları bul (satır index'i, bulunan kelime)
+    indices = [i for i, _ in keyword_matcher.find_lines(lines)]
 
     if not indices:
         return matches
@@ -51,28 +50,205 @@ def extract_keyword_blocks(lines, window=2):
 
     return matches
 
-# Tüm haber kanallarını tara
-for channel_folder in os.listdir(base_path):
-    channel_path = os.path.join(base_path, channel_folder)
-    if not os.path.isdir(channel_path):
-        continue
 
-    txt_files = glob.glob(os.path.join(channel_path, "*.txt"))
-    for file_path in txt_files:
-        with open(file_path, "r", encoding="utf-8") as f:
-            # Satırları oku ve boşları çıkar
-            lines = [l.strip() for l in f.readlines() if l.strip()]
+def iter_keyword_blocks(lines, window=2, merge_distance=5):
+    """
+    extract_keyword_blocks ile aynı blokları akış halinde üretir (satır listeleri olarak).
+
+    lines: boş olmayan, strip edilmiş satırlar (liste veya herhangi bir iterator)
+    Dosyanın tamamı belleğe alınmaz; sadece son 'window' satır (geri bakış) ve
+    açık olan blok tutulur. Son anahtar kelimeden sonra merge_distance satır
+    boyunca yeni anahtar kelime çıkmazsa blok, son anahtar kelime + window
+    satıra kırpılıp verilir.
+    """
+    search = keyword_matcher.search
+    lookback = deque(maxlen=window)
+    # Son anahtar kelimeden bu kadar satır sonra blok kesin kapanır
+    limit = max(merge_distance, window)
+
+    block = None        # açık bloğun satırları
+    last_hit = 0        # açık bloktaki son anahtar kelime satırının index'i
+    block_end = 0       # son anahtar kelime satırının blok içindeki konumu
+    closed = deque()    # kapanmış ama sondaki bağlamı henüz tamamlanmamış bloklar
+                        # (sadece window > merge_distance iken dolabilir)
+
+    for i, line in enumerate(lines):
+        for item in closed:
+            if len(item[0]) < item[1]:
+                item[0].append(line)
+        while closed and len(closed[0][0]) >= closed[0][1]:
+            yield closed.popleft()[0]
+
+        hit = search(line) is not None
+
+        if block is not None and (i - last_hit > limit or (hit and i - last_hit > merge_distance)):
+            # Birleştirilemeyecek kadar uzak: açık blok kapanır (son anahtar kelime + window satıra kırpılır)
+            need = block_end + window + 1
+            trimmed = block[:need]
+            if len(trimmed) < need:
+                trimmed.append(line)    # bu satır da kapanan bloğun sondaki bağlamında
+            closed.append([trimmed, need])
+            block = None
+            while closed and len(closed[0][0]) >= closed[0][1]:
+                yield closed.popleft()[0]
+
+        if block is not None:
+            block.append(line)
+            if hit:
+                last_hit = i
+                block_end = len(block) - 1
+        elif hit:
+            block = list(lookback)
+            block.append(line)
+            last_hit = i
+            block_end = len(block) - 1
+
+        lookback.append(line)
+
+    # Dosya sonu: kalan bloklar eksik bağlamla (dosya sonuna kadar) verilir
+    for item in closed:
+        yield item[0]
+    if block is not None:
+        yield block[:block_end + window + 1]
+
+
+def iter_clean_lines(f):
+    # Satırları oku ve boşları çıkar
+    for l in f:
+        l = l.strip()
+        if l:
+            yield l
+
+
+def filter_file(file_path, output_path, window=2):
+    """
+    Tek dosyayı satır satır tarar; bulunan bloklar çıktı dosyasına hemen yazılır.
+    Blok yoksa çıktı dosyası oluşturulmaz (önceki çalıştırmadan kalan varsa silinir).
+    Bulunan blok sayısını döndürür.
+    Okuma / yazma hatasında yarım kalan çıktı dosyası silinir ve hata tekrar fırlatılır.
+    """
+    block_count = 0
+    out = None
+    try:
+        with open_text(file_path) as f:
+            for block in iter_keyword_blocks(iter_clean_lines(f), window=window):
+                if out is None:
+                    out = open(output_path, "w", encoding="utf-8")
+                else:
+                    out.write("\n\n")
+                out.write("\n".join(block))
+                block_count += 1
+    except BaseException:
+        if out is not None:
+            out.close()
+            out = None
+            os.remove(output_path)
+        raise
+    finally:
+        if out is not None:
+            out.close()
+    if block_count == 0 and os.path.exists(output_path):
+        # Örn. anahtar kelimeler değişti: eski çıktı artık geçerli değil
+        os.remove(output_path)
+    return block_count
+
+
+def _filter_job(job):
+    """
+    Havuzdaki işçiler için: (blok sayısı, None) ya da okunamayan dosyada (None, hata).
+    Hata fırlatılmaz, böylece tek bozuk dosya executor.map'i ve diğer sonuçları kaybettirmez.
+    """
+    try:
+        return filter_file(*job), None
+    except (OSError, UnicodeDecodeError) as e:
+        return None, e
 
-        relevant_blocks = extract_keyword_blocks(lines, window=2)
 
-        # Eğer blok varsa, kaydet
-        if relevant_blocks:
+def collect_filter_jobs(base_path, output_dir, manifest, window=2):
+    """
+    base_path altındaki kanal klasörlerinden işlenecek (değişen / yeni) dosyaları toplar.
+    """
+    jobs = []
+    for channel_folder in os.listdir(base_path):
+        channel_path = os.path.join(base_path, channel_folder)
+        # Çıktı klasörü de base_path altında: kanal gibi taranmasın
+        if not os.path.isdir(channel_path) or channel_path == output_dir:
+            continue
+
+        txt_files = glob.glob(os.path.join(channel_path, "*.txt"))
+        for file_path in txt_files:
             file_name = os.path.basename(file_path)
             output_path = os.path.join(output_dir, f"{channel_folder}_{file_name}")
 
-            with open(output_path, "w", encoding="utf-8") as out:
-                out.write("\n\n".join(relevant_blocks))
+            # Değişmemiş dosya: önceki çıktı hâlâ geçerli
+            previous = manifest.get_result(file_path)
+            if manifest.is_unchanged(file_path) and (previous["blocks"] == 0 or os.path.exists(output_path)):
+                continue
+
+            jobs.append((file_path, output_path, window))
+    return jobs
+
+
+def filter_channels(base_path, output_dir, workers=1, window=2, instrumentation=DISABLED):
+    """
+    Tüm haber kanallarını tarar. workers > 1 ise dosyalar süreç havuzuna
+    dağıtılır; manifest sadece ana süreçte, sonuçlar iş sırasıyla gelince güncellenir.
+    window: her bloğa önden / arkadan eklenen bağlam satırı sayısı
+    instrumentation: aşama süreleri (collect / filter) ve dosya / blok sayaçları
+    """
+    os.makedirs(output_dir, exist_ok=True)
+
+    # Daha önce işlenmiş dosyalar (değişmeyenler tekrar taranmaz);
+    # anahtar kelimeler ya da window değişirse manifest boş başlar
+    with instrumentation.stage("collect"):
+        config = {"filter_keywords": list(keywords), "window": window}
+        manifest = RunManifest(output_dir + ".manifest.json", config=config)
+        jobs = collect_filter_jobs(base_path, output_dir, manifest, window=window)
+
+    with instrumentation.stage("filter"):
+        if workers > 1 and len(jobs) > 1:
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+                results = executor.map(_filter_job, jobs, chunksize=max(1, len(jobs) // (workers * 8)))
+                results = list(results)
+        else:
+            results = [_filter_job(job) for job in jobs]
+
+    failed = 0
+    blocks = 0
+    for (file_path, _, _), (block_count, error) in zip(jobs, results):
+        if error is not None:
+            # Manifeste yazılmaz: bir sonraki çalıştırmada tekrar denenir
+            print(f"  ⚠ Dosya okunamadı {os.path.basename(file_path)}: {error}")
+            failed += 1
+            continue
+        if block_count:
+            print(f" {os.path.basename(file_path)}: {block_count} blok bulundu ve kaydedildi.")
+        manifest.record(file_path, {"blocks": block_count})
+        blocks += block_count
+
+    instrumentation.count("files", len(jobs) - failed)
+    instrumentation.count("failed_files", failed)
+    instrumentation.count("blocks", blocks)
+
+    manifest.save()
+
+
+if __name__ == "__main__":
+    # Ana klasör
+    base_path = r"C:\work\4th-Grade-Fall\CS401\DropboxBackUp\Ekonomi"
+
+    # Çıktı klasörü
+    output_dir = os.path.join(base_path, "Filtrelenmis_Haberler_Sadece_Kelimeler")
+
+    # Paralel işçi sayısı (1 = seri çalışma)
+    workers = os.cpu_count() or 1
+
+    # Aşama süreleri ve sayaçlar Filtering_run_report.json'a yazılır
+    instrumentation = Instrumentation("Filtering")
 
-            print(f" {file_name}: {len(relevant_blocks)} blok bulundu ve kaydedildi.")
+    filter_channels(base_path, output_dir, workers=workers, instrumentation=instrumentation)
 
-print("İşlem tamamlandı! Sadece ilgili kelime blokları kaydedildi.")
+    print("İşlem tamamlandı! Sadece ilgili kelime blokları kaydedildi.")
+    instrumentation.write_report("Filtering_run_report.json")
+    print(instrumentation.summary())
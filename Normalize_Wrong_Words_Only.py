@@ -1,50 +1,12 @@
 import os
 import glob
 import pandas as pd
-import re
-from MorphologicalAnalysis.FsmMorphologicalAnalyzer import FsmMorphologicalAnalyzer
-
-
-# --------------------------------------------------------
-#  Kelime Normalize Fonksiyonu
-# --------------------------------------------------------
-def normalize(word, fsm):
-
-    analysis = fsm.morphologicalAnalysis(word)
-    if analysis.size() > 0:
-        return word
-
-    word_upper = word.upper()
-    analysis_upper = fsm.morphologicalAnalysis(word_upper)
-    if analysis_upper.size() > 0:
-        return word_upper
-
-    n = len(word)
-    for i in range(1, n):
-
-        root = word[:i]
-        suffix = word[i:]
-
-        if not root or not suffix:
-            continue
-
-        root_analysis = fsm.morphologicalAnalysis(root)
-        if root_analysis.size() > 0:
-            return root + "'" + suffix
-
-        root_upper = root.upper()
-        root_upper_analysis = fsm.morphologicalAnalysis(root_upper)
-        if root_upper_analysis.size() > 0:
-            return root_upper + "'" + suffix
-
-    return word
-
-
-# --------------------------------------------------------
-#  Temizleme Fonksiyonu
-# --------------------------------------------------------
-def clean_word_keep_apostrophe(word):
-    return re.sub(r"[^a-zA-ZçÇğĞıİöÖşŞüÜ']", "", word)
+from corpus_io import read_text
+from fsm_cache import CachedFsmAnalyzer
+from instrumentation import Instrumentation
+from morphology_db import DEFAULT_DB_PATH
+from proper_name_filter import clean_word_keep_apostrophe
+from word_normalizer import WordNormalizer
 
 
 # --------------------------------------------------------
@@ -52,12 +14,18 @@ def clean_word_keep_apostrophe(word):
 # --------------------------------------------------------
 base_path = r"C:\work\4th-Grade-Fall\CS401\DropboxBackUp\Ekonomi-Yapilmayanlar"
 
-fsm = FsmMorphologicalAnalyzer()
+fsm = CachedFsmAnalyzer(store_path=DEFAULT_DB_PATH)
+
+# Her farklı kelime bir kez normalize edilir; kökler önce kök sözlüğünde aranır
+normalizer = WordNormalizer(fsm)
 
 results = []
 
 window = 5  # çevreden alınacak kelime sayısı
 
+# Aşama süreleri ve sayaçlar (Normalize_Wrong_Words_Only_run_report.json)
+instrumentation = Instrumentation("Normalize_Wrong_Words_Only")
+
 
 for channel_folder in os.listdir(base_path):
 
@@ -71,51 +39,59 @@ for channel_folder in os.listdir(base_path):
 
         file_name = os.path.basename(file_path)
 
-        with open(file_path, "r", encoding="utf-8") as f:
-            lines = f.read().splitlines()
-
-        for line in lines:
-
-            if not line.strip():
-                continue
+        with instrumentation.stage("read"):
+            lines = read_text(file_path).splitlines()
+        instrumentation.count("files")
+        instrumentation.count("lines", len(lines))
 
-            words = line.split()
+        with instrumentation.stage("normalize"):
+            for line in lines:
 
-            for i, w in enumerate(words):
-
-                w_clean = clean_word_keep_apostrophe(w)
-                if not w_clean:
+                if not line.strip():
                     continue
 
-                # --- FSM PARSE EDİYOR MU? ---
-                analysis = fsm.morphologicalAnalysis(w_clean)
+                words = line.split()
+
+                for i, w in enumerate(words):
 
-                if analysis.size() > 0:
-                    continue  # kelime doğru → geç
+                    w_clean = clean_word_keep_apostrophe(w)
+                    if not w_clean:
+                        continue
 
-                # --- normalize etmeyi dene ---
-                normalized = normalize(w_clean, fsm)
+                    # --- normalize etmeyi dene ---
+                    # (FSM kelimeyi parse ediyorsa normalize kelimenin kendisini döndürür → geç)
+                    normalized = normalizer.normalize(w_clean)
 
-                # normalize *gerçekten farklı sonuç üretmişse*
-                if normalized != w_clean:
+                    # normalize *gerçekten farklı sonuç üretmişse*
+                    if normalized != w_clean:
 
-                    start = max(0, i - window)
-                    end = min(len(words), i + window + 1)
-                    context = " ".join(words[start:end])
+                        start = max(0, i - window)
+                        end = min(len(words), i + window + 1)
+                        context = " ".join(words[start:end])
 
-                    results.append({
-                        "Haber Kanalı": channel_folder,
-                        "Dosya Adı": file_name,
-                        "Yanlış Kelime": w_clean,
-                        "Normalize Edilmiş": normalized,
-                        "Bağlam": context,
-                    })
+                        results.append({
+                            "Haber Kanalı": channel_folder,
+                            "Dosya Adı": file_name,
+                            "Yanlış Kelime": w_clean,
+                            "Normalize Edilmiş": normalized,
+                            "Bağlam": context,
+                        })
 
 
 # --------------------------------------------------------
 # CSV Kaydet
 # --------------------------------------------------------
-df = pd.DataFrame(results)
-df.to_csv("YANLIS_KELIMELER_NORMALIZE.csv", index=False, encoding="utf-8-sig")
+with instrumentation.stage("write"):
+    df = pd.DataFrame(results)
+    df.to_csv("YANLIS_KELIMELER_NORMALIZE.csv", index=False, encoding="utf-8-sig")
 
 print("Bitti! Toplam:", len(results), "YANLIŞ kelime bulundu ve normalize edildi.")
+print(normalizer.report())
+print(fsm.report())
+
+instrumentation.count("wrong_words", len(results))
+instrumentation.add_stats("normalizer", normalizer.stats())
+instrumentation.add_stats("fsm", fsm.stats())
+instrumentation.write_report("Normalize_Wrong_Words_Only_run_report.json")
+print(instrumentation.summary())
+fsm.close()
@@ -1,15 +1,26 @@
 import os
 import glob
-from MorphologicalAnalysis.FsmMorphologicalAnalyzer import FsmMorphologicalAnalyzer
+from corpus_io import read_text
+from fsm_cache import CachedFsmAnalyzer
+from instrumentation import DISABLED, Instrumentation
+from morphology_db import DEFAULT_DB_PATH, lexicon_version
+from run_manifest import RunManifest
 
-fsm = FsmMorphologicalAnalyzer()
+fsm = CachedFsmAnalyzer(store_path=DEFAULT_DB_PATH)
 
 
 # -------------------------------------------------------
 # 1) Tek kelime için en uygun parse'i seç
 # -------------------------------------------------------
-def choose_best_parse(word):
-    analysis = fsm.morphologicalAnalysis(word)
+def choose_best_parse(word, analyze=None):
+    analysis = (analyze or fsm.morphologicalAnalysis)(word)
+    return select_best_parse(analysis)
+
+
+def select_best_parse(analysis):
+    """
+    Hazır bir parse listesinden en uygun parse'i seçer (analizörü çağırmaz).
+    """
     parse_count = analysis.size()
 
     if parse_count == 0:
@@ -38,7 +49,11 @@ def choose_best_parse(word):
 # -------------------------------------------------------
 # 2) Bir dosyayı işleyip "kelime \t seçilmiş_parse" üret
 # -------------------------------------------------------
-def create_disambiguation_lines(text):
+def create_disambiguation_lines(text, analyze=None):
+    """
+    analyze verilirse kelime analizleri bu fonksiyondan alınır
+    (varsayılan: fsm.morphologicalAnalysis).
+    """
     sentences = text.split("\n")  # Day-2 sonrası her satır bir cümle
 
     output_lines = []
@@ -51,7 +66,7 @@ def create_disambiguation_lines(text):
         output_lines.append("<S>")  # cümle başlangıcı
 
         for token in tokens:
-            best_parse = choose_best_parse(token)
+            best_parse = choose_best_parse(token, analyze)
             output_lines.append(f"{token}\t{best_parse}")
 
         output_lines.append("</S>")
@@ -63,10 +78,14 @@ def create_disambiguation_lines(text):
 # -------------------------------------------------------
 # 3) Klasördeki tüm kanal klasörlerini ve txt dosyalarını tarayıp Day-3 üret
 # -------------------------------------------------------
-def process_directory_day3(base_path):
+def process_directory_day3(base_path, instrumentation=DISABLED):
     output_base = base_path + "-With-Selected-Parse"
     os.makedirs(output_base, exist_ok=True)
 
+    # Değişmeyen Split dosyaları (çıktısı duruyorsa) tekrar işlenmez;
+    # NlpToolkit sözlüğü güncellenirse manifest boş başlar, her dosya yeniden seçilir
+    manifest = RunManifest(output_base + ".manifest.json", config={"lexicon": lexicon_version()})
+
     # Base path altındaki her kanal klasörünü tarıyoruz
     for channel_name in os.listdir(base_path):
         channel_path = os.path.join(base_path, channel_name)
@@ -82,16 +101,27 @@ def process_directory_day3(base_path):
 
         for file_path in txt_files:
             file_name = os.path.basename(file_path)
+            out_file = os.path.join(output_channel_path, file_name)
 
-            with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-                text = f.read()
+            if manifest.is_up_to_date(file_path, outputs=[out_file]):
+                continue
 
-            disamb_lines = create_disambiguation_lines(text)
+            with instrumentation.stage("read"):
+                text = read_text(file_path)
 
-            out_file = os.path.join(output_channel_path, file_name)
-            with open(out_file, "w", encoding="utf-8") as out:
-                for line in disamb_lines:
-                    out.write(line + "\n")
+            with instrumentation.stage("select_parse"):
+                disamb_lines = create_disambiguation_lines(text)
+
+            with instrumentation.stage("write"):
+                with open(out_file, "w", encoding="utf-8") as out:
+                    for line in disamb_lines:
+                        out.write(line + "\n")
+
+            manifest.record(file_path)
+            instrumentation.count("files")
+            instrumentation.count("output_lines", len(disamb_lines))
+
+    manifest.save()
 
     print(f"Day-3 tamamlandı → {base_path} işlendi → Çıktı klasörü: {output_base}")
 
@@ -99,11 +129,21 @@ def process_directory_day3(base_path):
 # -------------------------------------------------------------------------
 # 3 klasör için çalıştır
 # -------------------------------------------------------------------------
-paths = [
-    r"C:\work\4th-Grade-Fall\CS401\DropboxBackUp\Ekonomi-Split",
-    r"C:\work\4th-Grade-Fall\CS401\DropboxBackUp\Ekonomi-Yapilanlar-Split",
-    r"C:\work\4th-Grade-Fall\CS401\DropboxBackUp\Ekonomi-Yapilmayanlar-Split"
-]
-
-for p in paths:
-    process_directory_day3(p)
+if __name__ == "__main__":
+    paths = [
+        r"C:\work\4th-Grade-Fall\CS401\DropboxBackUp\Ekonomi-Split",
+        r"C:\work\4th-Grade-Fall\CS401\DropboxBackUp\Ekonomi-Yapilanlar-Split",
+        r"C:\work\4th-Grade-Fall\CS401\DropboxBackUp\Ekonomi-Yapilmayanlar-Split"
+    ]
+
+    # Aşama süreleri ve sayaçlar Select_Parse_run_report.json'a yazılır
+    instrumentation = Instrumentation("Select_Parse")
+
+    for p in paths:
+        process_directory_day3(p, instrumentation=instrumentation)
+
+    print(fsm.report())
+    instrumentation.add_stats("fsm", fsm.stats())
+    instrumentation.write_report("Select_Parse_run_report.json")
+    print(instrumentation.summary())
+    fsm.close()
@@ -0,0 +1,120 @@
+import os
+from corpus_io import read_text
+from instrumentation import DISABLED, Instrumentation
+from Splitting import fsm, split_sentences_by_verb, collect_split_jobs, run_file_jobs
+from Select_Parse import create_disambiguation_lines
+
+
+# -------------------------------------------------------
+# 1) Tek okuma ile Split + Select_Parse
+# -------------------------------------------------------
+def split_and_select_file(file_path, split_output_path, parse_output_path):
+    """
+    Kaynak dosyayı bir kez okur.
+    Her kelime bir kez analiz edilir; aynı parse listesi hem VERB tabanlı cümle
+    ayırmada hem de en uygun parse seçiminde kullanılır.
+    Çıktılar Splitting.py ve Select_Parse.py'nin yazdığıyla birebir aynıdır.
+    """
+    text = read_text(file_path)
+
+    # Verb tabanlı noktalama (analizler dosya bazında saklanır)
+    analyses = {}
+    punctuated = split_sentences_by_verb(text, analyses=analyses)
+
+    # Cümlelere ayır (nokta -> cümle sınırı)
+    sentences = [s.strip() for s in punctuated.split(".") if s.strip()]
+
+    with open(split_output_path, "w", encoding="utf-8") as out:
+        for s in sentences:
+            out.write(s + "\n")
+
+    # Nokta ile bölünen kelimeler ("3.5" gibi) sözlükte yoksa önbellekten analiz edilir
+    def analyze(token):
+        analysis = analyses.get(token)
+        if analysis is None:
+            analysis = fsm.morphologicalAnalysis(token)
+        return analysis
+
+    disamb_lines = create_disambiguation_lines("\n".join(sentences), analyze=analyze)
+
+    with open(parse_output_path, "w", encoding="utf-8") as out:
+        for line in disamb_lines:
+            out.write(line + "\n")
+
+    fsm.flush()
+
+    return len(sentences)
+
+
+# -------------------------------------------------------
+# 2) Klasörleri tara, iki çıktı klasörünü birden üret
+# -------------------------------------------------------
+def collect_jobs(base_path):
+    """
+    "<klasör>-Split" ve "<klasör>-Split-With-Selected-Parse" çıktı yollarını hazırlar.
+    """
+    split_base, split_jobs = collect_split_jobs(base_path)
+    parse_base = split_base + "-With-Selected-Parse"
+
+    jobs = []
+    for file_path, split_output_path in split_jobs:
+        relative_path = os.path.relpath(split_output_path, split_base)
+        parse_output_path = os.path.join(parse_base, relative_path)
+        os.makedirs(os.path.dirname(parse_output_path), exist_ok=True)
+        jobs.append((file_path, split_output_path, parse_output_path))
+
+    return split_base, parse_base, jobs
+
+
+def process_directories(base_paths, workers=1, instrumentation=DISABLED):
+    with instrumentation.stage("collect"):
+        directories = [(base_path,) + collect_jobs(base_path) for base_path in base_paths]
+    jobs = [job for _, _, _, dir_jobs in directories for job in dir_jobs]
+
+    with instrumentation.stage("split_select_parse"):
+        results = run_file_jobs(split_and_select_file, jobs, workers=workers)
+
+    done = 0
+    for base_path, split_base, parse_base, dir_jobs in directories:
+        dir_results = results[done:done + len(dir_jobs)]
+        done += len(dir_jobs)
+
+        file_count = sentence_total = 0
+        for job, (sentence_count, error) in zip(dir_jobs, dir_results):
+            if error is not None:
+                print(f"  ⚠ Dosya işlenemedi {os.path.basename(job[0])}: {error}")
+                instrumentation.count("failed_files")
+                continue
+            file_count += 1
+            sentence_total += sentence_count
+
+        instrumentation.count("files", file_count)
+        instrumentation.count("sentences", sentence_total)
+        print(f"Split + Select_Parse tamamlandı → {base_path} ({file_count} dosya, {sentence_total} cümle)")
+        print(f"  → {split_base}")
+        print(f"  → {parse_base}")
+
+
+# -------------------------------------------------------------------------
+# 3 Ana klasör için çalıştır
+# -------------------------------------------------------------------------
+if __name__ == "__main__":
+    paths = [
+        r"C:\work\4th-Grade-Fall\CS401\DropboxBackUp\Ekonomi",
+        r"C:\work\4th-Grade-Fall\CS401\DropboxBackUp\Ekonomi-Yapilanlar",
+        r"C:\work\4th-Grade-Fall\CS401\DropboxBackUp\Ekonomi-Yapilmayanlar"
+    ]
+
+    # Paralel işçi sayısı (1 = seri çalışma)
+    workers = os.cpu_count() or 1
+
+    # Aşama süreleri ve sayaçlar Split_Select_Parse_run_report.json'a yazılır
+    instrumentation = Instrumentation("Split_Select_Parse")
+
+    process_directories(paths, workers=workers, instrumentation=instrumentation)
+
+    print(fsm.report())
+    instrumentation.add_stats("fsm", fsm.stats())
+    instrumentation.write_report("Split_Select_Parse_run_report.json")
+    print(instrumentation.summary())
+    fsm.close()
@@ -1,14 +1,23 @@
 import os
 import glob
-from MorphologicalAnalysis.FsmMorphologicalAnalyzer import FsmMorphologicalAnalyzer
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from corpus_io import read_text
+from fsm_cache import CachedFsmAnalyzer
+from instrumentation import DISABLED, Instrumentation
+from morphology_db import DEFAULT_DB_PATH, lexicon_version
+from run_manifest import RunManifest
 
-fsm = FsmMorphologicalAnalyzer()
+fsm = CachedFsmAnalyzer(store_path=DEFAULT_DB_PATH)
 
 
-def split_sentences_by_verb(text):
+def split_sentences_by_verb(text, analyses=None):
     """
     Verb POS görüldüğünde direkt NOKTA koyar.
     Sonraki kelime büyük harf kontrolü YOKTUR.
+
+    analyses sözlüğü verilirse her kelimenin parse listesi içine yazılır
+    (birleşik Split + Select_Parse aşaması aynı analizleri tekrar kullanır).
     """
     words = text.split()
     result_words = []
@@ -17,6 +26,8 @@ def split_sentences_by_verb(text):
         word = words[i]
 
         analysis = fsm.morphologicalAnalysis(word)
+        if analyses is not None:
+            analyses[word] = analysis
 
         if analysis.size() > 0:
             parse = analysis.getFsmParse(0)
@@ -32,11 +43,35 @@ def split_sentences_by_verb(text):
     return " ".join(result_words)
 
 
-def process_directory(base_path):
+def split_file(file_path, output_file_path):
     """
-    Verilen klasörü işler.
-    İçindeki kanalları ve text dosyalarını bulur ve VERB tabanlı cümle ayırma uygular.
-    Çıktıları yeni bir klasöre yazar.
+    Tek bir dosyayı okur, VERB tabanlı cümle ayırma uygular ve çıktıyı yazar.
+    Paralel modda işçi süreçlerde çalışır; yazılan cümle sayısını döndürür.
+    """
+    text = read_text(file_path)
+
+    # Verb tabanlı noktalama
+    punctuated = split_sentences_by_verb(text)
+
+    # Cümlelere ayır (nokta -> cümle sınırı)
+    sentences = [s.strip() for s in punctuated.split(".") if s.strip()]
+
+    # Yaz
+    with open(output_file_path, "w", encoding="utf-8") as out:
+        for s in sentences:
+            out.write(s + "\n")
+
+    # İşçi süreç kapanmadan yeni analizler veritabanına yazılsın
+    fsm.flush()
+
+    return len(sentences)
+
+
+def collect_split_jobs(base_path):
+    """
+    Verilen klasördeki kanalları ve text dosyalarını bulur.
+    Çıktı klasörlerini oluşturur ve (girdi, çıktı) dosya çiftlerini
+    sıralı olarak döndürür (kanal adı, dosya adı).
     """
 
     # Çıktı klasörü adı
@@ -45,8 +80,10 @@ def process_directory(base_path):
     # Yeni çıktı klasörünü oluştur
     os.makedirs(output_path, exist_ok=True)
 
+    jobs = []
+
     # Haber kanallarını tarıyoruz
-    for channel_folder in os.listdir(base_path):
+    for channel_folder in sorted(os.listdir(base_path)):
         channel_path = os.path.join(base_path, channel_folder)
 
         if not os.path.isdir(channel_path):
@@ -57,40 +94,135 @@ def process_directory(base_path):
         os.makedirs(output_channel_path, exist_ok=True)
 
         # Kanal klasöründeki tüm txt dosyaları
-        txt_files = glob.glob(os.path.join(channel_path, "*.txt"))
+        txt_files = sorted(glob.glob(os.path.join(channel_path, "*.txt")))
 
         for file_path in txt_files:
             file_name = os.path.basename(file_path)
+            jobs.append((file_path, os.path.join(output_channel_path, file_name)))
 
-            with open(file_path, "r", encoding="utf-8") as f:
-                text = f.read()
+    return output_path, jobs
 
-            # Verb tabanlı noktalama
-            punctuated = split_sentences_by_verb(text)
 
-            # Cümlelere ayır (nokta -> cümle sınırı)
-            sentences = [s.strip() for s in punctuated.split(".") if s.strip()]
+def _warm_up_worker():
+    # Her işçi kendi FsmMorphologicalAnalyzer'ını bir kez yükler
+    fsm.fsm
 
-            # Çıkış dosya yolu
-            output_file_path = os.path.join(output_channel_path, file_name)
 
-            # Yaz
-            with open(output_file_path, "w", encoding="utf-8") as out:
-                for s in sentences:
-                    out.write(s + "\n")
+def _run_file_job(item):
+    """
+    (fonksiyon, argümanlar) işini çalıştırır: (sonuç, None) ya da hata olursa (None, hata).
+    Hata fırlatılmaz; tek bozuk / okunamayan dosya executor.map'i ve diğer dosyaların
+    sonuçlarını kaybettirmez. NlpToolkit tuhaf girdide farklı hatalar da verebildiği
+    için tüm Exception'lar yakalanır (çağıran taraf hatayı raporlar).
+    """
+    func, args = item
+    try:
+        return func(*args), None
+    except Exception as e:
+        return None, e
 
-    print(f"Tamamlandı → {base_path} işlendi → Çıktı: {output_path}")
+
+def run_file_jobs(func, jobs, workers=1):
+    """
+    func(*job) her iş için çalıştırılır; [(sonuç, hata), ...] iş sırasıyla döner.
+
+    workers > 1 ise işler "spawn" süreç havuzuna dağıtılır: işçiler ana sürecin
+    SQLite bağlantısını devralmaz, her biri kendi analizörünü bir kez kurar.
+    func modül seviyesinde tanımlı olmalı (işçilere adıyla gönderilir).
+    """
+    items = [(func, job) for job in jobs]
+    if workers > 1 and len(jobs) > 1:
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                 initializer=_warm_up_worker) as executor:
+            return list(executor.map(_run_file_job, items,
+                                     chunksize=max(1, len(jobs) // (workers * 8))))
+    return [_run_file_job(item) for item in items]
+
+
+def process_directories(base_paths, workers=1, incremental=True, instrumentation=DISABLED):
+    """
+    Verilen klasörleri işler ve VERB tabanlı cümle ayırma uygular.
+    Çıktılar her klasör için "<klasör>-Split" altına yazılır.
+
+    workers > 1 ise tüm klasörlerin dosyaları tek bir süreç havuzuna dağıtılır.
+    Her dosya kendi çıktı dosyasına yazıldığı ve sonuçlar iş sırasıyla
+    toplandığı için çıktı, seri çalıştırmayla birebir aynıdır.
+
+    incremental=True ise "<klasör>-Split.manifest.json" ile son çalıştırmadan
+    beri değişmeyen (ve çıktısı duran) dosyalar atlanır. NlpToolkit sözlüğü
+    güncellenirse (lexicon_version) manifest boş başlar, her dosya yeniden ayrılır.
+
+    instrumentation: aşama süreleri (collect / split) ve dosya / cümle sayaçları
+    buraya yazılır (paralel modda süre ana süreçten ölçülür).
+    """
+    directories = []
+    with instrumentation.stage("collect"):
+        config = {"lexicon": lexicon_version()}
+        for base_path in base_paths:
+            output_path, dir_jobs = collect_split_jobs(base_path)
+            manifest = RunManifest(output_path + ".manifest.json", config=config)
+            if incremental:
+                dir_jobs = [job for job in dir_jobs if not manifest.is_up_to_date(job[0], outputs=job[1:])]
+            directories.append((base_path, output_path, manifest, dir_jobs))
+
+    jobs = [job for _, _, _, dir_jobs in directories for job in dir_jobs]
+
+    with instrumentation.stage("split"):
+        results = run_file_jobs(split_file, jobs, workers=workers)
+
+    done = 0
+    for base_path, output_path, manifest, dir_jobs in directories:
+        dir_results = results[done:done + len(dir_jobs)]
+        done += len(dir_jobs)
+
+        split_count = sentence_total = 0
+        for (file_path, _), (sentence_count, error) in zip(dir_jobs, dir_results):
+            if error is not None:
+                # Manifeste yazılmaz: bir sonraki çalıştırmada tekrar denenir
+                print(f"  ⚠ Dosya işlenemedi {os.path.basename(file_path)}: {error}")
+                instrumentation.count("failed_files")
+                continue
+            manifest.record(file_path, {"sentences": sentence_count})
+            split_count += 1
+            sentence_total += sentence_count
+        manifest.save()
+
+        instrumentation.count("files", split_count)
+        instrumentation.count("sentences", sentence_total)
+        print(f"Tamamlandı → {base_path} işlendi ({split_count} yeni/değişen dosya, {sentence_total} cümle) "
+              f"→ Çıktı: {output_path}")
+
+
+def process_directory(base_path, workers=1):
+    """
+    Tek klasör için process_directories kısayolu.
+    """
+    process_directories([base_path], workers=workers)
 
 
 # -------------------------------------------------------------------------
 # 3 Ana klasör için çalıştır
 # -------------------------------------------------------------------------
 
-paths = [
-    r"C:\work\4th-Grade-Fall\CS401\DropboxBackUp\Ekonomi",
-    r"C:\work\4th-Grade-Fall\CS401\DropboxBackUp\Ekonomi-Yapilanlar",
-    r"C:\work\4th-Grade-Fall\CS401\DropboxBackUp\Ekonomi-Yapilmayanlar"
-]
+if __name__ == "__main__":
+    paths = [
+        r"C:\work\4th-Grade-Fall\CS401\DropboxBackUp\Ekonomi",
+        r"C:\work\4th-Grade-Fall\CS401\DropboxBackUp\Ekonomi-Yapilanlar",
+        r"C:\work\4th-Grade-Fall\CS401\DropboxBackUp\Ekonomi-Yapilmayanlar"
+    ]
+
+    # Paralel işçi sayısı (1 = seri çalışma)
+    workers = os.cpu_count() or 1
+
+    # Aşama süreleri ve sayaçlar Splitting_run_report.json'a yazılır
+    instrumentation = Instrumentation("Splitting")
+
+    process_directories(paths, workers=workers, instrumentation=instrumentation)
 
-for p in paths:
-    process_directory(p)
+    # Paralel modda analizler işçilerde yapılır; bu rapor ana süreci gösterir
+    print(fsm.report())
+    instrumentation.add_stats("fsm", fsm.stats())
+    instrumentation.write_report("Splitting_run_report.json")
+    print(instrumentation.summary())
+    fsm.close()
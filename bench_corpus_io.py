@@ -0,0 +1,114 @@
+"""
+Corpus I/O Benchmark: filtering_02.py's old read_text_file() vs corpus_io.read_text
+
+Usage:
+    python bench_corpus_io.py [corpus_folder] [copies]
+
+Every transcript of the corpus is written 'copies' times into a temporary
+folder in three encodings (UTF-8, UTF-8 with BOM, cp1254), so the timed
+folder is a mixed-encoding corpus like the real Dropbox folders.
+
+The texts are also compared with the legacy reader: they differ only for
+UTF-8 files with broken bytes, which the legacy reader decoded as cp1254
+and corpus_io decodes as UTF-8 without the bad bytes (the fixture files
+are all cleanly encoded, so 0 differing files are expected here).
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from corpus_io import read_text, read_text_with_encoding
+from corpus_reader import list_channels, list_channel_files
+
+
+ENCODINGS = (('utf8', 'utf-8'), ('bom', 'utf-8-sig'), ('cp1254', 'cp1254'))
+
+
+def legacy_read_text_file(filepath):
+    """Copy of the function that was in filtering_02.py"""
+    try:
+        with open(filepath, "r", encoding="utf-8-sig") as f:
+            return f.read()
+    except:
+        pass
+
+    try:
+        with open(filepath, "r", encoding="cp1254") as f:
+            return f.read()
+    except:
+        pass
+
+    with open(filepath, "r", encoding="utf-8", errors="ignore") as f:
+        return f.read()
+
+
+def write_fixture(base_path, fixture_path, copies):
+    """Write every source transcript in every encoding; return the file paths"""
+    paths = []
+    for channel in list_channels(base_path):
+        for file_path in list_channel_files(base_path, channel):
+            text = read_text(file_path)
+            name = os.path.splitext(os.path.basename(file_path))[0]
+            for copy in range(copies):
+                for label, encoding in ENCODINGS:
+                    out_path = os.path.join(fixture_path, f"{channel}_{name}_{copy}_{label}.txt")
+                    with open(out_path, "w", encoding=encoding, errors="replace", newline="") as f:
+                        f.write(text)
+                    paths.append(out_path)
+    return paths
+
+
+def time_reader(read, paths, repeat=3):
+    """Return (best seconds, characters read) over 'repeat' runs"""
+    best = None
+    characters = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        characters = sum(len(read(p)) for p in paths)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, characters
+
+
+if __name__ == "__main__":
+    base_path = r"C:\work\4th-Grade-Fall\CS401\DropboxBackUp\Ekonomi"
+    copies = 3
+
+    if len(sys.argv) > 1:
+        base_path = sys.argv[1]
+    if len(sys.argv) > 2:
+        copies = int(sys.argv[2])
+
+    with tempfile.TemporaryDirectory() as fixture_path:
+        paths = write_fixture(base_path, fixture_path, copies)
+        total_bytes = sum(os.path.getsize(p) for p in paths)
+
+        print(f"Corpus : {base_path}")
+        print(f"Fixture: {len(paths)} files ({total_bytes / 1e6:.1f} MB, "
+              f"{', '.join(label for label, _ in ENCODINGS)})")
+        print()
+
+        readers = (
+            ("legacy", legacy_read_text_file),
+            ("read_text", read_text),
+            ("read_text(mmap)", lambda p: read_text(p, use_mmap=True)),
+        )
+        legacy_seconds = None
+        for name, read in readers:
+            seconds, characters = time_reader(read, paths)
+            legacy_seconds = legacy_seconds or seconds
+            print(f"{name:16s}: {seconds:8.3f} s  {total_bytes / seconds / 1e6:8.1f} MB/s  "
+                  f"({legacy_seconds / seconds:.1f}x)")
+
+        detected = {}
+        differing = 0
+        for p in paths:
+            text, encoding = read_text_with_encoding(p)
+            detected[encoding] = detected.get(encoding, 0) + 1
+            if text != legacy_read_text_file(p):
+                differing += 1
+
+        print(f"\nDetected encodings: {detected}")
+        print(f"Files with a different text: {differing} / {len(paths)}")
@@ -0,0 +1,96 @@
+"""
+Proper-Name Suffix Matcher Benchmark: is_proper_name_with_suffix() of
+test_fsm_2.py / test_fsm_3.py vs ProperNameFilter
+
+Usage:
+    python bench_proper_names.py [corpus_folder] [max_words]
+
+proper_names is filled like test_fsm_3.py does (every cleaned word, lowercase);
+the timed words are the cleaned corpus words, so most of them hit a suffix.
+"""
+
+import re
+import sys
+import time
+
+from corpus_reader import CorpusStream
+from proper_name_filter import ProperNameFilter, clean_word_keep_apostrophe
+
+
+proper_suffixes = [
+    "da", "de", "ta", "te",
+    "daki", "deki",
+    "dan", "den", "tan", "ten",
+    "ndan", "nden",
+    "nın", "nin", "nun", "nün",
+    "ın", "in", "un", "ün",
+    "a", "e",
+    "ya", "ye",
+    "ı", "i", "u", "ü"
+]
+
+
+def legacy_is_proper_name_with_suffix(word, proper_names):
+    """Copy of the function in test_fsm_3.py (proper_names passed in)"""
+    cleaned = re.sub(r"[^a-zA-ZçÇğĞıİöÖşŞüÜ']", "", word)
+    for suf in sorted(proper_suffixes, key=len, reverse=True):
+        if cleaned.lower().endswith(suf):
+            root = cleaned[:-len(suf)]
+            if root.lower() in proper_names:
+                return True
+    return False
+
+
+def time_matcher(match, words, repeat=3):
+    """Return (best seconds, number of matches) over 'repeat' runs"""
+    best = None
+    matches = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        matches = sum(1 for w in words if match(w))
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, matches
+
+
+if __name__ == "__main__":
+    base_path = r"C:\work\4th-Grade-Fall\CS401\DropboxBackUp\Ekonomi-Yapilmayanlar"
+    max_words = 500000
+
+    if len(sys.argv) > 1:
+        base_path = sys.argv[1]
+    if len(sys.argv) > 2:
+        max_words = int(sys.argv[2])
+
+    words = []
+    for line in CorpusStream(base_path):
+        for w in line.split():
+            w_clean = clean_word_keep_apostrophe(w)
+            if w_clean:
+                words.append(w_clean)
+        if len(words) >= max_words:
+            break
+    words = words[:max_words]
+
+    # Half of the words become proper names, so both hits and misses are timed
+    proper_names = {w.lower() for w in words[::2] if len(w) > 1}
+    name_filter = ProperNameFilter(proper_suffixes, proper_names)
+
+    print(f"Corpus      : {base_path}")
+    print(f"Words       : {len(words)}  (proper names: {len(proper_names)})")
+    print()
+
+    legacy_seconds, legacy_matches = time_matcher(
+        lambda w: legacy_is_proper_name_with_suffix(w, proper_names), words)
+    print(f"legacy      : {legacy_seconds:8.3f} s  {legacy_matches:8d} matches  "
+          f"{len(words) / legacy_seconds:12,.0f} words/s")
+
+    for name, match in (("filter", name_filter.is_proper_name_with_suffix),
+                        ("filter(pre)", name_filter.match_cleaned)):
+        seconds, matches = time_matcher(match, words)
+        print(f"{name:12s}: {seconds:8.3f} s  {matches:8d} matches  "
+              f"{len(words) / seconds:12,.0f} words/s  ({legacy_seconds / seconds:.1f}x)")
+
+    differing = sum(1 for w in words
+                    if legacy_is_proper_name_with_suffix(w, proper_names) != name_filter.match_cleaned(w))
+    print(f"\nWords with a different result: {differing} / {len(words)}")
@@ -0,0 +1,343 @@
+"""
+Benchmark Suite: throughput and peak memory of the pipeline on a synthetic corpus
+
+Usage:
+    python bench_suite.py [scales] [results_json] [baseline_json]
+
+    scales       : Comma separated file counts (default: 10,50,200)
+    results_json : Where the results are written (default: bench_results.json)
+    baseline_json: Results of an earlier run; every benchmark that became more
+                   than REGRESSION_TOLERANCE times slower is marked
+
+No private data is needed: for every scale a channel/file tree is generated
+from the word distributions in output/*_frequencies.csv (or FREQUENCIES.npz)
+next to this script, with a fixed random seed, so the same scale always
+gives the same corpus. Run news_analysis.py once first to create them.
+
+Timed at every scale:
+- tokenize_nltk / tokenize_fast: NewsTextAnalyzer.preprocess_text() over all lines
+- frequencies_nltk / frequencies_fast: update_channel_frequencies() for every
+  channel (reading + tokenizing + counting, with an empty cache)
+- keyword_filter: Filtering.filter_channels() (serial)
+- word_cloud: headless render_word_cloud() of the corpus-wide frequencies
+
+Seconds are the best of REPEAT runs; peak memory is measured with tracemalloc
+in one extra run (tracemalloc slows the code down, so it is not timed).
+"""
+
+import contextlib
+import datetime
+import io
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from Filtering import filter_channels
+from channel_comparison import load_channel_frequencies
+from corpus_reader import CorpusStream, list_channels, list_channel_files
+from news_analysis import (NewsTextAnalyzer, TOKENIZERS, render_word_cloud,
+                           update_channel_frequencies)
+from run_manifest import RunManifest, ResultStore
+
+
+REPEAT = 3
+REGRESSION_TOLERANCE = 1.25
+SEED = 2024
+
+# Frequency tables of news_analysis.py (independent of the working directory)
+FREQUENCIES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "output")
+
+# Words the frequency tables do not contain (stopwords and short words were
+# removed by news_analysis.py) but real transcripts are full of
+FILLER_WORDS = ('ve', 'bu', 'bir', 'da', 'de', 'ile', 'için', 'çok', 'daha', 'ama',
+                'gibi', 'değil', 'var', 'yok', 'olarak', 'şimdi', 'evet', 'yani',
+                'işte', 'kadar', 'sonra', 'önce', 'o', 'şu', 'mi', 'mı')
+FILLER_RATE = 0.3
+
+
+# ==============================================================================
+# SYNTHETIC CORPUS
+# ==============================================================================
+
+def word_distributions(channel_freqs, max_vocabulary=50000):
+    """
+    Turn {channel: {word: count}} into {channel: (words, probabilities)}
+
+    Only the max_vocabulary most frequent words of each channel are kept
+    (the long tail hardly changes the timings but makes sampling slower).
+    """
+    distributions = {}
+    for channel, freqs in channel_freqs.items():
+        top = sorted(freqs.items(), key=lambda item: (-item[1], item[0]))[:max_vocabulary]
+        if not top:
+            continue
+        words = np.array([w for w, _ in top], dtype=object)
+        counts = np.array([c for _, c in top], dtype=np.float64)
+        distributions[channel] = (words, counts / counts.sum())
+    return distributions
+
+
+def _capitalize(word):
+    # Turkish: 'i' -> 'İ' (str.capitalize would give 'I')
+    first = 'İ' if word[0] == 'i' else word[0].upper()
+    return first + word[1:]
+
+
+def generate_file_text(rng, words, probabilities, n_lines, words_per_line=(6, 18)):
+    """
+    One synthetic transcript: n_lines lines, a blank line between paragraphs,
+    sentence case, some commas, numbers and filler words
+    """
+    lengths = rng.integers(words_per_line[0], words_per_line[1] + 1, size=n_lines)
+    total = int(lengths.sum())
+
+    tokens = words[rng.choice(len(words), size=total, p=probabilities)]
+    fillers = rng.random(total) < FILLER_RATE
+    tokens[fillers] = rng.choice(np.array(FILLER_WORDS, dtype=object), size=int(fillers.sum()))
+    commas = rng.random(total) < 0.08
+    numbers = rng.random(total) < 0.02
+
+    lines = []
+    start = 0
+    next_paragraph = int(rng.integers(4, 9))
+    for n in lengths:
+        line_tokens = list(tokens[start:start + n])
+        for k in range(n - 1):
+            if numbers[start + k]:
+                line_tokens[k] = f"%{int(rng.integers(1, 100))}"
+            if commas[start + k]:
+                line_tokens[k] += ','
+        line_tokens[0] = _capitalize(line_tokens[0])
+        lines.append(' '.join(line_tokens) + '.')
+        start += n
+
+        next_paragraph -= 1
+        if next_paragraph == 0:
+            lines.append('')
+            next_paragraph = int(rng.integers(4, 9))
+
+    return '\n'.join(lines) + '\n'
+
+
+def generate_corpus(base_path, distributions, n_files, lines_per_file=200, seed=SEED):
+    """
+    Write n_files synthetic transcripts under base_path/<channel>/
+
+    Files are spread over the channels in turn and named like the real ones
+    (<channel>_YYYY-MM-DD.txt, one day per file of the channel).
+
+    Returns:
+    - {'files': n, 'lines': n, 'bytes': n}
+    """
+    rng = np.random.default_rng(seed)
+    channels = sorted(distributions)
+    first_day = datetime.date(2024, 1, 1)
+
+    stats = {'files': 0, 'lines': 0, 'bytes': 0}
+    for i in range(n_files):
+        channel = channels[i % len(channels)]
+        day = first_day + datetime.timedelta(days=i // len(channels))
+        words, probabilities = distributions[channel]
+
+        text = generate_file_text(rng, words, probabilities, lines_per_file)
+
+        channel_path = os.path.join(base_path, channel)
+        os.makedirs(channel_path, exist_ok=True)
+        file_path = os.path.join(channel_path, f"{channel}_{day.isoformat()}.txt")
+        with open(file_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+
+        stats['files'] += 1
+        stats['lines'] += text.count('\n')
+        stats['bytes'] += os.path.getsize(file_path)
+    return stats
+
+
+# ==============================================================================
+# BENCHMARKS
+# ==============================================================================
+
+def measure(func, repeat=REPEAT):
+    """
+    Run func(scratch_dir) 'repeat' times for the time and once more under
+    tracemalloc for the peak memory. Every run gets an empty scratch folder.
+
+    Returns:
+    - (best seconds, peak bytes, return value of the last run)
+    """
+    best = None
+    result = None
+    for _ in range(repeat):
+        scratch = tempfile.mkdtemp(prefix='bench_')
+        try:
+            start = time.perf_counter()
+            result = func(scratch)
+            elapsed = time.perf_counter() - start
+        finally:
+            shutil.rmtree(scratch, ignore_errors=True)
+        best = elapsed if best is None else min(best, elapsed)
+
+    scratch = tempfile.mkdtemp(prefix='bench_')
+    tracemalloc.start()
+    try:
+        func(scratch)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    return best, peak, result
+
+
+def tokenize_lines(analyzer, lines):
+    """Tokenize lines already in memory; returns the token count"""
+    return sum(len(analyzer.preprocess_text(line)) for line in lines)
+
+
+def count_frequencies(analyzer, base_path, scratch):
+    """update_channel_frequencies() for every channel with an empty cache"""
+    manifest = RunManifest(os.path.join(scratch, 'manifest.json'))
+    results = ResultStore(os.path.join(scratch, 'counts'))
+    total = None
+    for channel in list_channels(base_path):
+        word_freq, _, _, _ = update_channel_frequencies(
+            analyzer, channel, list_channel_files(base_path, channel), manifest, results)
+        total = word_freq if total is None else total + word_freq
+    return total
+
+
+def run_scale(base_path, corpus_stats):
+    """
+    All benchmarks on one generated corpus
+
+    Returns:
+    - List of result dicts (benchmark, seconds, throughput, unit, peak_mb)
+    """
+    rows = []
+
+    def add(name, seconds, peak, amount, unit):
+        rows.append({
+            'benchmark': name,
+            'seconds': round(seconds, 6),
+            'throughput': round(amount / seconds, 2) if seconds else None,
+            'unit': unit,
+            'peak_mb': round(peak / 1e6, 3),
+        })
+
+    lines = [line for line in CorpusStream(base_path) if line.strip()]
+    megabytes = corpus_stats['bytes'] / 1e6
+
+    word_freq = None
+    for engine in TOKENIZERS:
+        analyzer = NewsTextAnalyzer(tokenizer=engine)
+
+        seconds, peak, tokens = measure(lambda scratch: tokenize_lines(analyzer, lines))
+        add(f'tokenize_{engine}', seconds, peak, tokens, 'tokens/s')
+
+        seconds, peak, word_freq = measure(lambda scratch: count_frequencies(analyzer, base_path, scratch))
+        add(f'frequencies_{engine}', seconds, peak, megabytes, 'MB/s')
+
+    def keyword_filter(scratch):
+        # filter_channels() prints one line per file; keep the report readable
+        with contextlib.redirect_stdout(io.StringIO()):
+            filter_channels(base_path, os.path.join(scratch, 'filtered'), workers=1)
+
+    seconds, peak, _ = measure(keyword_filter)
+    add('keyword_filter', seconds, peak, megabytes, 'MB/s')
+
+    seconds, peak, _ = measure(
+        lambda scratch: render_word_cloud(word_freq, os.path.join(scratch, 'cloud.png'),
+                                          width=1600, height=800, max_words=150))
+    add('word_cloud', seconds, peak, 1, 'clouds/s')
+
+    return rows
+
+
+def compare_with_baseline(results, baseline):
+    """
+    Mark the benchmarks that got slower than REGRESSION_TOLERANCE x baseline
+
+    Only results on the same generated corpus (same file count and size)
+    are compared; adds 'baseline_ratio' (seconds / baseline seconds).
+
+    Returns:
+    - List of (scale, benchmark, ratio) for the regressions
+    """
+    def key(r):
+        return r['files'], r['bytes'], r['benchmark']
+
+    previous = {key(r): r['seconds'] for r in baseline['results']}
+    regressions = []
+    for r in results:
+        old = previous.get(key(r))
+        if old:
+            r['baseline_ratio'] = round(r['seconds'] / old, 3)
+            if r['baseline_ratio'] > REGRESSION_TOLERANCE:
+                regressions.append((r['files'], r['benchmark'], r['baseline_ratio']))
+    return regressions
+
+
+if __name__ == "__main__":
+    scales = (10, 50, 200)
+    results_path = "bench_results.json"
+    baseline_path = None
+
+    if len(sys.argv) > 1:
+        scales = tuple(int(n) for n in sys.argv[1].split(','))
+    if len(sys.argv) > 2:
+        results_path = sys.argv[2]
+    if len(sys.argv) > 3:
+        baseline_path = sys.argv[3]
+
+    distributions = word_distributions(load_channel_frequencies(FREQUENCIES_DIR))
+    if not distributions:
+        sys.exit(f"No channel frequency tables in {FREQUENCIES_DIR}; "
+                 f"run news_analysis.py first to create them")
+    print(f"Word distributions: {len(distributions)} channels from {FREQUENCIES_DIR}")
+
+    results = []
+    for n_files in scales:
+        with tempfile.TemporaryDirectory(prefix='bench_corpus_') as base_path:
+            corpus_stats = generate_corpus(base_path, distributions, n_files)
+            print(f"\nScale: {corpus_stats['files']} files, {corpus_stats['lines']} lines, "
+                  f"{corpus_stats['bytes'] / 1e6:.2f} MB")
+
+            for row in run_scale(base_path, corpus_stats):
+                row.update({'files': corpus_stats['files'], 'lines': corpus_stats['lines'],
+                            'bytes': corpus_stats['bytes']})
+                results.append(row)
+                print(f"  {row['benchmark']:18s}: {row['seconds']:8.3f} s  "
+                      f"{row['throughput']:14,.1f} {row['unit']:9s}  peak {row['peak_mb']:8.1f} MB")
+
+    report = {
+        'created': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'seed': SEED,
+        'repeat': REPEAT,
+        'results': results,
+    }
+
+    if baseline_path:
+        with open(baseline_path, 'r', encoding='utf-8') as f:
+            regressions = compare_with_baseline(results, json.load(f))
+        print(f"\nCompared with {baseline_path} (tolerance {REGRESSION_TOLERANCE}x):")
+        if regressions:
+            for files, name, ratio in regressions:
+                print(f"  REGRESSION {name} at {files} files: {ratio:.2f}x slower")
+        else:
+            print("  no regressions")
+
+    with open(results_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\nResults written to {results_path}")
+
+    if baseline_path and regressions:
+        sys.exit(1)
@@ -0,0 +1,67 @@
+"""
+Tokenizer Benchmark: NLTK path vs fast path of NewsTextAnalyzer.preprocess_text
+
+Usage:
+    python bench_tokenizer.py [corpus_folder] [max_lines]
+
+The transcripts are loaded into memory first, so only tokenization is timed.
+"""
+
+import sys
+import time
+
+from corpus_reader import CorpusStream
+from news_analysis import NewsTextAnalyzer
+
+
+def time_tokenizer(analyzer, lines, repeat=3):
+    """Return (best seconds, token count) over 'repeat' runs"""
+    best = None
+    token_count = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        token_count = 0
+        for line in lines:
+            token_count += len(analyzer.preprocess_text(line))
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, token_count
+
+
+if __name__ == "__main__":
+    base_path = r"C:\work\4th-Grade-Fall\CS401\DropboxBackUp\Ekonomi"
+    max_lines = 200000
+
+    if len(sys.argv) > 1:
+        base_path = sys.argv[1]
+    if len(sys.argv) > 2:
+        max_lines = int(sys.argv[2])
+
+    lines = []
+    for line in CorpusStream(base_path):
+        if line.strip():
+            lines.append(line)
+            if len(lines) >= max_lines:
+                break
+
+    print(f"Corpus: {base_path}")
+    print(f"Lines : {len(lines)} ({sum(len(l) for l in lines) / 1e6:.1f} M characters)")
+    print()
+
+    results = {}
+    for engine in ('nltk', 'fast'):
+        analyzer = NewsTextAnalyzer(tokenizer=engine)
+        seconds, tokens = time_tokenizer(analyzer, lines)
+        results[engine] = (seconds, tokens)
+        print(f"{engine:5s}: {seconds:8.3f} s  {tokens:10d} tokens  {tokens / seconds:12,.0f} tokens/s")
+
+    speedup = results['nltk'][0] / results['fast'][0]
+    print(f"\nSpeed-up (fast / nltk): {speedup:.1f}x")
+
+    # How often do the two engines give a different token list?
+    # (expected differences come from Turkish lowercasing of 'I' -> 'ı')
+    nltk_analyzer = NewsTextAnalyzer(tokenizer='nltk')
+    fast_analyzer = NewsTextAnalyzer(tokenizer='fast')
+    differing = sum(1 for line in lines
+                    if nltk_analyzer.preprocess_text(line) != fast_analyzer.preprocess_text(line))
+    print(f"Lines with different tokens: {differing} / {len(lines)}")
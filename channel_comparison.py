@@ -0,0 +1,180 @@
+"""
+Cross-Channel Comparison
+Finds the words each news channel emphasises compared to the other channels
+
+METHODS:
+-------
+1. TF-IDF per channel: every channel is one "document"; words used by every
+   channel get a low weight, words used by few channels a high one
+2. Weighted log-odds with an informative Dirichlet prior (Monroe, Colaresi &
+   Quinn, 2008, "Fightin' Words"): compares how often a channel uses a word
+   with how often all other channels use it. The prior (the word's count in
+   the whole corpus) keeps rare words from getting extreme scores; the
+   result is a z-score (above ~1.96 = clearly more frequent in this channel)
+
+All scores are computed with NumPy on one channel x term count matrix,
+so the full ALL_CHANNELS vocabulary is handled at once instead of word by word.
+"""
+
+import glob
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+
+def channel_term_matrix(channel_freqs):
+    """
+    Merge per-channel word counts into one channel x term matrix
+
+    Parameters:
+    - channel_freqs: {channel: Counter/dict of word -> count}
+
+    Returns:
+    - (channels, terms, counts) where counts is an int64 array of shape
+      (len(channels), len(terms)); terms are sorted alphabetically
+    """
+    channels = list(channel_freqs)
+    terms = sorted(set().union(*(freq.keys() for freq in channel_freqs.values())))
+    term_ids = {term: i for i, term in enumerate(terms)}
+
+    counts = np.zeros((len(channels), len(terms)), dtype=np.int64)
+    for row, channel in enumerate(channels):
+        freq = channel_freqs[channel]
+        columns = np.fromiter((term_ids[w] for w in freq.keys()), dtype=np.int64, count=len(freq))
+        counts[row, columns] = np.fromiter(freq.values(), dtype=np.int64, count=len(freq))
+    return channels, terms, counts
+
+
+def channel_tfidf(counts):
+    """
+    TF-IDF weight of every (channel, term) cell
+
+    tf  = count / total words of the channel
+    idf = ln((1 + channels) / (1 + channels using the word)) + 1
+    """
+    totals = counts.sum(axis=1, keepdims=True)
+    tf = counts / np.maximum(totals, 1)
+    df = (counts > 0).sum(axis=0)
+    idf = np.log((1 + counts.shape[0]) / (1 + df)) + 1.0
+    return tf * idf
+
+
+def log_odds_z_scores(counts, prior=None):
+    """
+    Weighted log-odds z-scores of every channel against all other channels
+
+    Parameters:
+    - counts: channel x term count matrix
+    - prior: Dirichlet prior per term (default: the term's corpus-wide count)
+
+    Returns:
+    - float64 array of the same shape as counts
+    """
+    counts = counts.astype(np.float64)
+    if prior is None:
+        prior = counts.sum(axis=0)
+    prior = np.asarray(prior, dtype=np.float64)
+    alpha0 = prior.sum()
+
+    y_i = counts                                       # this channel
+    y_j = counts.sum(axis=0) - counts                  # all other channels
+    n_i = counts.sum(axis=1, keepdims=True)
+    n_j = counts.sum() - n_i
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        log_odds_i = np.log(y_i + prior) - np.log(n_i + alpha0 - y_i - prior)
+        log_odds_j = np.log(y_j + prior) - np.log(n_j + alpha0 - y_j - prior)
+        variance = 1.0 / (y_i + prior) + 1.0 / (y_j + prior)
+        z = (log_odds_i - log_odds_j) / np.sqrt(variance)
+
+    # Words with no prior mass (never used) carry no information
+    return np.nan_to_num(z, nan=0.0, posinf=0.0, neginf=0.0)
+
+
+def top_indices(scores, n):
+    """Column indices of the n highest scores of one row, best first"""
+    n = min(n, len(scores))
+    if n == 0:
+        return np.array([], dtype=np.int64)
+    candidates = np.argpartition(-scores, n - 1)[:n]
+    return candidates[np.argsort(-scores[candidates], kind='stable')]
+
+
+def compare_channels(channel_freqs, top_n=20, min_count=5):
+    """
+    Distinctive words of every channel
+
+    Parameters:
+    - channel_freqs: {channel: Counter of word -> count}
+    - top_n: Number of words per channel
+    - min_count: Ignore words the channel used fewer times than this
+
+    Returns:
+    - DataFrame with one row per (channel, word): rank, count, share per
+      10,000 words, TF-IDF and log-odds z-score, sorted by z-score
+    """
+    channels, terms, counts = channel_term_matrix(channel_freqs)
+    tfidf = channel_tfidf(counts)
+    z = log_odds_z_scores(counts)
+    totals = counts.sum(axis=1)
+
+    rows = []
+    for c, channel in enumerate(channels):
+        scores = np.where(counts[c] >= min_count, z[c], -np.inf)
+        for rank, t in enumerate(top_indices(scores, top_n), 1):
+            if not np.isfinite(scores[t]):
+                break
+            rows.append({
+                'Kanal': channel,
+                'Sıra': rank,
+                'Kelime': terms[t],
+                'Sıklık': int(counts[c, t]),
+                'Onbinde': round(10000.0 * counts[c, t] / max(totals[c], 1), 2),
+                'TF-IDF': round(float(tfidf[c, t]), 6),
+                'Log-Odds Z': round(float(z[c, t]), 3),
+            })
+
+    return pd.DataFrame(rows, columns=['Kanal', 'Sıra', 'Kelime', 'Sıklık', 'Onbinde',
+                                       'TF-IDF', 'Log-Odds Z'])
+
+
+def load_channel_frequencies(output_dir):
+    """
+    Read the channel frequency tables written by news_analysis.py:
+    FREQUENCIES.npz or the <channel>_frequencies.csv files (ALL_CHANNELS is
+    left out), whichever was written last
+
+    Both formats can be in the same folder after runs with different
+    output_format settings, so the one with the newer mtime is used
+    (the NPZ file against the newest CSV).
+    """
+    csv_paths = [path for path in sorted(glob.glob(os.path.join(output_dir, "*_frequencies.csv")))
+                 if os.path.basename(path) != "ALL_CHANNELS_frequencies.csv"]
+
+    tables_path = os.path.join(output_dir, "FREQUENCIES.npz")
+    if os.path.exists(tables_path) and (
+            not csv_paths or os.path.getmtime(tables_path) >= max(map(os.path.getmtime, csv_paths))):
+        from frequency_store import FrequencyTables
+        tables = FrequencyTables.load(tables_path)
+        return {name: tables.counter(name) for name in tables.names}
+
+    channel_freqs = {}
+    for path in csv_paths:
+        channel = os.path.basename(path)[:-len("_frequencies.csv")]
+        df = pd.read_csv(path, encoding='utf-8-sig', keep_default_na=False)
+        channel_freqs[channel] = dict(zip(df['kelime'].astype(str), df['sıklık'].astype(np.int64)))
+    return channel_freqs
+
+if __name__ == "__main__":
+    output_dir = "output"
+    if len(sys.argv) > 1:
+        output_dir = sys.argv[1]
+
+    channel_freqs = load_channel_frequencies(output_dir)
+    comparison = compare_channels(channel_freqs)
+
+    comparison_csv = os.path.join(output_dir, "CHANNEL_COMPARISON.csv")
+    comparison.to_csv(comparison_csv, index=False, encoding='utf-8-sig')
+    print(f"✓ {len(channel_freqs)} kanal karşılaştırıldı: {comparison_csv}")
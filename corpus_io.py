@@ -0,0 +1,155 @@
+"""
+Corpus File I/O: read a transcript once, detect its encoding, decode once
+
+WHY?
+The transcripts are mostly UTF-8, but some were saved as Windows Turkish
+(cp1254). Trying one encoding after another with open() reads the whole file
+again for every attempt. Here the bytes are read once (optionally through
+mmap), a prefix sample decides which encoding to try first, and the same
+bytes are decoded again only if the sample guessed wrong.
+
+ENCODING CHOICE:
+1. BOM or UTF-8 sample -> utf-8-sig (a leading BOM is removed);
+   if a later part of the file is not valid UTF-8 (a few broken bytes in a
+   UTF-8 transcript), utf-8 with errors="ignore" (the bad bytes are dropped)
+2. Sample is not UTF-8 (more broken UTF-8 sequences than valid non-ASCII
+   characters, e.g. "ç" saved as the single cp1254 byte 0xE7) -> cp1254 (Windows Turkish), and utf-8 with
+   errors="ignore" if even cp1254 fails
+
+filtering_02.py's original read_text_file() tried cp1254 before the lossy
+UTF-8 decode in case 1 too, which turned a whole UTF-8 file with one bad
+byte into mojibake; apart from that the text is the same as before.
+Line endings are translated like text-mode open() does ("\\r\\n", "\\r" -> "\\n").
+"""
+
+import codecs
+import io
+import mmap
+
+
+LAST_RESORT = 'utf-8/ignore'
+SAMPLE_SIZE = 64 * 1024
+
+
+def read_bytes(file_path, use_mmap=False):
+    """
+    Read the raw bytes of a file in one go
+
+    With use_mmap=True the file is memory mapped instead of copied into a
+    bytes object (useful for very large transcripts). The returned mmap must
+    be closed by the caller (read_text() does this).
+    """
+    with open(file_path, 'rb') as f:
+        if use_mmap:
+            try:
+                return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty files cannot be mapped
+                return b""
+        return f.read()
+
+
+def detect_encoding(data, sample_size=SAMPLE_SIZE):
+    """
+    Guess the encoding from the BOM and a prefix sample of the bytes
+
+    A sample with a few broken bytes still counts as UTF-8 as long as it has
+    more valid non-ASCII characters than broken sequences (a cp1254 Turkish
+    text has practically no valid UTF-8 sequences), so a small UTF-8 file
+    with one bad byte is not read as cp1254.
+
+    Returns:
+    - 'utf-8-sig' if the file starts with a UTF-8 BOM or the sample is UTF-8
+    - 'cp1254' otherwise
+    """
+    if data[:3] == codecs.BOM_UTF8:
+        return 'utf-8-sig'
+
+    sample = data[:sample_size]
+    # final=False: a character cut at the end of the sample is not an error
+    final = len(sample) == len(data)
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=final)
+        return 'utf-8-sig'
+    except UnicodeDecodeError:
+        pass
+
+    text = codecs.getincrementaldecoder('utf-8')('replace').decode(sample, final=final)
+    broken = text.count('\ufffd')
+    non_ascii = sum(1 for char in text if char > '\x7f') - broken
+    return 'utf-8-sig' if non_ascii > broken else 'cp1254'
+
+
+def translate_newlines(text):
+    """Turn "\\r\\n" and "\\r" into "\\n" (what text-mode open() does)"""
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+
+def decode_text(data, encoding=None):
+    """
+    Decode bytes once, in the detected encoding if none is given
+
+    Parameters:
+    - data: bytes (or mmap)
+    - encoding: Decode strictly with this encoding instead (no detection,
+                no fallback; a wrong encoding raises UnicodeDecodeError)
+
+    Returns:
+    - (text, encoding used) where the detected encoding is 'utf-8-sig',
+      'cp1254' or 'utf-8/ignore'
+    """
+    if encoding is not None:
+        return translate_newlines(str(data, encoding)), encoding
+
+    detected = detect_encoding(data)
+    try:
+        return translate_newlines(str(data, detected)), detected
+    except UnicodeDecodeError:
+        # UTF-8 file with some broken bytes (or bytes cp1254 does not define):
+        # drop the bad bytes instead of reading the whole file as cp1254
+        return translate_newlines(str(data, 'utf-8-sig', 'ignore')), LAST_RESORT
+
+
+def read_text_with_encoding(file_path, use_mmap=False, encoding=None):
+    """read_text() that also returns which encoding was used"""
+    data = read_bytes(file_path, use_mmap=use_mmap)
+    try:
+        return decode_text(data, encoding=encoding)
+    finally:
+        if isinstance(data, mmap.mmap):
+            data.close()
+
+
+def read_text(file_path, use_mmap=False, encoding=None):
+    """
+    Read a whole transcript as text (one read, one decode in the common case)
+
+    Example:
+        text = read_text("ATV/2024-03-15.txt")
+    """
+    return read_text_with_encoding(file_path, use_mmap=use_mmap, encoding=encoding)[0]
+
+
+def open_text(file_path, encoding=None, sample_size=SAMPLE_SIZE):
+    """
+    Open a transcript for line-by-line reading in the detected encoding
+
+    Only the prefix sample is used for detection, so the file is still
+    streamed. Bytes later in the file that the detected encoding cannot
+    decode are dropped (errors="ignore", like read_text()'s last resort)
+    instead of raising UnicodeDecodeError in the middle of the stream.
+    An explicitly given encoding is used strictly.
+    """
+    if encoding is not None:
+        return open(file_path, 'r', encoding=encoding)
+
+    raw = open(file_path, 'rb')
+    try:
+        encoding = detect_encoding(raw.read(sample_size + 4), sample_size=sample_size)
+        raw.seek(0)
+    except Exception:
+        raw.close()
+        raise
+    return io.TextIOWrapper(raw, encoding=encoding, errors='ignore')
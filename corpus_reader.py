@@ -0,0 +1,145 @@
+"""
+Streaming Corpus Reader
+Reads the channel/file transcript tree line by line instead of loading
+every transcript into memory
+
+FOLDER LAYOUT:
+-------------
+base_path/
+    <channel>/        (one folder per news channel, e.g. ATV, SozcuTV)
+        <file>.txt    (one transcript per file)
+"""
+
+import datetime
+import glob
+import os
+import re
+
+from corpus_io import open_text
+
+
+def list_channels(base_path):
+    """Return the channel folder names under base_path (sorted)"""
+    return sorted(f for f in os.listdir(base_path)
+                  if os.path.isdir(os.path.join(base_path, f)))
+
+
+def list_channel_files(base_path, channel):
+    """Return the .txt transcript paths of one channel (sorted)"""
+    return sorted(glob.glob(os.path.join(base_path, channel, "*.txt")))
+
+
+# Date formats seen in transcript file names
+# (YYYY-MM-DD, YYYY_MM_DD, YYYYMMDD, DD.MM.YYYY, DD-MM-YYYY, DD_MM_YYYY)
+_DATE_PATTERNS = [
+    (re.compile(r'(?<!\d)(20\d\d)[-_.]?([01]\d)[-_.]?([0-3]\d)(?!\d)'), ('y', 'm', 'd')),
+    (re.compile(r'(?<!\d)([0-3]?\d)[-_.]([01]?\d)[-_.](20\d\d)(?!\d)'), ('d', 'm', 'y')),
+]
+
+
+def parse_broadcast_date(file_name):
+    """
+    Find the broadcast date in a transcript file name
+
+    Example: "ATV_2024-03-15.txt" -> datetime.date(2024, 3, 15)
+             "15.03.2024 Ana Haber.txt" -> datetime.date(2024, 3, 15)
+
+    Returns:
+    - datetime.date, or None if the name contains no valid date
+    """
+    name = os.path.basename(file_name)
+    for pattern, order in _DATE_PATTERNS:
+        for m in pattern.finditer(name):
+            parts = dict(zip(order, (int(g) for g in m.groups())))
+            try:
+                return datetime.date(parts['y'], parts['m'], parts['d'])
+            except ValueError:
+                continue
+    return None
+
+
+def iter_file_lines(file_path, encoding=None):
+    """
+    Yield the decoded lines of one file
+
+    The file is streamed and every line is decoded only when it is
+    requested (lazy decoding), so a file is never held in memory as a whole.
+
+    By default (encoding=None) the encoding is detected per file from a
+    prefix sample (see corpus_io.open_text), because the folders mix UTF-8
+    and cp1254 transcripts; undecodable bytes are dropped. With an explicit
+    encoding the lines are decoded strictly and a decoding error is raised
+    at the line where it happens.
+    """
+    if encoding is None:
+        with open_text(file_path) as f:
+            yield from f
+        return
+
+    with open(file_path, 'rb') as f:
+        for raw_line in f:
+            yield raw_line.decode(encoding)
+
+
+def iter_corpus(base_path, channels=None, encoding=None, on_error=None):
+    """
+    Yield (channel, file_path, line) for every line of every transcript
+
+    Parameters:
+    - base_path: Root folder (e.g. the Ekonomi folder)
+    - channels: Channel names to read (None = all channels)
+    - encoding: None = detect per file (see iter_file_lines)
+    - on_error: Called as on_error(file_path, exception) when a file cannot
+                be read; the rest of that file is skipped
+    """
+    if channels is None:
+        channels = list_channels(base_path)
+
+    for channel in channels:
+        for file_path in list_channel_files(base_path, channel):
+            try:
+                for line in iter_file_lines(file_path, encoding=encoding):
+                    yield channel, file_path, line
+            except (OSError, UnicodeDecodeError) as e:
+                if on_error is None:
+                    raise
+                on_error(file_path, e)
+
+
+class CorpusStream:
+    """
+    Re-iterable stream of transcript lines
+
+    Every 'for line in corpus' starts a new pass over the files, so the same
+    CorpusStream can be handed to NewsTextAnalyzer.extract_vocabulary() and
+    get_word_frequencies() one after the other. Only one line is in memory
+    at a time.
+
+    After a pass:
+    - files_read: Number of non-empty files that were read
+    - failed_files: [(file_path, error), ...] for files that could not be read
+    """
+
+    def __init__(self, base_path, channels=None, encoding=None):
+        self.base_path = base_path
+        self.channels = channels
+        self.encoding = encoding
+        self.files_read = 0
+        self.failed_files = []
+
+    def _on_error(self, file_path, error):
+        self.failed_files.append((file_path, error))
+
+    def __iter__(self):
+        self.files_read = 0
+        self.failed_files = []
+        non_empty_file = None
+
+        for _, file_path, line in iter_corpus(self.base_path, self.channels,
+                                              encoding=self.encoding,
+                                              on_error=self._on_error):
+            if file_path != non_empty_file and line.strip():
+                # First non-empty line of a new file
+                non_empty_file = file_path
+                self.files_read += 1
+            yield line
@@ -0,0 +1,294 @@
+"""
+Sparse Document-Term Matrix
+Stores word counts per document (transcript file) in CSR format, so that
+TF-IDF, channel comparisons and keyword queries are array operations
+instead of re-tokenizing the texts
+
+WHAT IS CSR?
+Compressed Sparse Row: for every document only the words it contains are stored
+- indices: term ids of the stored cells (int32), document after document
+- data:    the counts of those cells (uint32)
+- indptr:  where each document starts in indices/data (int64)
+           document d = indices[indptr[d]:indptr[d + 1]]
+
+EXAMPLE:
+doc 0: "zam zam enflasyon" -> {zam: 2, enflasyon: 1}
+doc 1: "enflasyon"         -> {enflasyon: 1}
+terms   = ['zam', 'enflasyon']
+indptr  = [0, 2, 3]
+indices = [0, 1, 1]
+data    = [2, 1, 1]
+"""
+
+import json
+import os
+from collections import Counter
+
+import numpy as np
+
+from corpus_reader import list_channels, list_channel_files, iter_file_lines, parse_broadcast_date
+
+
+class DocumentTermMatrix:
+    """
+    Vocabulary-indexed sparse document-term matrix built on NewsTextAnalyzer
+
+    Documents can be appended at any time (also after load()); new words get
+    the next free term id. The arrays grow by doubling, so views returned by
+    indptr / indices / data stay valid (they keep showing the matrix as it
+    was when they were taken). save() writes plain .npy files that load() opens
+    with memory mapping, so a large matrix is not read into RAM up front.
+    """
+
+    def __init__(self, analyzer=None):
+        """
+        Parameters:
+        - analyzer: NewsTextAnalyzer whose preprocess_text() turns texts into tokens
+                    (only needed when documents are added as raw text)
+        """
+        self.analyzer = analyzer
+        self.terms = []        # term id -> word
+        self.vocabulary = {}   # word -> term id
+        self.documents = []    # metadata per document (e.g. channel, file, date)
+
+        # Capacity-doubling buffers; only the first rows + 1 / nnz entries are used
+        self._indptr = np.zeros(16, dtype=np.int64)
+        self._indices = np.empty(64, dtype=np.int32)
+        self._data = np.empty(64, dtype=np.uint32)
+        self._growable = True
+
+    # ------------------------------------------------------------------
+    # Building
+    # ------------------------------------------------------------------
+
+    @property
+    def nnz(self):
+        """Number of stored cells"""
+        return int(self._indptr[len(self.documents)])
+
+    @staticmethod
+    def _grown(buffer, needed):
+        # New buffer with at least 'needed' entries (doubling); old views keep the old buffer
+        if needed <= len(buffer):
+            return buffer
+        grown = np.empty(max(needed, 2 * len(buffer)), dtype=buffer.dtype)
+        grown[:len(buffer)] = buffer
+        return grown
+
+    def _reserve(self, extra_cells):
+        # After load() the arrays may be read-only memory maps; copy them once
+        if not self._growable:
+            self._indptr = np.array(self._indptr, dtype=np.int64)
+            self._indices = np.array(self._indices, dtype=np.int32)
+            self._data = np.array(self._data, dtype=np.uint32)
+            self._growable = True
+
+        n_docs = len(self.documents)
+        self._indptr = self._grown(self._indptr, n_docs + 2)
+        self._indices = self._grown(self._indices, self.nnz + extra_cells)
+        self._data = self._grown(self._data, self.nnz + extra_cells)
+
+    def add_counts(self, counts, **metadata):
+        """
+        Append one document given as a word -> count mapping
+
+        Returns:
+        - Document id (row number)
+        """
+        vocabulary = self.vocabulary
+        row = []
+        new_words = []
+        for word, count in counts.items():
+            if count <= 0:
+                continue
+            term_id = vocabulary.get(word)
+            if term_id is None:
+                # The vocabulary is only updated once the row has been stored
+                term_id = len(self.terms) + len(new_words)
+                new_words.append(word)
+            row.append((term_id, count))
+        row.sort()
+
+        self._reserve(len(row))
+        start = self.nnz
+        end = start + len(row)
+        n_docs = len(self.documents)
+        if row:
+            self._indices[start:end] = [term_id for term_id, _ in row]
+            self._data[start:end] = [count for _, count in row]
+        self._indptr[n_docs + 1] = end
+
+        for word in new_words:
+            vocabulary[word] = len(self.terms)
+            self.terms.append(word)
+        self.documents.append(metadata)
+        return n_docs
+
+    def add_tokens(self, tokens, **metadata):
+        """Append one document given as a token list"""
+        return self.add_counts(Counter(tokens), **metadata)
+
+    def add_document(self, text, **metadata):
+        """Append one document given as raw text (cleaned with preprocess_text)"""
+        return self.add_tokens(self.analyzer.preprocess_text(text), **metadata)
+
+    def add_documents(self, texts):
+        """Append several raw texts; returns their document ids"""
+        return [self.add_document(text) for text in texts]
+
+    def add_corpus(self, base_path, channels=None, on_error=None):
+        """
+        Append every transcript file of the channel/file tree as one document
+
+        Files are read line by line (encoding detected per file); metadata is channel, file name and the
+        broadcast date from the file name (ISO string or None).
+        """
+        if channels is None:
+            channels = list_channels(base_path)
+
+        for channel in channels:
+            for file_path in list_channel_files(base_path, channel):
+                counts = Counter()
+                try:
+                    for line in iter_file_lines(file_path):
+                        counts.update(self.analyzer.preprocess_text(line))
+                except (OSError, UnicodeDecodeError) as e:
+                    if on_error is None:
+                        raise
+                    on_error(file_path, e)
+                    continue
+
+                date = parse_broadcast_date(file_path)
+                self.add_counts(counts, channel=channel, file=os.path.basename(file_path),
+                                date=date.isoformat() if date is not None else None)
+
+    # ------------------------------------------------------------------
+    # Array views
+    # ------------------------------------------------------------------
+
+    @property
+    def indptr(self):
+        return self._indptr[:len(self.documents) + 1]
+
+    @property
+    def indices(self):
+        return self._indices[:self.nnz]
+
+    @property
+    def data(self):
+        return self._data[:self.nnz]
+
+    @property
+    def shape(self):
+        return len(self.documents), len(self.terms)
+
+    def row_ids(self):
+        """Document id of every stored cell (same length as indices)"""
+        return np.repeat(np.arange(len(self.documents), dtype=np.int32), np.diff(self.indptr))
+
+    def to_scipy(self):
+        """scipy.sparse.csr_matrix view of the matrix (needs scipy)"""
+        from scipy.sparse import csr_matrix
+        return csr_matrix((self.data, self.indices, self.indptr), shape=self.shape)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def row(self, doc_id):
+        """Counter of one document"""
+        start, end = self.indptr[doc_id], self.indptr[doc_id + 1]
+        terms = self.terms
+        return Counter({terms[t]: int(c) for t, c in zip(self.indices[start:end], self.data[start:end])})
+
+    def column(self, word):
+        """
+        (document ids, counts) of one word across all documents
+
+        Returns empty arrays if the word is not in the vocabulary.
+        """
+        term_id = self.vocabulary.get(word)
+        if term_id is None:
+            return np.array([], dtype=np.int32), np.array([], dtype=np.uint32)
+        mask = self.indices == term_id
+        return self.row_ids()[mask], self.data[mask]
+
+    def term_counts(self):
+        """Total count of every term (array indexed by term id)"""
+        return np.bincount(self.indices, weights=self.data, minlength=len(self.terms)).astype(np.int64)
+
+    def document_frequency(self):
+        """Number of documents that contain each term"""
+        return np.bincount(self.indices, minlength=len(self.terms))
+
+    def group_counts(self, key):
+        """
+        Sum the rows by a metadata field (e.g. key='channel')
+
+        Returns:
+        - (group names, dense groups x terms int64 array)
+        """
+        groups = sorted({doc.get(key) for doc in self.documents}, key=lambda g: (g is None, g))
+        group_ids = {g: i for i, g in enumerate(groups)}
+        doc_groups = np.array([group_ids[doc.get(key)] for doc in self.documents], dtype=np.int64)
+
+        matrix = np.zeros((len(groups), len(self.terms)), dtype=np.int64)
+        np.add.at(matrix, (doc_groups[self.row_ids()], self.indices), self.data)
+        return groups, matrix
+
+    def tfidf(self, normalize=True):
+        """
+        TF-IDF weights of the stored cells
+
+        idf = ln((1 + N) / (1 + df)) + 1   (smoothed, N = number of documents)
+        With normalize=True every document vector gets length 1.
+
+        Returns:
+        - float64 array aligned with indices/data (same CSR structure)
+        """
+        n_docs = len(self.documents)
+        idf = np.log((1 + n_docs) / (1 + self.document_frequency())) + 1.0
+        weights = self.data.astype(np.float64) * idf[self.indices]
+
+        if normalize and len(weights):
+            row_ids = self.row_ids()
+            norms = np.sqrt(np.bincount(row_ids, weights=weights ** 2, minlength=n_docs))
+            weights /= norms[row_ids]
+        return weights
+
+    # ------------------------------------------------------------------
+    # Saving / loading
+    # ------------------------------------------------------------------
+
+    def save(self, directory):
+        """
+        Write the matrix to a folder:
+        indptr.npy, indices.npy, data.npy, terms.json, documents.json
+        """
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, "indptr.npy"), self.indptr)
+        np.save(os.path.join(directory, "indices.npy"), self.indices)
+        np.save(os.path.join(directory, "data.npy"), self.data)
+        with open(os.path.join(directory, "terms.json"), "w", encoding="utf-8") as f:
+            json.dump(self.terms, f, ensure_ascii=False)
+        with open(os.path.join(directory, "documents.json"), "w", encoding="utf-8") as f:
+            json.dump(self.documents, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, directory, analyzer=None, mmap=True):
+        """
+        Open a saved matrix; with mmap=True the arrays are memory mapped
+        (read from disk on demand). Appending documents makes an in-memory copy.
+        """
+        dtm = cls(analyzer)
+        mmap_mode = 'r' if mmap else None
+        dtm._indptr = np.load(os.path.join(directory, "indptr.npy"), mmap_mode=mmap_mode)
+        dtm._indices = np.load(os.path.join(directory, "indices.npy"), mmap_mode=mmap_mode)
+        dtm._data = np.load(os.path.join(directory, "data.npy"), mmap_mode=mmap_mode)
+        dtm._growable = False
+        with open(os.path.join(directory, "terms.json"), "r", encoding="utf-8") as f:
+            dtm.terms = json.load(f)
+        with open(os.path.join(directory, "documents.json"), "r", encoding="utf-8") as f:
+            dtm.documents = json.load(f)
+        dtm.vocabulary = {word: i for i, word in enumerate(dtm.terms)}
+        return dtm
@@ -1,89 +1,203 @@
 import os
 import shutil
-
-# Klasör yolları
-base_path = r"C:\work\4th-Grade-Fall\CS401\DropboxBackUp"
-ekonomi_path = os.path.join(base_path, "Ekonomi")
-ekonomi_yapilmayan_path = os.path.join(base_path, "Ekonomi-Yapilmayanlar")
-ekonomi_yapilan_path = os.path.join(base_path, "Ekonomi-Yapilanlar")
-
-# Ekonomi-Yapilanlar klasörünü oluştur (yoksa)
-os.makedirs(ekonomi_yapilan_path, exist_ok=True)
-
-# Kelimeler
-keywords = ["enflasyon", "zam"]
-
-def read_text_file(filepath):
-    try:
-        with open(filepath, "r", encoding="utf-8-sig") as f:
-            return f.read()
-    except:
-        pass
-
+import hashlib
+from corpus_io import read_bytes, decode_text
+from instrumentation import DISABLED, Instrumentation
+from keyword_matcher import KeywordMatcher
+from lexicon import load_lexicon
+from run_manifest import RunManifest
+
+# Anahtar kelimeler (kök + ek halleri), inflation_lexicon.json'dan; Filtering.py ile
+# aynı regex kalıpları (kalıplardaki (?!...) gibi kısıtlar da geçerli olur)
+keywords = load_lexicon()["filter_keywords"]
+keyword_matcher = KeywordMatcher(keywords)
+
+
+# -------------------------------------------------------
+# Klasör listesi (tek os.scandir çağrısı)
+# -------------------------------------------------------
+def scan_files(folder):
+    """
+    Klasördeki dosyaları {dosya adı: DirEntry} olarak döndürür (desktop.ini hariç).
+    Klasör yoksa boş sözlük döner. DirEntry.stat() listeleme sırasında gelen
+    bilgiyi kullanır, dosya başına ayrıca os.path.exists / os.stat gerekmez.
+    """
     try:
-        with open(filepath, "r", encoding="cp1254") as f:
-            return f.read()
-    except:
-        pass
+        with os.scandir(folder) as it:
+            return {entry.name: entry for entry in it
+                    if entry.is_file() and entry.name.lower() != "desktop.ini"}
+    except FileNotFoundError:
+        return {}
 
-    with open(filepath, "r", encoding="utf-8", errors="ignore") as f:
-        return f.read()
 
-
-# 1. Ekonomi'de olup Ekonomi-Yapilmayanlar'da olmayan dosyaları kopyala
-for channel in os.listdir(ekonomi_path):
-    ekonomi_channel_path = os.path.join(ekonomi_path, channel)
-    yapilmayan_channel_path = os.path.join(ekonomi_yapilmayan_path, channel)
-    yapilan_channel_path = os.path.join(ekonomi_yapilan_path, channel)
-
-    if not os.path.isdir(ekonomi_channel_path):
-        continue
+def scan_dirs(folder):
+    """Klasördeki alt klasörlerin adları (klasör yoksa boş)"""
+    try:
+        with os.scandir(folder) as it:
+            return sorted(entry.name for entry in it if entry.is_dir())
+    except FileNotFoundError:
+        return []
+
+
+# -------------------------------------------------------
+# Paragraf filtresi
+# -------------------------------------------------------
+def filter_text(text):
+    """Sadece anahtar kelime geçen paragrafları bırakır"""
+    paragraphs = [p.strip() for p in text.split("\n\n") if p.strip()]
+    filtered_paragraphs = [p for p in paragraphs if keyword_matcher.search(p)]
+    return "\n\n".join(filtered_paragraphs)
+
+
+def filter_file(source_file, target_file):
+    """
+    Kaynağı bir kez okur, filtrelenmiş metni hedefe bir kez yazar
+    (önce kopyalayıp sonra yerinde yeniden yazmaya gerek yok).
+    Kaynak içeriğinin sha1'ini döndürür (manifest için).
+    """
+    data = read_bytes(source_file)
+    text, _ = decode_text(data)
+    filtered = filter_text(text)
+
+    with open(target_file, "w", encoding="utf-8") as f:
+        f.write(filtered)
+
+    return hashlib.sha1(data).hexdigest()
+
+
+# -------------------------------------------------------
+# Ekonomi -> Ekonomi-Yapilanlar senkronizasyonu
+# -------------------------------------------------------
+def sync_channel(ekonomi_channel_path, yapilmayan_channel_path, yapilan_channel_path, manifest):
+    """
+    Ekonomi'de olup Ekonomi-Yapilmayanlar'da olmayan dosyaları Yapilanlar'a aktarır:
+    .txt dosyaları filtrelenerek yazılır, diğerleri kopyalanır. Kaynağın boyutu /
+    mtime'ı manifestteki kayıtla aynıysa ve hedef duruyorsa dosyaya dokunulmaz.
+
+    Her klasör bir kez listelenir. Döndürür: (işlenen, değişmeyen dosya adları,
+    Yapilanlar listesi {dosya adı: DirEntry}); liste filter_unsynced'e aktarılır,
+    klasör ikinci kez taranmaz.
+    """
+    sources = scan_files(ekonomi_channel_path)
+    skipped = scan_files(yapilmayan_channel_path).keys()
+    existing = scan_files(yapilan_channel_path)
 
     os.makedirs(yapilan_channel_path, exist_ok=True)
 
-    # Eğer Ekonomi-Yapilmayanlar'da kanal yoksa None olarak işarete gerek yok. Sadece kontrol yapacağız.
-    channel_has_yapilmayan = os.path.exists(yapilmayan_channel_path)
-
-    for file_name in os.listdir(ekonomi_channel_path):
+    processed = []
+    up_to_date = []
+    for file_name in sorted(sources.keys() - skipped):
+        entry = sources[file_name]
+        stat = entry.stat()
+        yapilan_file = os.path.join(yapilan_channel_path, file_name)
 
-        if file_name.lower() == "desktop.ini":
+        if file_name in existing and manifest.is_unchanged(entry.path, stat=stat):
+            up_to_date.append(file_name)
             continue
 
-        ekonomi_file = os.path.join(ekonomi_channel_path, file_name)
-        yapilan_file = os.path.join(yapilan_channel_path, file_name)
-
-        if channel_has_yapilmayan:
-            yapilmayan_file = os.path.join(yapilmayan_channel_path, file_name)
-            file_exists_in_yapilmayan = os.path.exists(yapilmayan_file)
+        if file_name.lower().endswith(".txt"):
+            sha1 = filter_file(entry.path, yapilan_file)
+            manifest.record(entry.path, stat=stat, sha1=sha1)
         else:
-            file_exists_in_yapilmayan = False
-
-        if not file_exists_in_yapilmayan:
-            shutil.copy2(ekonomi_file, yapilan_file)
-
-
-# 2. Yapilanlar klasöründeki dosyalarda sadece "enflasyon" ve "zam" geçen paragrafları bırak
-for channel in os.listdir(ekonomi_yapilan_path):
-    yapilan_channel_path = os.path.join(ekonomi_yapilan_path, channel)
-
-    if not os.path.isdir(yapilan_channel_path):
-        continue
-
-    for file_name in os.listdir(yapilan_channel_path):
-
-        if file_name.lower() == "desktop.ini":
+            shutil.copy2(entry.path, yapilan_file)  # filtrelenmeyecek, kopya yeterli
+            manifest.record(entry.path, stat=stat)
+        processed.append(file_name)
+
+    return processed, up_to_date, existing
+
+
+def filter_unsynced(yapilan_channel_path, synced, manifest, entries=None):
+    """
+    Yapilanlar'da olup Ekonomi'den gelmeyen .txt dosyaları yerinde filtrelenir;
+    bunlar kendi imzalarıyla takip edilir (değişmediyse tekrar filtrelenmez).
+    synced: sync_channel'ın bu kanalda ele aldığı dosya adları
+    entries: sync_channel'ın döndürdüğü Yapilanlar listesi (None = klasör taranır)
+    """
+    if entries is None:
+        entries = scan_files(yapilan_channel_path)
+
+    filtered = []
+    for file_name, entry in sorted(entries.items()):
+        if file_name in synced or not file_name.lower().endswith(".txt"):
             continue
-
-        if not file_name.lower().endswith(".txt"):
+        if manifest.is_unchanged(entry.path, stat=entry.stat()):
             continue
 
-        yapilan_file = os.path.join(yapilan_channel_path, file_name)
-        text = read_text_file(yapilan_file)
-
-        paragraphs = [p.strip() for p in text.split("\n\n") if p.strip()]
-        filtered_paragraphs = [p for p in paragraphs if any(k in p.lower() for k in keywords)]
-
-        with open(yapilan_file, "w", encoding="utf-8") as f:
-            f.write("\n\n".join(filtered_paragraphs))
-
-print("✅ İşlem tamamlandı! Ekonomi-Yapilanlar klasöründe filtrelenmiş dosyalar hazır.")
+        filter_file(entry.path, entry.path)
+        manifest.record(entry.path)  # filtrelenmiş haliyle kaydedilir
+        filtered.append(file_name)
+    return filtered
+
+
+def sync_ekonomi(ekonomi_path, ekonomi_yapilmayan_path, ekonomi_yapilan_path, instrumentation=DISABLED):
+    """
+    1. Ekonomi'de olup Ekonomi-Yapilmayanlar'da olmayan dosyaları filtreleyerek aktar
+    2. Yapilanlar'da elle eklenmiş / değişmiş dosyaları yerinde filtrele
+    3. Artık bulunmayan (silinmiş / Yapilmayanlar'a taşınmış) dosyaların
+       kayıtlarını manifestten sil
+    Döndürür: {"processed": n, "up_to_date": n, "filtered_in_place": n}
+    (aynı sayılar instrumentation sayaçlarına da yazılır)
+    """
+    os.makedirs(ekonomi_yapilan_path, exist_ok=True)
+
+    # Son çalıştırmada işlenen dosyalar: değişmeyen kaynaklar tekrar okunmaz
+    # (anahtar kelimeler değişirse manifest boş başlar, her şey yeniden filtrelenir)
+    manifest = RunManifest(ekonomi_yapilan_path + ".manifest.json",
+                           config={"filter_keywords": list(keywords)})
+
+    totals = {"processed": 0, "up_to_date": 0, "filtered_in_place": 0}
+    synced = {}    # kanal -> bu çalıştırmada ele alınan dosya adları
+    listings = {}  # kanal -> sync_channel'ın Yapilanlar listesi
+    live_paths = []  # manifestte kalacak dosyalar (kaynaklar + Yapilanlar)
+
+    with instrumentation.stage("sync"):
+        for channel in scan_dirs(ekonomi_path):
+            ekonomi_channel_path = os.path.join(ekonomi_path, channel)
+            processed, up_to_date, existing = sync_channel(
+                ekonomi_channel_path,
+                os.path.join(ekonomi_yapilmayan_path, channel),
+                os.path.join(ekonomi_yapilan_path, channel),
+                manifest,
+            )
+            synced[channel] = set(processed) | set(up_to_date)
+            listings[channel] = existing
+            live_paths.extend(os.path.join(ekonomi_channel_path, name) for name in synced[channel])
+            totals["processed"] += len(processed)
+            totals["up_to_date"] += len(up_to_date)
+
+    with instrumentation.stage("filter_in_place"):
+        for channel in scan_dirs(ekonomi_yapilan_path):
+            yapilan_channel_path = os.path.join(ekonomi_yapilan_path, channel)
+            entries = listings.get(channel)
+            if entries is None:
+                entries = scan_files(yapilan_channel_path)
+            filtered = filter_unsynced(yapilan_channel_path, synced.get(channel, set()), manifest,
+                                       entries=entries)
+            live_paths.extend(entry.path for entry in entries.values())
+            totals["filtered_in_place"] += len(filtered)
+
+    manifest.prune(live_paths)
+    manifest.save()
+    for name, n in totals.items():
+        instrumentation.count(name, n)
+    return totals
+
+
+if __name__ == "__main__":
+    # Klasör yolları
+    base_path = r"C:\work\4th-Grade-Fall\CS401\DropboxBackUp"
+    ekonomi_path = os.path.join(base_path, "Ekonomi")
+    ekonomi_yapilmayan_path = os.path.join(base_path, "Ekonomi-Yapilmayanlar")
+    ekonomi_yapilan_path = os.path.join(base_path, "Ekonomi-Yapilanlar")
+
+    # Aşama süreleri ve sayaçlar filtering_02_run_report.json'a yazılır
+    instrumentation = Instrumentation("filtering_02")
+
+    totals = sync_ekonomi(ekonomi_path, ekonomi_yapilmayan_path, ekonomi_yapilan_path,
+                          instrumentation=instrumentation)
+
+    print(f"Yeni / değişen dosya: {totals['processed']}, değişmeyen: {totals['up_to_date']}, "
+          f"Yapilanlar'da yerinde filtrelenen: {totals['filtered_in_place']}")
+    print("✅ İşlem tamamlandı! Ekonomi-Yapilanlar klasöründe filtrelenmiş dosyalar hazır.")
+    instrumentation.write_report("filtering_02_run_report.json")
+    print(instrumentation.summary())
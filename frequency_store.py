@@ -0,0 +1,122 @@
+"""
+Binary Frequency Tables
+Stores the word frequency tables of all channels in one compressed NPZ file
+instead of one <channel>_frequencies.csv + <channel>_vocabulary.txt per channel
+
+WHY?
+- Every word is stored once in a shared term dictionary; the tables only hold
+  integer term ids and counts
+- The vocabulary file is not needed: it is the sorted list of a table's words
+- The ALL_CHANNELS table is not stored: it is the sum of the channel tables
+- Loading is one np.load instead of parsing many CSV files
+
+FILE LAYOUT (output/FREQUENCIES.npz):
+- terms:    shared term dictionary (sorted)
+- names:    table (channel) names
+- offsets:  rows of table i are offsets[i]:offsets[i + 1]
+- term_ids: term of every row (int32)
+- counts:   count of every row (uint32)
+Rows of a channel table are in Counter.most_common() order, the same order
+news_analysis.py writes to <channel>_frequencies.csv: highest count first,
+words with the same count in the order they were first counted.
+The ALL_CHANNELS table (computed on read) has its ties in alphabetical
+order, so ALL_CHANNELS_frequencies.csv may list tied words differently.
+"""
+
+import numpy as np
+import pandas as pd
+from collections import Counter
+
+
+
+ALL_CHANNELS = "ALL_CHANNELS"
+
+
+class FrequencyTables:
+    """Word frequency tables of several channels over one shared term dictionary"""
+
+    def __init__(self, terms, names, offsets, term_ids, counts):
+        self.terms = np.asarray(terms, dtype=str)
+        self.names = [str(name) for name in names]
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.term_ids = np.asarray(term_ids, dtype=np.int32)
+        self.counts = np.asarray(counts, dtype=np.uint32)
+
+    @classmethod
+    def from_counters(cls, channel_freqs):
+        """
+        Build the tables from {channel: Counter} (e.g. news_analysis word_freq values)
+
+        Rows keep the Counter's most_common() order (ties in counting order).
+        """
+        names = list(channel_freqs)
+        terms = sorted(set().union(*(freq.keys() for freq in channel_freqs.values())))
+        term_index = {term: i for i, term in enumerate(terms)}
+
+        offsets = [0]
+        term_ids, counts = [], []
+        for name in names:
+            rows = [(term_index[word], count)
+                    for word, count in Counter(channel_freqs[name]).most_common() if count > 0]
+            term_ids.append(np.array([t for t, _ in rows], dtype=np.int64))
+            counts.append(np.array([c for _, c in rows], dtype=np.int64))
+            offsets.append(offsets[-1] + len(rows))
+
+        empty = np.array([], dtype=np.int64)
+        return cls(terms, names, offsets,
+                   np.concatenate(term_ids) if term_ids else empty,
+                   np.concatenate(counts) if counts else empty)
+
+    def _rows(self, name):
+        i = self.names.index(name)
+        return slice(self.offsets[i], self.offsets[i + 1])
+
+    def table_terms(self, name):
+        """Words of one table, most frequent first (numpy array)"""
+        if name == ALL_CHANNELS:
+            return self.dataframe(name)['kelime'].to_numpy()
+        return self.terms[self.term_ids[self._rows(name)]]
+
+    def counter(self, name):
+        """Counter of one table (name=ALL_CHANNELS gives the sum of all tables)"""
+        if name == ALL_CHANNELS:
+            return sum((self.counter(n) for n in self.names), Counter())
+        rows = self._rows(name)
+        return Counter(dict(zip(self.terms[self.term_ids[rows]].tolist(),
+                                self.counts[rows].tolist())))
+
+    def dataframe(self, name):
+        """
+        Table with the same columns as <channel>_frequencies.csv (kelime, sıklık)
+
+        ALL_CHANNELS: highest total first, ties alphabetical
+        """
+        if name == ALL_CHANNELS:
+            totals = np.bincount(self.term_ids, weights=self.counts,
+                                 minlength=len(self.terms)).astype(np.int64)
+            columns = np.flatnonzero(totals)
+            columns = columns[np.lexsort((columns, -totals[columns]))]
+            return pd.DataFrame({'kelime': self.terms[columns], 'sıklık': totals[columns]})
+
+        rows = self._rows(name)
+        return pd.DataFrame({'kelime': self.terms[self.term_ids[rows]],
+                             'sıklık': self.counts[rows].astype(np.int64)})
+
+    def vocabulary(self, name):
+        """Sorted vocabulary of one table (the old <channel>_vocabulary.txt)"""
+        return sorted(self.table_terms(name).tolist())
+
+    def save(self, path):
+        np.savez_compressed(
+            path,
+            terms=self.terms,
+            names=np.asarray(self.names, dtype=str),
+            offsets=self.offsets,
+            term_ids=self.term_ids,
+            counts=self.counts,
+        )
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(**{key: data[key] for key in data.files})
@@ -0,0 +1,153 @@
+from collections import OrderedDict
+
+from morphology_db import MorphologyDatabase
+
+
+# -------------------------------------------------------
+# Önbellekte saklanan hafif parse nesneleri
+# -------------------------------------------------------
+class CachedParse:
+    """
+    FsmParse'in hafif kopyası.
+    Scriptlerin kullandığı getPos() ve str(parse) davranışını korur.
+    """
+    __slots__ = ("pos", "text")
+
+    def __init__(self, pos, text):
+        self.pos = pos
+        self.text = text
+
+    def getPos(self):
+        return self.pos
+
+    def __str__(self):
+        return self.text
+
+    def __repr__(self):
+        return f"CachedParse({self.text!r})"
+
+
+class CachedParseList:
+    """
+    FsmParseList yerine döndürülen liste.
+    size() ve getFsmParse(i) ile FsmParseList gibi kullanılabilir.
+    """
+    __slots__ = ("parses",)
+
+    def __init__(self, parses):
+        self.parses = tuple(parses)
+
+    def size(self):
+        return len(self.parses)
+
+    def getFsmParse(self, index):
+        return self.parses[index]
+
+    def __len__(self):
+        return len(self.parses)
+
+    def __iter__(self):
+        return iter(self.parses)
+
+
+def to_cached_parse_list(fsm_parse_list):
+    """FsmParseList -> CachedParseList"""
+    parses = []
+    for i in range(fsm_parse_list.size()):
+        parse = fsm_parse_list.getFsmParse(i)
+        parses.append(CachedParse(parse.getPos(), str(parse)))
+    return CachedParseList(parses)
+
+
+# -------------------------------------------------------
+# Ortak analiz önbelleği
+# -------------------------------------------------------
+class CachedFsmAnalyzer:
+    """
+    FsmMorphologicalAnalyzer önüne konan önbellek katmanı.
+
+    - Bellekte sınırlı LRU (en son kullanılan max_size kelime)
+    - İsteğe bağlı kalıcı depo (store_path verilirse MorphologyDatabase, yüzey biçimi -> parse listesi)
+    - hits / store_hits / misses sayaçları
+
+    Her yüzey biçimi bir çalıştırmada FSM'e sadece bir kez sorulur; depo kullanılıyorsa
+    daha önceki çalıştırmalarda görülmüş kelimeler hiç analiz edilmez.
+    """
+
+    def __init__(self, fsm=None, max_size=200000, store_path=None):
+        self._fsm = fsm
+        self.max_size = max_size
+        self._cache = OrderedDict()
+        self._store_path = store_path
+        self._store = None
+
+        self.hits = 0        # bellekten gelen
+        self.store_hits = 0  # diskten gelen
+        self.misses = 0      # FSM'e giden
+
+    @property
+    def fsm(self):
+        # Analizör ilk ihtiyaç anında yüklenir (yüklemesi birkaç saniye sürer)
+        if self._fsm is None:
+            from MorphologicalAnalysis.FsmMorphologicalAnalyzer import FsmMorphologicalAnalyzer
+            self._fsm = FsmMorphologicalAnalyzer()
+        return self._fsm
+
+    @property
+    def store(self):
+        # Depo da ilk sorguda açılır; sadece import eden scriptler bedel ödemez
+        if self._store is None and self._store_path:
+            self._store = MorphologyDatabase(self._store_path)
+        return self._store
+
+    def morphologicalAnalysis(self, word):
+        parses = self._cache.get(word)
+        if parses is not None:
+            self._cache.move_to_end(word)
+            self.hits += 1
+            return parses
+
+        if self.store is not None:
+            stored = self.store.get(word)
+            if stored is not None:
+                parses = CachedParseList(CachedParse(pos, text) for pos, text in stored)
+                self.store_hits += 1
+
+        if parses is None:
+            self.misses += 1
+            parses = to_cached_parse_list(self.fsm.morphologicalAnalysis(word))
+            if self.store is not None:
+                self.store.put(word, [(p.pos, p.text) for p in parses])
+
+        self._cache[word] = parses
+        if len(self._cache) > self.max_size:
+            self._cache.popitem(last=False)  # en eski kelimeyi at
+
+        return parses
+
+    def stats(self):
+        total = self.hits + self.store_hits + self.misses
+        return {
+            "lookups": total,
+            "hits": self.hits,
+            "store_hits": self.store_hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits + self.store_hits) / total if total else 0.0,
+            "cached_words": len(self._cache),
+        }
+
+    def report(self):
+        s = self.stats()
+        return (f"FSM önbellek: {s['lookups']} sorgu, {s['hits']} bellek + "
+                f"{s['store_hits']} disk isabeti, {s['misses']} analiz "
+                f"(isabet oranı %{s['hit_rate'] * 100:.1f})")
+
+    def flush(self):
+        # Bekleyen depo yazmalarını diske işle (örn. paralel işçilerde dosya sonunda)
+        if self._store is not None:
+            self._store.flush()
+
+    def close(self):
+        if self._store is not None:
+            self._store.close()
+            self._store = None
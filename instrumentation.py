@@ -0,0 +1,199 @@
+"""
+Run Instrumentation: where does the time of a pipeline run go?
+
+WHY?
+The scripts print what they found, but not how long each step took. To see
+which stage is worth optimising on a corpus refresh (reading, tokenizing,
+morphological analysis, writing CSVs, rendering word clouds ...), every run
+can collect:
+
+- Stage timers: total seconds and number of calls per stage name
+  (context manager: with instrumentation.stage('tokenize'): ...,
+   decorators: @instrumentation.timed('csv') for functions,
+               @timed('word_cloud') for methods of NewsTextAnalyzer)
+- Counters: files, lines, tokens, analyzer calls ...
+- Stats: dicts that other objects already keep (e.g. CachedFsmAnalyzer.stats())
+- Optional cProfile dump of the whole run (profile_path=...)
+
+At the end write_report() saves everything as one JSON file and summary()
+gives a short text version for the console.
+
+Stages may be nested (e.g. 'read' inside 'channel'); each stage counts its
+own wall time, so nested stage times add up to more than the run time.
+"""
+
+import cProfile
+import datetime
+import functools
+import json
+import os
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+
+class Instrumentation:
+    """
+    Stage timers, counters and an optional profiler for one run
+
+    Parameters:
+    - name: Name of the run (e.g. the script name), stored in the report
+    - enabled: False = every call is a no-op (nothing is timed or counted)
+    - profile_path: If given, the run is profiled with cProfile from now on
+                    and the stats are dumped here by write_report()
+                    (open with: python -m pstats <profile_path>)
+    """
+
+    def __init__(self, name, enabled=True, profile_path=None):
+        self.name = name
+        self.enabled = enabled
+        self.profile_path = profile_path if enabled else None
+
+        self.started = datetime.datetime.now()
+        self._start = time.perf_counter()
+
+        self.stage_seconds = Counter()
+        self.stage_calls = Counter()
+        self.counters = Counter()
+        self.stats = {}
+
+        self._profiler = None
+        if self.profile_path:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+
+    @contextmanager
+    def stage(self, name):
+        """Time the code inside the with block under the stage 'name'"""
+        if not self.enabled:
+            yield
+            return
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stage_seconds[name] += time.perf_counter() - start
+            self.stage_calls[name] += 1
+
+    def timed(self, name=None):
+        """
+        Decorator version of stage() for plain functions
+
+        Example:
+            @instrumentation.timed('csv')
+            def write_tables(...): ...
+        """
+        def decorator(func):
+            stage_name = name or func.__name__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.stage(stage_name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def count(self, name, n=1):
+        """Add n to the counter 'name' (e.g. count('tokens', len(tokens)))"""
+        if self.enabled:
+            self.counters[name] += n
+
+    def add_stats(self, name, stats):
+        """Store a stats dict of another object (e.g. add_stats('fsm', fsm.stats()))"""
+        if self.enabled:
+            self.stats[name] = dict(stats)
+
+    def elapsed(self):
+        """Seconds since the instrumentation was created"""
+        return time.perf_counter() - self._start
+
+    def report(self):
+        """
+        The collected numbers as a JSON-ready dict
+
+        Stages are ordered by total time (slowest first); 'share' is the
+        stage's part of the whole run time.
+        """
+        wall_seconds = self.elapsed()
+        stages = {}
+        for name, seconds in self.stage_seconds.most_common():
+            stages[name] = {
+                'seconds': round(seconds, 6),
+                'calls': self.stage_calls[name],
+                'share': round(seconds / wall_seconds, 4) if wall_seconds else 0.0,
+            }
+
+        return {
+            'name': self.name,
+            'started': self.started.isoformat(timespec='seconds'),
+            'wall_seconds': round(wall_seconds, 6),
+            'stages': stages,
+            'counters': dict(sorted(self.counters.items())),
+            'stats': self.stats,
+            'profile': self.profile_path,
+        }
+
+    def stop_profile(self):
+        """Stop the profiler and dump its stats to profile_path (if profiling)"""
+        if self._profiler is None:
+            return None
+        self._profiler.disable()
+        self._profiler.dump_stats(self.profile_path)
+        self._profiler = None
+        return self.profile_path
+
+    def write_report(self, path):
+        """
+        Save report() as JSON (and the cProfile stats, if profiling)
+
+        Returns:
+        - path (None if the instrumentation is disabled)
+        """
+        if not self.enabled:
+            return None
+
+        self.stop_profile()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, ensure_ascii=False, indent=2)
+        return path
+
+    def summary(self):
+        """Short console version of the report (one line per stage)"""
+        report = self.report()
+        lines = [f"Çalışma süresi ({self.name}): {report['wall_seconds']:.2f} s"]
+        for name, stage in report['stages'].items():
+            lines.append(f"  {name:20s}: {stage['seconds']:9.3f} s  %{stage['share'] * 100:5.1f}  "
+                         f"({stage['calls']} çağrı)")
+        if report['counters']:
+            lines.append("  Sayaçlar: " + ", ".join(f"{k}={v}" for k, v in report['counters'].items()))
+        return "\n".join(lines)
+
+
+# Shared no-op instance: used when a caller does not pass an instrumentation
+DISABLED = Instrumentation('disabled', enabled=False)
+
+
+def timed(name, attribute='instrumentation'):
+    """
+    Decorator for methods of objects that keep an Instrumentation
+
+    The stage is timed with the instance's own instrumentation
+    (self.<attribute>), so every analyzer reports into its own run.
+
+    Example:
+        class NewsTextAnalyzer:
+            @timed('word_cloud')
+            def create_word_cloud(self, ...): ...
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with getattr(self, attribute).stage(name):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
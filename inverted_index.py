@@ -0,0 +1,385 @@
+"""
+Positional Inverted Index with Keyword-in-Context (KWIC) Queries
+Finds every occurrence of a word in the transcripts, with its surrounding
+words, by looking it up in an index instead of reading the whole corpus
+
+WHAT IS AN INVERTED INDEX?
+For every word it stores where the word occurs (a "posting"):
+    "enflasyon" -> (file 3, line 12, byte offset 2048, word 4), (file 3, line 40, ...), ...
+A query reads the postings of one word, then seeks directly to those lines
+to show the context window (the same +-5 words the test_fsm_*.py scripts build).
+
+WORDS:
+Lines are split on whitespace like the FSM scripts do (line.split()); the
+index key is the word with non-letters removed and Turkish-aware lowercasing
+("Enflasyon'u," -> "enflasyonu", "İTHALAT" -> "ithalat").
+
+ENCODINGS:
+Every file's encoding is detected once from a prefix sample (see
+corpus_io.detect_encoding) and saved in files.json; the byte offsets start
+after a UTF-8 BOM, and kwic() decodes the lines it seeks to with the saved
+encoding. Undecodable bytes are dropped on both sides, so positions match.
+
+ON DISK (one folder):
+- files.json:    base path + (channel, relative path, size, mtime_ns,
+                 encoding) of every file
+- terms.json:    sorted index keys
+- offsets.npy:   postings of term t are postings.bin[offsets[t]:offsets[t + 1]]
+- postings.bin:  delta-encoded varints, 4 numbers per posting:
+                 file gap, line, byte offset, word position (line / offset /
+                 position are stored as differences to the previous posting
+                 when it is in the same file / line)
+"""
+
+import bisect
+import json
+import mmap
+import os
+import re
+import sys
+from collections import namedtuple
+
+import codecs
+
+import numpy as np
+
+from corpus_io import SAMPLE_SIZE, detect_encoding
+from corpus_reader import list_channels, list_channel_files
+
+
+Posting = namedtuple('Posting', ['channel', 'file_path', 'line_no', 'offset', 'position'])
+
+NON_LETTER_PATTERN = re.compile(r"[^a-zA-ZçÇğĞıİöÖşŞüÜ]")
+
+
+def index_key(word):
+    """Index key of a raw word: letters only, Turkish-aware lowercase"""
+    return NON_LETTER_PATTERN.sub("", word).replace('İ', 'i').replace('I', 'ı').lower()
+
+
+# ----------------------------------------------------------------------
+# Varint coding (7 bits per byte, high bit = more bytes follow)
+# ----------------------------------------------------------------------
+
+def _encode_varint(value, out):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _decode_varints(buffer):
+    values = []
+    value = shift = 0
+    for byte in buffer:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            values.append(value)
+            value = shift = 0
+    return values
+
+
+class _PostingsWriter:
+    """Delta-encodes the postings of one term while the corpus is read"""
+
+    __slots__ = ('buffer', 'file_id', 'line_no', 'offset', 'position')
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.file_id = -1   # the first posting always starts a "new file"
+        self.line_no = self.offset = self.position = 0
+
+    def add(self, file_id, line_no, offset, position):
+        out = self.buffer
+        file_gap = file_id - self.file_id
+        _encode_varint(file_gap, out)
+        if file_gap:
+            _encode_varint(line_no, out)
+            _encode_varint(offset, out)
+            _encode_varint(position, out)
+        else:
+            _encode_varint(line_no - self.line_no, out)
+            _encode_varint(offset - self.offset, out)
+            _encode_varint(position - self.position if line_no == self.line_no else position, out)
+        self.file_id, self.line_no, self.offset, self.position = file_id, line_no, offset, position
+
+
+def _decode_postings(buffer):
+    """Yield (file_id, line_no, offset, position) from one term's postings"""
+    values = _decode_varints(buffer)
+    file_id = -1
+    line_no = offset = position = 0
+    for i in range(0, len(values), 4):
+        file_gap, line_field, offset_field, position_field = values[i:i + 4]
+        if file_gap:
+            file_id += file_gap
+            line_no, offset, position = line_field, offset_field, position_field
+        else:
+            position = position + position_field if line_field == 0 else position_field
+            line_no += line_field
+            offset += offset_field
+        yield file_id, line_no, offset, position
+
+
+class InvertedIndex:
+    """
+    Positional inverted index over the channel/file transcript tree
+
+    Build once with InvertedIndex.build(base_path) and save(); later runs
+    load() the folder and query it with postings() / kwic().
+    """
+
+    def __init__(self, base_path, files, terms, offsets, postings):
+        self.base_path = base_path
+        self.files = files          # [{'channel', 'path', 'size', 'mtime_ns', 'encoding'}, ...]
+        self.terms = terms          # sorted index keys
+        self.offsets = offsets      # int64 array, len(terms) + 1
+        self._postings = postings   # bytes / mmap of all postings
+
+    # ------------------------------------------------------------------
+    # Building
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def build(cls, base_path, channels=None, on_error=None):
+        """
+        Read every transcript once and index every word
+
+        Parameters:
+        - base_path: Root folder (e.g. the Ekonomi folder)
+        - channels: Channel names to index (None = all)
+        - on_error: Called as on_error(file_path, exception) for files that
+                    cannot be read (they are left out of the index)
+        """
+        if channels is None:
+            channels = list_channels(base_path)
+
+        writers = {}
+        files = []
+        for channel in channels:
+            for file_path in list_channel_files(base_path, channel):
+                file_id = len(files)
+                file_writers = []
+                try:
+                    stat = os.stat(file_path)
+                    with open(file_path, 'rb') as f:
+                        encoding = detect_encoding(f.read(SAMPLE_SIZE + 4))
+                        f.seek(0)
+                        # Offsets are counted from the start of the file, after the BOM
+                        offset = len(codecs.BOM_UTF8) if f.read(3) == codecs.BOM_UTF8 else 0
+                        f.seek(offset)
+                        for line_no, raw_line in enumerate(f):
+                            for position, word in enumerate(raw_line.decode(encoding, 'ignore').split()):
+                                key = index_key(word)
+                                if key:
+                                    file_writers.append((key, line_no, offset, position))
+                            offset += len(raw_line)
+                except (OSError, UnicodeDecodeError) as e:
+                    if on_error is None:
+                        raise
+                    on_error(file_path, e)
+                    continue
+
+                # Only complete files are added to the index
+                for key, line_no, offset, position in file_writers:
+                    writer = writers.get(key)
+                    if writer is None:
+                        writer = writers[key] = _PostingsWriter()
+                    writer.add(file_id, line_no, offset, position)
+
+                files.append({
+                    'channel': channel,
+                    'path': os.path.relpath(file_path, base_path),
+                    'size': stat.st_size,
+                    'mtime_ns': stat.st_mtime_ns,
+                    'encoding': encoding,
+                })
+
+        terms = sorted(writers)
+        offsets = np.zeros(len(terms) + 1, dtype=np.int64)
+        postings = bytearray()
+        for i, term in enumerate(terms):
+            postings += writers[term].buffer
+            offsets[i + 1] = len(postings)
+        return cls(base_path, files, terms, offsets, bytes(postings))
+
+    # ------------------------------------------------------------------
+    # Saving / loading
+    # ------------------------------------------------------------------
+
+    def save(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, "files.json"), "w", encoding="utf-8") as f:
+            json.dump({'base_path': self.base_path, 'files': self.files}, f, ensure_ascii=False)
+        with open(os.path.join(directory, "terms.json"), "w", encoding="utf-8") as f:
+            json.dump(self.terms, f, ensure_ascii=False)
+        np.save(os.path.join(directory, "offsets.npy"), self.offsets)
+        with open(os.path.join(directory, "postings.bin"), "wb") as f:
+            f.write(self._postings)
+
+    @classmethod
+    def load(cls, directory, base_path=None):
+        """
+        Open a saved index; postings.bin is memory mapped, not read into RAM
+
+        base_path: Corpus folder if it moved since the index was built
+        """
+        with open(os.path.join(directory, "files.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        with open(os.path.join(directory, "terms.json"), "r", encoding="utf-8") as f:
+            terms = json.load(f)
+        offsets = np.load(os.path.join(directory, "offsets.npy"), mmap_mode='r')
+
+        postings = b""
+        postings_path = os.path.join(directory, "postings.bin")
+        if os.path.getsize(postings_path) > 0:
+            with open(postings_path, "rb") as f:
+                postings = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        return cls(base_path or meta['base_path'], meta['files'], terms, offsets, postings)
+
+    def _is_stale(self, entry):
+        try:
+            stat = os.stat(os.path.join(self.base_path, entry['path']))
+        except OSError:
+            return True
+        return (stat.st_size, stat.st_mtime_ns) != (entry['size'], entry['mtime_ns'])
+
+    def stale_files(self):
+        """Indexed files that changed or disappeared since the index was built"""
+        return [os.path.join(self.base_path, entry['path'])
+                for entry in self.files if self._is_stale(entry)]
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def _term_id(self, key):
+        i = bisect.bisect_left(self.terms, key)
+        return i if i < len(self.terms) and self.terms[i] == key else None
+
+    def expand(self, prefix):
+        """
+        Index keys that start with prefix (e.g. 'enflasyon' -> enflasyon,
+        enflasyonu, enflasyonun, ...), like the r"\\benflasyon\\w*" patterns
+        """
+        prefix = index_key(prefix)
+        start = bisect.bisect_left(self.terms, prefix)
+        end = bisect.bisect_left(self.terms, prefix + '\U0010ffff')
+        return self.terms[start:end]
+
+    def postings(self, word, prefix=False):
+        """
+        Every occurrence of a word, as Posting tuples in corpus order
+
+        prefix=True also returns the words that start with word (suffixed forms)
+        """
+        keys = self.expand(word) if prefix else [index_key(word)]
+        found = []
+        for key in keys:
+            term_id = self._term_id(key)
+            if term_id is None:
+                continue
+            buffer = self._postings[self.offsets[term_id]:self.offsets[term_id + 1]]
+            for file_id, line_no, offset, position in _decode_postings(buffer):
+                entry = self.files[file_id]
+                found.append((file_id, line_no, position,
+                              Posting(entry['channel'], os.path.join(self.base_path, entry['path']),
+                                      line_no, offset, position)))
+        found.sort(key=lambda item: item[:3])
+        return [posting for *_, posting in found]
+
+    def count(self, word, prefix=False):
+        """Number of occurrences of a word"""
+        return len(self.postings(word, prefix=prefix))
+
+    def kwic(self, word, window=5, prefix=False, skip_stale=False):
+        """
+        Keyword in context: yield one dict per occurrence
+
+        Every line is read with one seek to its byte offset; a line with
+        several hits is read only once, and decoded with the encoding saved
+        for its file at build time.
+
+        The byte offsets are only valid for the files as they were indexed,
+        so the size / mtime of every file is checked before it is read. A
+        file that changed or disappeared (see stale_files()) raises
+        ValueError, or is left out with skip_stale=True; rebuild the index to
+        see its hits again.
+
+        Yields:
+        - {'channel', 'file', 'line_no', 'position', 'word', 'left', 'right',
+           'context'} where context is the window_size words on both sides
+          joined with spaces (the "Bağlam" column of the FSM scripts)
+        """
+        entries = {os.path.join(self.base_path, entry['path']): entry for entry in self.files}
+        handle = handle_path = None
+        stale_path = None
+        cached_line = cached_key = None
+        try:
+            for posting in self.postings(word, prefix=prefix):
+                if posting.file_path == stale_path:
+                    continue
+                if posting.file_path != handle_path:
+                    if handle is not None:
+                        handle.close()
+                        handle = handle_path = None
+                    if self._is_stale(entries[posting.file_path]):
+                        if not skip_stale:
+                            raise ValueError(f"{posting.file_path} changed since the index was built; "
+                                             f"rebuild the index (or pass skip_stale=True)")
+                        stale_path = posting.file_path
+                        continue
+                    handle = open(posting.file_path, 'rb')
+                    handle_path = posting.file_path
+                    # Indexes built before encodings were saved were always UTF-8
+                    encoding = entries[posting.file_path].get('encoding', 'utf-8')
+
+                if cached_key != (posting.file_path, posting.offset):
+                    handle.seek(posting.offset)
+                    cached_line = handle.readline().decode(encoding, 'ignore').split()
+                    cached_key = (posting.file_path, posting.offset)
+
+                words = cached_line
+                i = posting.position
+                if i >= len(words):
+                    # Same size and mtime but different content (e.g. mtime restored)
+                    raise ValueError(f"{posting.file_path} line {posting.line_no + 1} has no word "
+                                     f"{i + 1}; the index is out of date, rebuild it")
+                start = max(0, i - window)
+                end = min(len(words), i + window + 1)
+                yield {
+                    'channel': posting.channel,
+                    'file': os.path.basename(posting.file_path),
+                    'line_no': posting.line_no,
+                    'position': i,
+                    'word': words[i],
+                    'left': " ".join(words[start:i]),
+                    'right': " ".join(words[i + 1:end]),
+                    'context': " ".join(words[start:end]),
+                }
+        finally:
+            if handle is not None:
+                handle.close()
+
+
+if __name__ == "__main__":
+    base_path = r"C:\work\4th-Grade-Fall\CS401\DropboxBackUp\Ekonomi"
+    index_dir = os.path.join("output", "inverted_index")
+
+    if len(sys.argv) > 1:
+        base_path = sys.argv[1]
+
+    def report_error(file_path, e):
+        print(f"  ⚠ Dosya okunamadı {os.path.basename(file_path)}: {e}")
+
+    index = InvertedIndex.build(base_path, on_error=report_error)
+    index.save(index_dir)
+
+    print(f"✓ {len(index.files)} dosya, {len(index.terms)} kelime indekslendi: {index_dir}")
+    print(f"✓ Postings boyutu: {len(index._postings) / 1024:.1f} KB")
+
+    for hit in list(index.kwic("enflasyon", prefix=True))[:10]:
+        print(f"  [{hit['channel']}] {hit['left']:>40s} | {hit['word']} | {hit['right']}")
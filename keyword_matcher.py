@@ -0,0 +1,83 @@
+import re
+from collections import Counter
+
+
+# -------------------------------------------------------
+# Anahtar kelime etiketi
+# -------------------------------------------------------
+def keyword_label(pattern):
+    r"""
+    Regex kalıbından okunabilir etiket üretir: r"\benflasyon\w*" -> "enflasyon"
+    """
+    return re.sub(r"\\[bBwWdDsS][*+?]?", "", pattern)
+
+
+# -------------------------------------------------------
+# Tek regex ile çoklu anahtar kelime eşleştirme
+# -------------------------------------------------------
+class KeywordMatcher:
+    """
+    Tüm anahtar kelime kalıplarını tek bir alternation regex'inde derler:
+        (?P<k0>\\benflasyon\\w*)|(?P<k1>\\bzam\\w*)|...
+
+    Her satır/paragraf için kelime sayısı kadar re.search yerine tek bir arama
+    yapılır; eşleşen grup hangi anahtar kelimenin bulunduğunu söyler.
+
+    patterns : regex kalıpları (kök + ek halleri, örn. r"\\bzam\\w*")
+    names    : kalıpların etiketleri (verilmezse keyword_label ile üretilir)
+    lowercase: aranan metin önce küçük harfe çevrilsin mi (Türkçe kurala göre:
+               "İ" -> "i", "I" -> "ı"; str.lower() "İ"yi "i̇" yapar, "FAİZ" eşleşmezdi)
+    """
+
+    def __init__(self, patterns, names=None, lowercase=True):
+        self.patterns = list(patterns)
+        self.names = list(names) if names is not None else [keyword_label(p) for p in self.patterns]
+        self.lowercase = lowercase
+
+        if len(self.names) != len(self.patterns):
+            raise ValueError("names ve patterns aynı uzunlukta olmalı")
+
+        self._group_names = {f"k{i}": name for i, name in enumerate(self.names)}
+        self.regex = re.compile("|".join(f"(?P<k{i}>{p})" for i, p in enumerate(self.patterns)))
+
+    @classmethod
+    def from_literals(cls, words, lowercase=True):
+        """
+        Düz alt metin araması için ("k in p.lower()" gibi; regex kalıbı gerekmediğinde).
+        """
+        return cls([re.escape(w) for w in words], names=list(words), lowercase=lowercase)
+
+    def _prepare(self, text):
+        if not self.lowercase:
+            return text
+        return text.replace('İ', 'i').replace('I', 'ı').lower()
+
+    def search(self, text):
+        """
+        Metindeki ilk anahtar kelimenin etiketini döndürür, yoksa None.
+        """
+        m = self.regex.search(self._prepare(text))
+        return None if m is None else self._group_names[m.lastgroup]
+
+    def find_lines(self, lines):
+        """
+        Anahtar kelime geçen satırların (index, etiket) listesi.
+        Etiket satırdaki ilk eşleşmenin anahtar kelimesidir.
+        """
+        search = self.regex.search
+        prepare = self._prepare
+        group_names = self._group_names
+
+        hits = []
+        for i, line in enumerate(lines):
+            m = search(prepare(line))
+            if m is not None:
+                hits.append((i, group_names[m.lastgroup]))
+        return hits
+
+    def count(self, text):
+        """
+        Metindeki tüm eşleşmeleri anahtar kelime bazında sayar.
+        """
+        group_names = self._group_names
+        return Counter(group_names[m.lastgroup] for m in self.regex.finditer(self._prepare(text)))
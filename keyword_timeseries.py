@@ -0,0 +1,232 @@
+"""
+Keyword Time Series Index
+Daily word counts per channel, keyed by the broadcast date in the transcript
+file name, so spikes of "zam" / "enflasyon" can be charted against CPI
+release days without reading the corpus again
+
+STORAGE (columnar NPZ, one row per (term, channel, day) with a non-zero count):
+- terms:         sorted term list
+- term_offsets:  rows of term t are term_offsets[t]:term_offsets[t + 1]
+- channel_codes: channel of every row (index into channel_names)
+- days:          broadcast date of every row (datetime64[D])
+- counts:        count of every row (uint32)
+
+Rows are sorted by term, then channel, then day, so the series of one term
+is a contiguous slice found with a binary search on terms.
+
+SOURCES:
+- from_hit_matrix(): lexicon keyword hits (lexicon_scorer.py), small index
+- from_document_term_matrix(): every word of the vocabulary (document_term_matrix.py)
+Documents whose file name has no date are left out (see undated_documents);
+documents without a channel get the UNKNOWN_CHANNEL label.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+
+# Channel label of documents added without (or with an empty) channel
+UNKNOWN_CHANNEL = "<unknown>"
+
+
+class KeywordTimeSeries:
+    """Daily (channel, date, term) count index with a per-term query API"""
+
+    def __init__(self, terms, term_offsets, channel_names, channel_codes, days, counts,
+                 undated_documents=0):
+        self.terms = np.asarray(terms, dtype=str)
+        self.term_offsets = np.asarray(term_offsets, dtype=np.int64)
+        self.channel_names = np.asarray(channel_names, dtype=str)
+        self.channel_codes = np.asarray(channel_codes, dtype=np.int32)
+        self.days = np.asarray(days, dtype='datetime64[D]')
+        self.counts = np.asarray(counts, dtype=np.uint32)
+        self.undated_documents = int(undated_documents)
+
+    # ------------------------------------------------------------------
+    # Building
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_cells(cls, terms, channel_names, doc_channels, doc_dates,
+                   doc_index, term_index, counts):
+        """
+        Build the index from sparse document x term cells
+
+        Parameters:
+        - terms: Column labels (term_index refers to these)
+        - channel_names: Channel labels (doc_channels refers to these)
+        - doc_channels, doc_dates: Channel code and date (datetime64[D], NaT if
+          unknown) of every document
+        - doc_index, term_index, counts: The non-zero cells
+        """
+        terms = np.asarray(terms, dtype=str)
+        doc_channels = np.asarray(doc_channels, dtype=np.int64)
+        doc_dates = np.asarray(doc_dates, dtype='datetime64[D]')
+        doc_index = np.asarray(doc_index, dtype=np.int64)
+        term_index = np.asarray(term_index, dtype=np.int64)
+        counts = np.asarray(counts, dtype=np.int64)
+
+        dated = ~np.isnat(doc_dates)
+        keep = dated[doc_index]
+        doc_index, term_index, counts = doc_index[keep], term_index[keep], counts[keep]
+
+        # Column ids in alphabetical term order
+        order = np.argsort(terms, kind='stable')
+        sorted_terms = terms[order]
+        rank = np.empty(len(terms), dtype=np.int64)
+        rank[order] = np.arange(len(terms))
+        term_ids = rank[term_index]
+
+        # Sum the cells of the same (term, channel, day); several files of one
+        # channel on the same day collapse into one row
+        day_numbers = doc_dates[doc_index].astype(np.int64)
+        channels = doc_channels[doc_index]
+        if len(day_numbers):
+            day_min = day_numbers.min()
+            n_days = int(day_numbers.max() - day_min) + 1
+        else:
+            day_min, n_days = 0, 1
+        n_channels = max(len(channel_names), 1)
+        keys = (term_ids * n_channels + channels) * n_days + (day_numbers - day_min)
+
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+        summed = np.bincount(inverse, weights=counts, minlength=len(unique_keys)).astype(np.uint32)
+
+        row_days = (unique_keys % n_days + day_min).astype('datetime64[D]')
+        row_channels = (unique_keys // n_days) % n_channels
+        row_terms = unique_keys // (n_days * n_channels)
+        term_offsets = np.searchsorted(row_terms, np.arange(len(terms) + 1))
+
+        return cls(sorted_terms, term_offsets, channel_names, row_channels, row_days, summed,
+                   undated_documents=int((~dated).sum()))
+
+    @classmethod
+    def from_hit_matrix(cls, hits):
+        """Build from a lexicon_scorer.HitMatrix (lexicon keyword hits)"""
+        return cls.from_cells(hits.terms, hits.channel_names, hits.channel_codes, hits.dates,
+                              hits.doc_index, hits.term_index, hits.counts)
+
+    @classmethod
+    def from_document_term_matrix(cls, dtm):
+        """
+        Build from a DocumentTermMatrix filled with add_corpus() (every word)
+
+        Documents without a channel are counted under UNKNOWN_CHANNEL, not
+        under one of the real channels.
+        """
+        doc_channel_names = [doc.get('channel') or UNKNOWN_CHANNEL for doc in dtm.documents]
+        channel_names = sorted(set(doc_channel_names))
+        channel_ids = {name: i for i, name in enumerate(channel_names)}
+        doc_channels = [channel_ids[name] for name in doc_channel_names]
+        doc_dates = [doc.get('date') or 'NaT' for doc in dtm.documents]
+        return cls.from_cells(dtm.terms, channel_names, doc_channels,
+                              np.array(doc_dates, dtype='datetime64[D]'),
+                              dtm.row_ids(), dtm.indices, dtm.data)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def _rows(self, term):
+        i = np.searchsorted(self.terms, term)
+        if i == len(self.terms) or self.terms[i] != term:
+            return slice(0, 0)
+        return slice(self.term_offsets[i], self.term_offsets[i + 1])
+
+    def series(self, terms, channels=None, fill_days=True):
+        """
+        Daily counts of one term (or the sum of several terms) per channel
+
+        Parameters:
+        - terms: A term, or a list of terms that are added together
+                 (e.g. ['zam', 'zamlar', 'zamları'])
+        - channels: Channel names to include (None = all)
+        - fill_days: Add the days without any mention as 0 rows
+
+        Returns:
+        - DataFrame: index = date, columns = channels, values = counts
+        """
+        if isinstance(terms, str):
+            terms = [terms]
+        if channels is None:
+            channels = self.channel_names.tolist()
+
+        rows = [self._rows(term) for term in terms]
+        codes = np.concatenate([self.channel_codes[r] for r in rows])
+        days = np.concatenate([self.days[r] for r in rows])
+        counts = np.concatenate([self.counts[r] for r in rows]).astype(np.int64)
+
+        df = pd.DataFrame({'date': days, 'channel': self.channel_names[codes], 'count': counts})
+        table = df.pivot_table(index='date', columns='channel', values='count',
+                               aggfunc='sum', fill_value=0)
+        table = table.reindex(columns=channels, fill_value=0)
+
+        if fill_days and len(self.days):
+            all_days = pd.date_range(self.days.min(), self.days.max(), freq='D')
+            table = table.reindex(all_days, fill_value=0)
+        table.index.name = 'date'
+        table.columns.name = None
+        return table.astype(np.int64)
+
+    def term_totals(self):
+        """Total count of every term over all channels and days (Series)"""
+        cumulative = np.concatenate(([0], np.cumsum(self.counts, dtype=np.int64)))
+        sums = cumulative[self.term_offsets[1:]] - cumulative[self.term_offsets[:-1]]
+        return pd.Series(sums, index=self.terms.tolist())
+
+    # ------------------------------------------------------------------
+    # Saving / loading
+    # ------------------------------------------------------------------
+
+    def save(self, path):
+        np.savez_compressed(
+            path,
+            terms=self.terms,
+            term_offsets=self.term_offsets,
+            channel_names=self.channel_names,
+            channel_codes=self.channel_codes,
+            days=self.days,
+            counts=self.counts,
+            undated_documents=np.int64(self.undated_documents),
+        )
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(**{key: data[key] for key in data.files})
+
+
+if __name__ == "__main__":
+    from lexicon_scorer import HitMatrix, score_corpus
+
+    base_path = r"C:\work\4th-Grade-Fall\CS401\DropboxBackUp\Ekonomi"
+    output_dir = "output"
+
+    if len(sys.argv) > 1:
+        base_path = sys.argv[1]
+
+    os.makedirs(output_dir, exist_ok=True)
+
+    # Varsa lexicon_scorer.py çıktısı kullanılır, yoksa korpus bir kez taranır
+    hits_path = os.path.join(output_dir, "INFLATION_HITS.npz")
+    if len(sys.argv) <= 1 and os.path.exists(hits_path):
+        hits = HitMatrix.load(hits_path)
+    else:
+        hits = score_corpus(base_path)
+
+    index = KeywordTimeSeries.from_hit_matrix(hits)
+    index_path = os.path.join(output_dir, "KEYWORD_TIMESERIES.npz")
+    index.save(index_path)
+
+    print(f"✓ {len(index.terms)} anahtar kelime, {len(index.counts)} (kanal, gün, kelime) satırı")
+    print(f"✓ Tarihi bulunamayan belge: {index.undated_documents}")
+    print(f"✓ Kaydedildi: {index_path}")
+
+    for term in ('enflasyon', 'zam'):
+        daily = index.series(term)
+        if len(daily):
+            peak_day = daily.sum(axis=1).idxmax()
+            print(f"  {term:10s}: en yoğun gün {peak_day.date()} ({int(daily.loc[peak_day].sum())} kez)")
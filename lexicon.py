@@ -0,0 +1,18 @@
+import os
+import json
+
+
+# Anahtar kelime listelerinin tek kaynağı
+LEXICON_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "inflation_lexicon.json")
+
+
+def load_lexicon(path=LEXICON_PATH):
+    """
+    inflation_lexicon.json dosyasını okur.
+
+    - filter_keywords   : Filtering.py / filtering_02.py blok filtresi (regex, kök + ek)
+    - inflation_keywords: news_analysis.py enflasyon kelimeleri raporu (tam kelime)
+    - score_patterns    : lexicon_scorer.py belge x kelime matrisi (etiket -> regex)
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
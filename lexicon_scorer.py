@@ -0,0 +1,176 @@
+"""
+Inflation Lexicon Scorer
+Counts every lexicon keyword in every transcript in one pass and stores the
+result as a sparse document x keyword matrix (compressed NPZ)
+
+WHY?
+Inflation-expectation regressions need "how often did channel X mention
+'zam' on day D". Scanning the text again for every new question is slow;
+loading this matrix takes milliseconds.
+
+OUTPUT (output/INFLATION_HITS.npz):
+- doc_index, term_index, counts: the non-zero cells (COO format)
+- terms: keyword labels (columns), from score_patterns in inflation_lexicon.json
+- channel_names, channel_codes: channel of each document
+- dates: broadcast date of each document (NaT if the file name has none)
+- files: file name of each document
+"""
+
+import os
+import sys
+from collections import Counter
+
+import numpy as np
+
+from corpus_reader import list_channels, list_channel_files, iter_file_lines, parse_broadcast_date
+from keyword_matcher import KeywordMatcher
+from lexicon import load_lexicon
+
+
+def lexicon_matcher(lexicon=None):
+    """Build one KeywordMatcher from the score_patterns of the lexicon"""
+    if lexicon is None:
+        lexicon = load_lexicon()
+    patterns = lexicon['score_patterns']
+    return KeywordMatcher(list(patterns.values()), names=list(patterns))
+
+
+class HitMatrix:
+    """
+    Sparse document x keyword count matrix with channel / date / file columns
+
+    Rows are documents (transcript files), columns are lexicon keywords.
+    Only the non-zero cells are stored (doc_index, term_index, counts).
+    """
+
+    def __init__(self, terms, channel_names, channel_codes, dates, files,
+                 doc_index, term_index, counts):
+        self.terms = np.asarray(terms, dtype=str)
+        self.channel_names = np.asarray(channel_names, dtype=str)
+        self.channel_codes = np.asarray(channel_codes, dtype=np.int32)
+        self.dates = np.asarray(dates, dtype='datetime64[D]')
+        self.files = np.asarray(files, dtype=str)
+        self.doc_index = np.asarray(doc_index, dtype=np.int32)
+        self.term_index = np.asarray(term_index, dtype=np.int32)
+        self.counts = np.asarray(counts, dtype=np.uint32)
+
+    @property
+    def shape(self):
+        return len(self.files), len(self.terms)
+
+    @property
+    def channels(self):
+        """Channel name of each document"""
+        return self.channel_names[self.channel_codes]
+
+    def save(self, path):
+        np.savez_compressed(
+            path,
+            terms=self.terms,
+            channel_names=self.channel_names,
+            channel_codes=self.channel_codes,
+            dates=self.dates,
+            files=self.files,
+            doc_index=self.doc_index,
+            term_index=self.term_index,
+            counts=self.counts,
+        )
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(**{key: data[key] for key in data.files})
+
+    def to_dense(self):
+        """Documents x keywords numpy array"""
+        dense = np.zeros(self.shape, dtype=np.uint32)
+        dense[self.doc_index, self.term_index] = self.counts
+        return dense
+
+    def to_csr(self):
+        """scipy.sparse CSR matrix (needs scipy)"""
+        from scipy.sparse import csr_matrix
+        return csr_matrix((self.counts, (self.doc_index, self.term_index)), shape=self.shape)
+
+    def to_dataframe(self):
+        """pandas DataFrame: channel, date, file + one count column per keyword"""
+        import pandas as pd
+        df = pd.DataFrame(self.to_dense(), columns=list(self.terms))
+        df.insert(0, 'file', self.files)
+        df.insert(0, 'date', self.dates)
+        df.insert(0, 'channel', self.channels)
+        return df
+
+
+def score_corpus(base_path, matcher=None, channels=None, on_error=None):
+    """
+    Count the lexicon keywords in every transcript (one pass over the corpus,
+    encoding detected per file)
+
+    Parameters:
+    - base_path: Root folder (e.g. the Ekonomi folder)
+    - matcher: KeywordMatcher (default: lexicon_matcher())
+    - channels: Channel names to read (None = all)
+    - on_error: Called as on_error(file_path, exception) for unreadable files
+                (those files are left out of the matrix)
+
+    Returns:
+    - HitMatrix
+    """
+    if matcher is None:
+        matcher = lexicon_matcher()
+    if channels is None:
+        channels = list_channels(base_path)
+
+    term_ids = {name: i for i, name in enumerate(matcher.names)}
+    channel_codes, dates, files = [], [], []
+    doc_index, term_index, counts = [], [], []
+
+    for code, channel in enumerate(channels):
+        for file_path in list_channel_files(base_path, channel):
+            file_counts = Counter()
+            try:
+                for line in iter_file_lines(file_path):
+                    file_counts.update(matcher.count(line))
+            except (OSError, UnicodeDecodeError) as e:
+                if on_error is None:
+                    raise
+                on_error(file_path, e)
+                continue
+
+            doc = len(files)
+            channel_codes.append(code)
+            date = parse_broadcast_date(file_path)
+            dates.append(np.datetime64(date, 'D') if date is not None else np.datetime64('NaT'))
+            files.append(os.path.basename(file_path))
+
+            for name, count in file_counts.items():
+                doc_index.append(doc)
+                term_index.append(term_ids[name])
+                counts.append(count)
+
+    return HitMatrix(matcher.names, channels, channel_codes, dates, files,
+                     doc_index, term_index, counts)
+
+
+if __name__ == "__main__":
+    base_path = r"C:\work\4th-Grade-Fall\CS401\DropboxBackUp\Ekonomi"
+    output_dir = "output"
+
+    if len(sys.argv) > 1:
+        base_path = sys.argv[1]
+
+    os.makedirs(output_dir, exist_ok=True)
+
+    def report_error(file_path, e):
+        print(f"  ⚠ Dosya okunamadı {os.path.basename(file_path)}: {e}")
+
+    hits = score_corpus(base_path, on_error=report_error)
+
+    hits_path = os.path.join(output_dir, "INFLATION_HITS.npz")
+    hits.save(hits_path)
+
+    n_docs, n_terms = hits.shape
+    print(f"✓ {n_docs} belge x {n_terms} anahtar kelime, {len(hits.counts)} dolu hücre")
+    print(f"✓ Tarihi bulunamayan belge: {int(np.isnat(hits.dates).sum())}")
+    print(f"✓ Kaydedildi: {hits_path}")
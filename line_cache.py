@@ -0,0 +1,73 @@
+import os
+import pickle
+
+from corpus_io import read_text
+
+
+# -------------------------------------------------------
+# Dosyayı bir kez oku, satırları kelime + temiz kelime olarak ayır
+# -------------------------------------------------------
+def read_cleaned_lines(file_path, clean, encoding=None):
+    """
+    Boş olmayan her satır için (kelimeler, temizlenmiş kelimeler) listesi döndürür.
+    kelimeler = line.strip().split(), temizlenmiş kelimeler = [clean(w) for w in kelimeler]
+    """
+    text = read_text(file_path, encoding=encoding)
+
+    lines = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        words = line.split()
+        lines.append((words, [clean(w) for w in words]))
+    return lines
+
+
+# -------------------------------------------------------
+# Okunan dosyaların önbelleği (bellekte veya geçici dosyada)
+# -------------------------------------------------------
+class LineCache:
+    """
+    İki aşamalı scriptler için (önce tüm dosyalardan özel isim topla, sonra
+    aynı dosyaları tekrar tara): dosyalar ilk aşamada bir kez okunur, ikinci
+    aşama bu önbellekten, aynı sırayla tekrar oynatılır.
+
+    spill_path verilmezse kayıtlar bellekte tutulur; verilirse her kayıt
+    pickle ile bu dosyaya yazılır ve ikinci aşamada sırayla geri okunur
+    (korpus belleğe sığmıyorsa).
+    """
+
+    def __init__(self, spill_path=None):
+        self.spill_path = spill_path
+        self._records = []
+        self._spill_file = None
+        self.count = 0
+
+        if spill_path is not None:
+            self._spill_file = open(spill_path, "wb")
+
+    def add(self, record):
+        if self._spill_file is not None:
+            pickle.dump(record, self._spill_file, protocol=pickle.HIGHEST_PROTOCOL)
+        else:
+            self._records.append(record)
+        self.count += 1
+
+    def __iter__(self):
+        if self.spill_path is None:
+            yield from self._records
+            return
+
+        self._spill_file.flush()
+        with open(self.spill_path, "rb") as f:
+            for _ in range(self.count):
+                yield pickle.load(f)
+
+    def close(self):
+        self._records = []
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
+            if os.path.exists(self.spill_path):
+                os.remove(self.spill_path)
@@ -0,0 +1,122 @@
+import os
+import json
+import hashlib
+import sqlite3
+import importlib.util
+from importlib import metadata
+
+
+# Veritabanının varsayılan yeri (proje klasörü)
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "morphology_cache.sqlite")
+
+# Saklama biçimi değişirse bu sayı artırılır, eski kayıtlar otomatik silinir
+SCHEMA_VERSION = 1
+
+# Analizörün sözlük / FSM dosyalarının bulunduğu paketler
+LEXICON_PACKAGES = [
+    ("NlpToolkit-MorphologicalAnalysis", "MorphologicalAnalysis"),
+    ("NlpToolkit-Dictionary", "Dictionary"),
+]
+
+
+# -------------------------------------------------------
+# Sözlük sürüm anahtarı
+# -------------------------------------------------------
+def lexicon_version():
+    """
+    Analizörün sözlüğüne bağlı sürüm anahtarı üretir.
+    Paket sürümleri ve data/ klasöründeki sözlük + FSM dosyalarının içeriği hash'lenir;
+    sözlük güncellenirse anahtar değişir ve veritabanı sıfırlanır.
+    """
+    h = hashlib.sha1(f"schema={SCHEMA_VERSION}".encode("utf-8"))
+
+    for dist_name, package_name in LEXICON_PACKAGES:
+        try:
+            h.update(f"{dist_name}={metadata.version(dist_name)}".encode("utf-8"))
+        except metadata.PackageNotFoundError:
+            h.update(f"{dist_name}=?".encode("utf-8"))
+
+        spec = importlib.util.find_spec(package_name)
+        if spec is None or not spec.submodule_search_locations:
+            continue
+
+        data_dir = os.path.join(list(spec.submodule_search_locations)[0], "data")
+        if not os.path.isdir(data_dir):
+            continue
+
+        for file_name in sorted(os.listdir(data_dir)):
+            if not file_name.endswith((".txt", ".xml")):
+                continue
+            h.update(file_name.encode("utf-8"))
+            with open(os.path.join(data_dir, file_name), "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    h.update(chunk)
+
+    return h.hexdigest()
+
+
+# -------------------------------------------------------
+# Kalıcı kelime -> parse listesi veritabanı
+# -------------------------------------------------------
+class MorphologyDatabase:
+    """
+    SQLite tabanlı kalıcı analiz deposu.
+
+    Her yüzey biçimi için parse listesi [(pos, parse_metni), ...] olarak saklanır.
+    Açılışta kayıtlı sürüm anahtarı mevcut sözlükle uyuşmazsa tablo temizlenir.
+    Yazmalar batch_size kayıtta bir toplu olarak işlenir.
+    """
+
+    def __init__(self, path=DEFAULT_DB_PATH, version=None, batch_size=1000):
+        self.path = path
+        self.version = version if version is not None else lexicon_version()
+        self.batch_size = batch_size
+        self._pending = {}
+
+        # Paralel işçiler aynı dosyaya yazabilir; kilit için bekleme süresi uzun tutulur
+        self._conn = sqlite3.connect(path, timeout=60)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS parses (word TEXT PRIMARY KEY, parses TEXT NOT NULL)")
+
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'lexicon_version'").fetchone()
+        if row is None or row[0] != self.version:
+            # Sözlük değişmiş (veya yeni veritabanı): eski analizler geçersiz
+            self._conn.execute("DELETE FROM parses")
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('lexicon_version', ?)",
+                               (self.version,))
+        self._conn.commit()
+
+    def get(self, word):
+        if word in self._pending:
+            return self._pending[word]
+        row = self._conn.execute("SELECT parses FROM parses WHERE word = ?", (word,)).fetchone()
+        if row is None:
+            return None
+        return [tuple(p) for p in json.loads(row[0])]
+
+    def put(self, word, parses):
+        self._pending[word] = list(parses)
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self._pending:
+            return
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO parses (word, parses) VALUES (?, ?)",
+            ((w, json.dumps(p, ensure_ascii=False)) for w, p in self._pending.items())
+        )
+        self._conn.commit()
+        self._pending.clear()
+
+    def __len__(self):
+        self.flush()
+        return self._conn.execute("SELECT COUNT(*) FROM parses").fetchone()[0]
+
+    def close(self):
+        if self._conn is not None:
+            self.flush()
+            self._conn.close()
+            self._conn = None
@@ -14,8 +14,12 @@ LIBRARIES EXPLAINED:
    - word_tokenize: Splits text into individual words
 """
 
+import os
+import hashlib
 import pandas as pd
 from collections import Counter
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
 import re
 from wordcloud import WordCloud
 import matplotlib.pyplot as plt
@@ -25,12 +29,85 @@ import nltk
 from nltk.corpus import stopwords
 from nltk.tokenize import word_tokenize
 
+from corpus_reader import iter_file_lines
+from instrumentation import DISABLED, timed
+from lexicon import load_lexicon
+from run_manifest import RunManifest, ResultStore
+
+
+# Precompiled patterns for the 'fast' tokenizer engine
+# (compiled once when the module is loaded, not on every call)
+NON_LETTER_PATTERN = re.compile(r'[^a-zA-ZığüşöçĞÜŞÖÇİ\s]')
+
+TOKENIZERS = ('nltk', 'fast')
+
+
+def render_word_cloud(frequencies, save_path, width=800, height=400,
+                      max_words=100, background_color='white', colormap='viridis'):
+    """
+    Headless word cloud rendering (no matplotlib figure, nothing is shown)
+
+    The WordCloud image is written straight to save_path as PNG, at exactly
+    width x height pixels. Used by NewsTextAnalyzer.save_word_cloud() and by
+    render_word_clouds() in worker processes.
+
+    Parameters:
+    - frequencies: Word frequency mapping (e.g. a Counter)
+    - save_path: Where to write the PNG
+    - Other parameters: Same as NewsTextAnalyzer.create_word_cloud()
+
+    Returns:
+    - save_path
+    """
+    top_words = dict(Counter(frequencies).most_common(max_words))
+    wc = WordCloud(
+        width=width,
+        height=height,
+        max_words=max_words,
+        background_color=background_color,
+        colormap=colormap
+    ).generate_from_frequencies(top_words)
+    wc.to_file(save_path)
+    return save_path
+
+
+def _render_word_cloud_job(job):
+    return render_word_cloud(**job)
+
+
+def render_word_clouds(jobs, workers=None):
+    """
+    Render many word clouds in parallel (headless batch mode)
+
+    Parameters:
+    - jobs: List of dicts with render_word_cloud() arguments
+            Example: [{'frequencies': word_freq, 'save_path': 'output/ATV_wordcloud.png',
+                       'width': 1600, 'height': 800, 'max_words': 150}, ...]
+    - workers: Number of worker processes (None = number of CPUs, 1 = no pool)
+
+    Returns:
+    - List of written file paths, in the same order as jobs
+    """
+    # Only the words that can appear in a cloud are sent to the workers
+    jobs = [dict(job, frequencies=dict(Counter(job['frequencies']).most_common(job.get('max_words', 100))))
+            for job in jobs]
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(jobs))
+
+    if workers <= 1:
+        return [_render_word_cloud_job(job) for job in jobs]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_render_word_cloud_job, jobs))
 
 
 class NewsTextAnalyzer:
     """Analyze news transcripts for vocabulary and word frequency"""
 
-    def __init__(self, remove_stopwords=True, min_word_length=3, language='turkish'):
+    def __init__(self, remove_stopwords=True, min_word_length=3, language='turkish',
+                 tokenizer='nltk', instrumentation=None):
         """
         Initialize the analyzer (this runs when you create the analyzer)
 
@@ -42,6 +119,12 @@ class NewsTextAnalyzer:
         - remove_stopwords: Should we remove common words like 'the', 'is', 'at'?
                            (True = yes, False = no)
         - min_word_length: Ignore words shorter than this (3 means ignore 'is', 'at')
+        - tokenizer: Which tokenizer engine preprocess_text() uses
+                     'nltk' = original NLTK word_tokenize path (default)
+                     'fast' = precompiled regex + str.split, Turkish-aware lowercasing
+                              (much higher throughput, see bench_tokenizer.py)
+        - instrumentation: Optional instrumentation.Instrumentation; tokenizing and
+                           word cloud rendering are then timed and counted in it
 
         WHAT IS self?
         'self' refers to this specific toolbox instance. When you write
@@ -53,6 +136,11 @@ class NewsTextAnalyzer:
         self.min_word_length = min_word_length
         self.language = language#yeni eklendi
 
+        if tokenizer not in TOKENIZERS:
+            raise ValueError(f"Unknown tokenizer {tokenizer!r}, expected one of {TOKENIZERS}")
+        self.tokenizer = tokenizer
+        self.instrumentation = instrumentation if instrumentation is not None else DISABLED
+
         # If we want to remove stopwords, load the list
         if remove_stopwords:
             # Get English stopwords from NLTK (words like: the, is, at, which, on)
@@ -125,6 +213,8 @@ class NewsTextAnalyzer:
         After tokenizing: ['the', 'inflation', 'rate', 'is']
         After filtering: ['inflation', 'rate']
         """
+        if self.tokenizer == 'fast':
+            return self._preprocess_text_fast(text)
 
         # STEP 1: Convert everything to lowercase
         # "Inflation" and "inflation" should be the same word
@@ -152,6 +242,32 @@ class NewsTextAnalyzer:
 
         return tokens
 
+    def _preprocess_text_fast(self, text):
+        """
+        High-throughput version of preprocess_text() (tokenizer='fast')
+
+        WHAT IS DIFFERENT?
+        - Patterns are compiled once (NON_LETTER_PATTERN) instead of on every call
+        - After special characters are removed only letters and spaces are left,
+          so a plain str.split() is enough; NLTK word_tokenize is skipped
+        - Lowercasing is Turkish-aware: 'IŞIK' -> 'ışık', 'İSTANBUL' -> 'istanbul'
+          (the NLTK path gives 'işik' for 'IŞIK')
+        - Stopwords are checked against the stop_words set
+
+        Returns:
+        - List of cleaned words (same format as preprocess_text)
+        """
+        # Turkish lowercasing: 'İ' -> 'i' and 'I' -> 'ı' first
+        # (plain str.lower() turns 'I' into 'i' and 'İ' into 'i' + a combining dot)
+        text = text.replace('İ', 'i').replace('I', 'ı').lower()
+        text = NON_LETTER_PATTERN.sub('', text)
+
+        min_length = self.min_word_length
+        stop_words = self.stop_words
+        return [word for word in text.split()
+                if len(word) >= min_length and word not in stop_words]
+
+    @timed('tokenize')
     def extract_vocabulary(self, texts):
         """
         Extract unique vocabulary from all texts
@@ -164,6 +280,8 @@ class NewsTextAnalyzer:
         Parameters:
         - texts: Can be a single text string OR a list of texts
                  Example: ["text from channel 1", "text from channel 2"]
+                 Any iterable of texts works, e.g. a CorpusStream that
+                 yields one line at a time from the transcript files
 
         Returns:
         - Sorted list of unique words (alphabetically ordered)
@@ -187,6 +305,7 @@ class NewsTextAnalyzer:
         for text in texts:
             # Clean the text and get list of words
             tokens = self.preprocess_text(text)
+            self.instrumentation.count('tokens', len(tokens))
 
             # Add all words to vocabulary set
             # update() adds multiple items at once
@@ -196,6 +315,7 @@ class NewsTextAnalyzer:
         # sorted() arranges alphabetically: ['apple', 'banana', 'cherry']
         return sorted(vocabulary)
 
+    @timed('tokenize')
     def get_word_frequencies(self, texts):
         """
         Count how many times each word appears
@@ -207,6 +327,7 @@ class NewsTextAnalyzer:
 
         Parameters:
         - texts: List of text strings or single string
+                 (or any iterable of texts, e.g. a CorpusStream)
 
         Returns:
         - Counter object (like a dictionary: {word: count})
@@ -222,41 +343,81 @@ class NewsTextAnalyzer:
         if isinstance(texts, str):
             texts = [texts]
 
-        # all_tokens will store every word from every document
-        # This WILL have duplicates (we want to count them!)
-        all_tokens = []
+        # Counter() automatically counts each item
+        # ['a', 'b', 'a', 'c'] becomes Counter({'a': 2, 'b': 1, 'c': 1})
+        word_freq = Counter()
 
         # Process each document
+        # update() adds the counts of one document at a time, so memory
+        # depends on the vocabulary size, not on how many texts we read
         for text in texts:
             tokens = self.preprocess_text(text)  # Clean and split
-            all_tokens.extend(tokens)  # extend() adds all items from tokens
+            self.instrumentation.count('tokens', len(tokens))
+            word_freq.update(tokens)
 
-        # Counter() automatically counts each item
-        # ['a', 'b', 'a', 'c'] becomes Counter({'a': 2, 'b': 1, 'c': 1})
-        return Counter(all_tokens)
+        return word_freq
+
+    def vocabulary_from_frequencies(self, word_freq):
+        """
+        Get the vocabulary from an existing frequency Counter
+
+        WHY?
+        The vocabulary is just the keys of the frequency Counter.
+        If we already counted the words, we don't need to clean and
+        tokenize the same texts a second time.
+
+        Parameters:
+        - word_freq: Counter returned by get_word_frequencies()
+
+        Returns:
+        - Sorted list of unique words (same result as extract_vocabulary)
+        """
+        return sorted(word_freq)
+
+    def merge_frequencies(self, counters):
+        """
+        Combine several frequency Counters into one (e.g. all channels)
+
+        Each document is tokenized only once (per channel); the combined
+        table is made by adding the per-channel counts together.
+
+        Parameters:
+        - counters: Iterable of Counter objects
+
+        Returns:
+        - Counter with the summed counts
+          Example: Counter({'zam': 2}) + Counter({'zam': 1}) -> Counter({'zam': 3})
+        """
+        merged = Counter()
+        for counter in counters:
+            merged.update(counter)
+        return merged
 
+    @timed('word_cloud')
     def create_word_cloud(self, texts, width=800, height=400,
                           max_words=100, background_color='white',
-                          colormap='viridis', save_path=None):
+                          colormap='viridis', save_path=None, show=True):
         """
         Create and display word cloud
 
         Parameters:
         - texts: List of text strings or single string
+                 OR a word frequency mapping (e.g. the Counter returned by
+                 get_word_frequencies()). With frequencies the texts are not
+                 tokenized again; only the max_words most common words are
+                 handed to WordCloud.generate_from_frequencies()
         - width, height: Dimensions of the word cloud
         - max_words: Maximum number of words to display
         - background_color: Background color
         - colormap: Color scheme (viridis, plasma, inferno, magma, etc.)
         - save_path: Path to save the image (optional)
+        - show: Call plt.show() (blocks on interactive backends); the figure
+                is closed afterwards either way
 
         Returns:
         - WordCloud object
         """
-        if isinstance(texts, str):
-            texts = [texts]
-
-        # Combine all texts
-        combined_text = ' '.join(texts)
+        self.instrumentation.count('word_clouds')
 
         # Create word cloud
         wc = WordCloud(
@@ -268,10 +429,23 @@ class NewsTextAnalyzer:
             stopwords=self.stop_words,
             collocations=False,  # Avoid repeated phrases
             min_word_length=self.min_word_length
-        ).generate(combined_text)
+        )
+
+        if isinstance(texts, Mapping):
+            # Words are already cleaned and counted: render the top words directly
+            # The cost depends on max_words, not on the size of the corpus
+            top_words = dict(Counter(texts).most_common(max_words))
+            wc.generate_from_frequencies(top_words)
+        else:
+            if isinstance(texts, str):
+                texts = [texts]
+
+            # Combine all texts
+            combined_text = ' '.join(texts)
+            wc.generate(combined_text)
 
         # Display
-        plt.figure(figsize=(width / 100, height / 100))
+        fig = plt.figure(figsize=(width / 100, height / 100))
         plt.imshow(wc, interpolation='bilinear')
         plt.axis('off')
         plt.title('Word Cloud - News Transcripts 2024', fontsize=16, pad=20)
@@ -281,18 +455,171 @@ class NewsTextAnalyzer:
             plt.savefig(save_path, dpi=300, bbox_inches='tight')
             print(f"Word cloud saved to: {save_path}")
 
-        plt.show()
+        if show:
+            plt.show()
+
+        # Free the figure memory (otherwise every channel's figure stays open)
+        plt.close(fig)
 
         return wc
 
+    @timed('word_cloud')
+    def save_word_cloud(self, frequencies, save_path, width=800, height=400,
+                        max_words=100, background_color='white', colormap='viridis'):
+        """
+        Headless version of create_word_cloud() for frequencies
+
+        No matplotlib figure is created and nothing is displayed; the PNG is
+        written directly by WordCloud (see render_word_cloud()).
+        """
+        self.instrumentation.count('word_clouds')
+        return render_word_cloud(frequencies, save_path, width=width, height=height,
+                                 max_words=max_words, background_color=background_color,
+                                 colormap=colormap)
+
+
+# ==============================================================================
+# INCREMENTAL ANALYSIS (only re-read transcripts that changed)
+# ==============================================================================
+
+def analyzer_config(analyzer):
+    """
+    Settings that change the tokens; if any of them changes, the cached
+    per-file counts are no longer valid (RunManifest starts empty)
+    """
+    stop_words_hash = hashlib.sha1('\n'.join(sorted(analyzer.stop_words)).encode('utf-8'))
+    return {
+        'tokenizer': analyzer.tokenizer,
+        'min_word_length': analyzer.min_word_length,
+        'stop_words': stop_words_hash.hexdigest(),
+    }
+
+
+def count_file_tokens(analyzer, file_path):
+    """
+    Count the tokens of one transcript file (encoding detected per file)
+
+    The file is streamed line by line (only one line is in memory); reading
+    and tokenizing are timed per line as separate stages in the analyzer's
+    instrumentation ('read' and 'tokenize').
+
+    Returns:
+    - (Counter, non_empty) where non_empty tells if the file had any text
+    """
+    instrumentation = analyzer.instrumentation
+    lines = iter_file_lines(file_path)
+
+    word_freq = Counter()
+    non_empty = False
+    line_count = 0
+    while True:
+        with instrumentation.stage('read'):
+            line = next(lines, None)
+        if line is None:
+            break
+        line_count += 1
+        if not non_empty and line.strip():
+            non_empty = True
+        with instrumentation.stage('tokenize'):
+            word_freq.update(analyzer.preprocess_text(line))
+
+    instrumentation.count('files')
+    instrumentation.count('lines', line_count)
+    instrumentation.count('tokens', sum(word_freq.values()))
+    return word_freq, non_empty
+
+
+def update_channel_frequencies(analyzer, channel, txt_files, manifest, results, removed_files=()):
+    """
+    Update one channel's word frequencies using only the files that changed
+
+    HOW IT WORKS:
+    - manifest (RunManifest) remembers size / mtime / hash of every file
+    - results (ResultStore) keeps the token Counter of every file
+    - The channel total from the last run is kept in the manifest; we
+      subtract the old counts of changed/removed files and add the new ones
+    - If the old total or an old per-file Counter is missing, the total is
+      rebuilt from the cached per-file Counters (still no re-tokenizing of
+      unchanged files)
+
+    Parameters:
+    - channel: Channel name
+    - txt_files: All current transcript paths of the channel
+    - removed_files: Paths of this channel that were deleted since the last run
+
+    Returns:
+    - (word_freq, files_read, failed_files, changed_file_count)
+    """
+    changed = [p for p in txt_files if not manifest.is_unchanged(p)]
+    previous = manifest.get_aggregate(channel)
+
+    # Old counts that have to be taken out of the previous total
+    old_results = None
+    if previous is not None:
+        old_results = []
+        for p in [p for p in changed if manifest.get_result(p) is not None] + list(removed_files):
+            old = results.get(p)
+            if old is None:
+                old_results = None
+                break
+            old_results.append(old)
+
+    if old_results is not None:
+        # Delta mode
+        word_freq = Counter(previous['counts'])
+        files_read = previous['files_read']
+        for old in old_results:
+            word_freq.subtract(old['counts'])
+            files_read -= old['non_empty']
+    else:
+        # Rebuild mode: add up the cached counts of unchanged files
+        word_freq = Counter()
+        files_read = 0
+        changed_set = set(changed)
+        for p in txt_files:
+            if p in changed_set:
+                continue
+            cached = results.get(p)
+            if cached is None:
+                changed.append(p)
+                continue
+            word_freq.update(cached['counts'])
+            files_read += cached['non_empty']
+
+    for p in removed_files:
+        results.delete(p)
+
+    failed_files = []
+    for p in changed:
+        try:
+            counts, non_empty = count_file_tokens(analyzer, p)
+        except (OSError, UnicodeDecodeError) as e:
+            failed_files.append((p, e))
+            manifest.forget(p)
+            results.delete(p)
+            continue
+
+        word_freq.update(counts)
+        files_read += non_empty
+        results.put(p, {'counts': counts, 'non_empty': non_empty})
+        manifest.record(p, {'channel': channel})
+
+    # Drop words whose count went down to zero
+    word_freq = +word_freq
+
+    manifest.set_aggregate(channel, {'counts': word_freq, 'files_read': files_read})
+    return word_freq, files_read, failed_files, len(changed)
+
 
 # ==============================================================================
 # EXAMPLE USAGE
 # ==============================================================================
 
 if __name__ == "__main__":
-    import glob
-    import os
+    from channel_comparison import compare_channels
+    from corpus_reader import list_channels, list_channel_files
+    from frequency_store import FrequencyTables
+    from instrumentation import Instrumentation
 
     # ========================================================================
     # ADIM 1: KLASÖR YAPISINI TANIMLAMA
@@ -307,6 +634,29 @@ if __name__ == "__main__":
         os.makedirs(output_dir)
         print(f"✓ '{output_dir}' klasörü oluşturuldu")
 
+    # Artımlı analiz: sadece değişen / yeni dosyalar tokenize edilir
+    # (dosya imzaları ve dosya başına kelime sayaçları output/.cache altında saklanır)
+    cache_dir = os.path.join(output_dir, ".cache")
+
+    # Headless mod: pyplot penceresi açılmaz, word cloud'lar en sonda
+    # süreç havuzunda paralel olarak doğrudan PNG'ye yazılır (sunucu için)
+    headless = False
+    wordcloud_jobs = []
+
+    # Sıklık tablolarının formatı:
+    # 'csv' = her kanal için <kanal>_frequencies.csv + <kanal>_vocabulary.txt
+    # 'npz' = tüm kanallar tek dosyada, ortak kelime sözlüğüyle (FREQUENCIES.npz,
+    #         okumak için frequency_store.FrequencyTables.load)
+    output_format = 'csv'
+
+    # Çalışma raporu: aşama süreleri ve sayaçlar output/RUN_REPORT.json'a yazılır
+    # profile = True ise tüm çalışma cProfile ile ayrıca output/news_analysis.prof'a kaydedilir
+    profile = False
+    instrumentation = Instrumentation(
+        'news_analysis',
+        profile_path=os.path.join(output_dir, "news_analysis.prof") if profile else None
+    )
+
     # ========================================================================
     # ADIM 2: ANALYZER'I BAŞLAT
     # ========================================================================
@@ -318,16 +668,26 @@ if __name__ == "__main__":
     analyzer = NewsTextAnalyzer(
         remove_stopwords=True,
         min_word_length=3,
-        language='turkish'
+        language='turkish',
+        instrumentation=instrumentation
     )
 
     # ========================================================================
     # ADIM 3: HER BİR HABER KANALI İÇİN WORD CLOUD OLUŞTUR
     # ========================================================================
 
+    manifest = RunManifest(os.path.join(cache_dir, "news_analysis_manifest.json"),
+                           config=analyzer_config(analyzer))
+    file_results = ResultStore(os.path.join(cache_dir, "news_analysis_counts"))
+
     # Ekonomi klasörü altındaki tüm alt klasörleri bul (her biri bir kanal)
-    channel_folders = [f for f in os.listdir(base_path)
-                       if os.path.isdir(os.path.join(base_path, f))]
+    channel_folders = list_channels(base_path)
+
+    # Son çalıştırmadan bu yana silinen dosyalar (kanal bazında)
+    removed_by_channel = {}
+    all_txt_files = [p for channel in channel_folders for p in list_channel_files(base_path, channel)]
+    for removed_path, entry in manifest.prune(all_txt_files):
+        removed_by_channel.setdefault(entry['result']['channel'], []).append(removed_path)
 
     print(f"\n✓ Bulunan haber kanalları: {len(channel_folders)}")
     for channel in channel_folders:
@@ -341,41 +701,40 @@ if __name__ == "__main__":
         print(f"İŞLENİYOR: {channel_name}")
         print("=" * 70)
 
-        # Bu kanalın klasör yolu
-        channel_path = os.path.join(base_path, channel_name)
-
         # Bu klasördeki tüm .txt dosyalarını bul
-        txt_files = glob.glob(os.path.join(channel_path, "*.txt"))
+        txt_files = list_channel_files(base_path, channel_name)
 
         print(f"Bulunan metin dosyası sayısı: {len(txt_files)}")
 
+        removed_files = removed_by_channel.pop(channel_name, [])
+
         if len(txt_files) == 0:
+            for removed_path in removed_files:
+                file_results.delete(removed_path)
+            manifest.set_aggregate(channel_name, None)
             print(f"⚠ {channel_name} için metin dosyası bulunamadı, atlanıyor...")
             continue
 
-        # Tüm metinleri oku
-        channel_texts = []
-        for txt_file in txt_files:
-            try:
-                with open(txt_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    if content.strip():  # Boş değilse ekle
-                        channel_texts.append(content)
-            except Exception as e:
-                print(f"  ⚠ Dosya okunamadı {os.path.basename(txt_file)}: {e}")
+        # Kelime sıklıklarını hesapla (sadece değişen dosyalar satır satır okunup tokenize edilir)
+        with instrumentation.stage('frequencies'):
+            word_freq, files_read, failed_files, changed_count = update_channel_frequencies(
+                analyzer, channel_name, txt_files, manifest, file_results, removed_files
+            )
+        instrumentation.count('changed_files', changed_count)
+        print(f"✓ Yeni / değişen dosya: {changed_count}, silinen dosya: {len(removed_files)}")
+
+        for failed_file, e in failed_files:
+            print(f"  ⚠ Dosya okunamadı {os.path.basename(failed_file)}: {e}")
 
-        print(f"✓ Başarıyla okunan dosya: {len(channel_texts)}")
+        print(f"✓ Başarıyla okunan dosya: {files_read}")
 
-        if len(channel_texts) == 0:
+        if files_read == 0:
             print(f"⚠ {channel_name} için geçerli metin bulunamadı, atlanıyor...")
             continue
 
-        # Kelime dağarcığı çıkar
-        vocabulary = analyzer.extract_vocabulary(channel_texts)
+        # Kelime dağarcığı = sıklık tablosundaki kelimeler
+        vocabulary = analyzer.vocabulary_from_frequencies(word_freq)
         print(f"✓ Kelime dağarcığı boyutu: {len(vocabulary)} benzersiz kelime")
-
-        # Kelime sıklıklarını hesapla
-        word_freq = analyzer.get_word_frequencies(channel_texts)
         print(f"✓ Toplam kelime sayısı: {sum(word_freq.values())}")
 
         # En sık kullanılan 10 kelimeyi göster
@@ -383,43 +742,58 @@ if __name__ == "__main__":
         for word, count in word_freq.most_common(10):
             print(f"  {word:20s}: {count:4d}")
 
-        # Kelime sıklıklarını CSV'ye kaydet
-        freq_df = pd.DataFrame(word_freq.most_common(),
-                               columns=['kelime', 'sıklık'])
-        csv_filename = os.path.join(output_dir, f"{channel_name}_frequencies.csv")
-        freq_df.to_csv(csv_filename, index=False, encoding='utf-8-sig')
-        print(f"\n✓ Kelime sıklıkları kaydedildi: {csv_filename}")
-
-        # Kelime dağarcığını kaydet
-        vocab_filename = os.path.join(output_dir, f"{channel_name}_vocabulary.txt")
-        with open(vocab_filename, 'w', encoding='utf-8') as f:
-            for word in vocabulary:
-                f.write(word + '\n')
-        print(f"✓ Kelime dağarcığı kaydedildi: {vocab_filename}")
+        if output_format == 'csv':
+            with instrumentation.stage('write_tables'):
+                # Kelime sıklıklarını CSV'ye kaydet
+                freq_df = pd.DataFrame(word_freq.most_common(),
+                                       columns=['kelime', 'sıklık'])
+                csv_filename = os.path.join(output_dir, f"{channel_name}_frequencies.csv")
+                freq_df.to_csv(csv_filename, index=False, encoding='utf-8-sig')
+                print(f"\n✓ Kelime sıklıkları kaydedildi: {csv_filename}")
+
+                # Kelime dağarcığını kaydet
+                vocab_filename = os.path.join(output_dir, f"{channel_name}_vocabulary.txt")
+                with open(vocab_filename, 'w', encoding='utf-8') as f:
+                    for word in vocabulary:
+                        f.write(word + '\n')
+                print(f"✓ Kelime dağarcığı kaydedildi: {vocab_filename}")
 
         # Word Cloud oluştur
         wordcloud_filename = os.path.join(output_dir, f"{channel_name}_wordcloud.png")
-        print(f"\n📊 Word cloud oluşturuluyor...")
-
-        wc = analyzer.create_word_cloud(
-            channel_texts,
-            width=1600,
-            height=800,
-            max_words=150,
-            colormap='RdYlBu_r',
-            save_path=wordcloud_filename#optional, not given for now
-        )
 
-        print(f"✓ Word cloud kaydedildi: {wordcloud_filename}")
+        if headless:
+            wordcloud_jobs.append({'frequencies': word_freq, 'save_path': wordcloud_filename,
+                                   'width': 1600, 'height': 800, 'max_words': 150,
+                                   'colormap': 'RdYlBu_r'})
+        else:
+            print(f"\n📊 Word cloud oluşturuluyor...")
+
+            wc = analyzer.create_word_cloud(
+                word_freq,
+                width=1600,
+                height=800,
+                max_words=150,
+                colormap='RdYlBu_r',
+                save_path=wordcloud_filename#optional, not given for now
+            )
+
+            print(f"✓ Word cloud kaydedildi: {wordcloud_filename}")
 
         # Bu kanalın verisini sakla (karşılaştırma için)
         all_channels_data[channel_name] = {
-            'texts': channel_texts,
             'vocabulary': vocabulary,
             'word_freq': word_freq,
             'file_count': len(txt_files)
         }
 
+    # Klasörü tamamen silinmiş kanalların kayıtlarını temizle
+    for channel_name, removed_files in removed_by_channel.items():
+        for removed_path in removed_files:
+            file_results.delete(removed_path)
+        manifest.set_aggregate(channel_name, None)
+
+    manifest.save()
+
     # ========================================================================
     # ADIM 4: TÜM KANALLAR İÇİN BİRLEŞİK ANALİZ
     # ========================================================================
@@ -428,43 +802,67 @@ if __name__ == "__main__":
     print("TÜM KANALLAR - BİRLEŞİK ANALİZ")
     print("=" * 70)
 
-    # Tüm metinleri birleştir
-    all_texts = []
-    for channel_data in all_channels_data.values():
-        all_texts.extend(channel_data['texts'])
+    if len(all_channels_data) > 0:
+        # Genel kelime sıklıkları: kanal sıklıkları toplanır, metinler tekrar tokenize edilmez
+        all_word_freq = analyzer.merge_frequencies(
+            data['word_freq'] for data in all_channels_data.values()
+        )
 
-    if len(all_texts) > 0:
         # Genel kelime dağarcığı
-        all_vocabulary = analyzer.extract_vocabulary(all_texts)
+        all_vocabulary = analyzer.vocabulary_from_frequencies(all_word_freq)
         print(f"\n✓ Toplam benzersiz kelime (tüm kanallar): {len(all_vocabulary)}")
 
-        # Genel kelime sıklıkları
-        all_word_freq = analyzer.get_word_frequencies(all_texts)
         print(f"✓ Toplam kelime sayısı (tüm kanallar): {sum(all_word_freq.values())}")
 
         print(f"\nTüm kanallarda en sık kullanılan 20 kelime:")
         for word, count in all_word_freq.most_common(20):
             print(f"  {word:20s}: {count:5d}")
 
-        # Genel CSV kaydet
-        all_freq_df = pd.DataFrame(all_word_freq.most_common(),
-                                   columns=['kelime', 'sıklık'])
-        all_csv = os.path.join(output_dir, "ALL_CHANNELS_frequencies.csv")
-        all_freq_df.to_csv(all_csv, index=False, encoding='utf-8-sig')
-        print(f"\n✓ Genel kelime sıklıkları kaydedildi: {all_csv}")
+        with instrumentation.stage('write_tables'):
+            if output_format == 'csv':
+                # Genel CSV kaydet
+                all_freq_df = pd.DataFrame(all_word_freq.most_common(),
+                                           columns=['kelime', 'sıklık'])
+                all_csv = os.path.join(output_dir, "ALL_CHANNELS_frequencies.csv")
+                all_freq_df.to_csv(all_csv, index=False, encoding='utf-8-sig')
+                print(f"\n✓ Genel kelime sıklıkları kaydedildi: {all_csv}")
+            else:
+                # Tüm kanalların tabloları tek seferde (ALL_CHANNELS ve kelime
+                # dağarcıkları bu dosyadan türetilir, ayrıca yazılmaz)
+                tables = FrequencyTables.from_counters(
+                    {channel: data['word_freq'] for channel, data in all_channels_data.items()}
+                )
+                tables_path = os.path.join(output_dir, "FREQUENCIES.npz")
+                tables.save(tables_path)
+                print(f"\n✓ Kelime sıklıkları kaydedildi ({len(tables.names)} kanal, "
+                      f"{len(tables.terms)} kelime): {tables_path}")
 
         # Genel word cloud
         all_wordcloud = os.path.join(output_dir, "ALL_CHANNELS_wordcloud.png")
-        print(f"\n📊 Genel word cloud oluşturuluyor...")
-        analyzer.create_word_cloud(
-            all_texts,
-            width=1920,
-            height=1080,
-            max_words=200,
-            colormap='RdYlBu_r',
-            save_path=all_wordcloud#optional, not given for now
-        )
-        print(f"✓ Genel word cloud kaydedildi: {all_wordcloud}")
+
+        if headless:
+            wordcloud_jobs.append({'frequencies': all_word_freq, 'save_path': all_wordcloud,
+                                   'width': 1920, 'height': 1080, 'max_words': 200,
+                                   'colormap': 'RdYlBu_r'})
+        else:
+            print(f"\n📊 Genel word cloud oluşturuluyor...")
+            analyzer.create_word_cloud(
+                all_word_freq,
+                width=1920,
+                height=1080,
+                max_words=200,
+                colormap='RdYlBu_r',
+                save_path=all_wordcloud#optional, not given for now
+            )
+            print(f"✓ Genel word cloud kaydedildi: {all_wordcloud}")
+
+    if wordcloud_jobs:
+        print(f"\n📊 {len(wordcloud_jobs)} word cloud paralel oluşturuluyor (headless)...")
+        with instrumentation.stage('word_cloud'):
+            paths = render_word_clouds(wordcloud_jobs)
+        instrumentation.count('word_clouds', len(paths))
+        for path in paths:
+            print(f"✓ Word cloud kaydedildi: {path}")
 
     # ========================================================================
     # ADIM 5: ÖZET RAPOR
@@ -491,17 +889,33 @@ if __name__ == "__main__":
     summary_df.to_csv(summary_csv, index=False, encoding='utf-8-sig')
     print(f"\n✓ Özet rapor kaydedildi: {summary_csv}")
 
+    # Kanallar arası karşılaştırma (her kanalı diğerlerinden ayıran kelimeler)
+    if len(all_channels_data) > 1:
+        with instrumentation.stage('channel_comparison'):
+            comparison_df = compare_channels(
+                {channel: data['word_freq'] for channel, data in all_channels_data.items()},
+                top_n=20
+            )
+        comparison_csv = os.path.join(output_dir, "CHANNEL_COMPARISON.csv")
+        comparison_df.to_csv(comparison_csv, index=False, encoding='utf-8-sig')
+
+        print("\nKanalları ayıran kelimeler (log-odds z-skoru, ilk 5):")
+        for channel, group in comparison_df.groupby('Kanal', sort=False):
+            top_terms = ", ".join(f"{w} ({z:.1f})" for w, z in
+                                  zip(group['Kelime'].head(5), group['Log-Odds Z'].head(5)))
+            print(f"  {channel:15s}: {top_terms}")
+        print(f"\n✓ Kanal karşılaştırması kaydedildi: {comparison_csv}")
+
     # Enflasyon kelimeleri analizi
     print("\n" + "=" * 70)
     print("ENFLASYON KELİMELERİ ANALİZİ (Tüm Kanallar)")
     print("=" * 70)
 
-    inflation_keywords = ['enflasyon', 'fiyat', 'ücret', 'maaş', 'ekonomi',
-                          'tüketici', 'merkez', 'banka', 'faiz', 'artış',
-                          'yüksek', 'düşük', 'oran', 'gıda', 'enerji',
-                          'tüfe', 'üfe', 'kur', 'döviz', 'büyüme']
+    # Kelime listesi inflation_lexicon.json'da (Filtering.py ile ortak sözlük)
+    # Belge bazında sayımlar için: lexicon_scorer.py -> output/INFLATION_HITS.npz
+    inflation_keywords = load_lexicon()['inflation_keywords']
 
-    if len(all_texts) > 0:
+    if len(all_channels_data) > 0:
         print("\nAnahtar kelimelerin görünme sıklığı:")
         inflation_counts = []
         for keyword in inflation_keywords:
@@ -524,8 +938,16 @@ if __name__ == "__main__":
     print("=" * 70)
     print(f"\nTüm çıktılar '{output_dir}' klasöründe:")
     print(f"  - Her kanal için word cloud (PNG)")
-    print(f"  - Her kanal için kelime sıklıkları (CSV)")
-    print(f"  - Her kanal için kelime dağarcığı (TXT)")
+    if output_format == 'csv':
+        print(f"  - Her kanal için kelime sıklıkları (CSV)")
+        print(f"  - Her kanal için kelime dağarcığı (TXT)")
+    else:
+        print(f"  - Tüm kanalların kelime sıklıkları (FREQUENCIES.npz)")
     print(f"  - Genel word cloud ve analizler")
     print(f"  - Özet rapor ve enflasyon analizi")
-    print("=" * 70)
\ No newline at end of file
+    print("=" * 70)
+
+    # Aşama süreleri (hangi aşamanın optimize edilmesi gerektiğini gösterir)
+    run_report = instrumentation.write_report(os.path.join(output_dir, "RUN_REPORT.json"))
+    print("\n" + instrumentation.summary())
+    print(f"✓ Çalışma raporu kaydedildi: {run_report}")
\ No newline at end of file
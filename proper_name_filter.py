@@ -0,0 +1,83 @@
+import re
+
+
+_END = ""  # trie düğümünde "burada bir ek bitiyor" işareti (değeri ek uzunluğu)
+
+# Harf ve apostrof dışındaki karakterler (bir kez derlenir)
+_NON_LETTER_APOSTROPHE = re.compile(r"[^a-zA-ZçÇğĞıİöÖşŞüÜ']")
+
+
+def clean_word_keep_apostrophe(word):
+    """
+    Noktalama ve özel karakterleri siler, apostrofu korur ("Ankara'da," -> "Ankara'da").
+    test_fsm_2.py, test_fsm_3.py ve Normalize_Wrong_Words_Only.py bu fonksiyonu kullanır.
+    """
+    return _NON_LETTER_APOSTROPHE.sub("", word)
+
+
+# -------------------------------------------------------
+# Özel isim + ek eşleştirici
+# -------------------------------------------------------
+class ProperNameFilter:
+    """
+    test_fsm_2.py / test_fsm_3.py'deki is_proper_name_with_suffix() ile aynı sonucu verir:
+    kelime eklerden biriyle bitiyor ve eki atılmış kökü proper_names içindeyse True.
+
+    Ekler bir kez, ters çevrilmiş bir trie'ye derlenir ("nın" -> n, ı, n). Kelime
+    sondan başa tek geçişte yürünür; bir ekin bittiği her düğümde kök kümede aranır.
+    Her çağrıda ekleri sıralamak ve 27 ek için endswith denemek gerekmez.
+
+    proper_suffixes: ek listesi
+    proper_names   : özel isim kümesi (canlı referans; kümeye sonradan eklenen
+                     isimler de kullanılır)
+    """
+
+    def __init__(self, proper_suffixes, proper_names):
+        self.proper_suffixes = list(proper_suffixes)
+        self.proper_names = proper_names
+        self._suffixes_longest_first = sorted(self.proper_suffixes, key=len, reverse=True)
+
+        self._trie = {}
+        for suf in self.proper_suffixes:
+            node = self._trie
+            for ch in reversed(suf):
+                node = node.setdefault(ch, {})
+            node[_END] = len(suf)
+
+    def _legacy_match(self, cleaned):
+        # Eski algoritma: lower() uzunluğu değiştirdiğinde ("İ" -> "i̇") kök
+        # cleaned üzerinden kesildiği için sonuç farklı olabilir, o durumda kullanılır
+        for suf in self._suffixes_longest_first:
+            if cleaned.lower().endswith(suf):
+                root = cleaned[:-len(suf)]
+                if root.lower() in self.proper_names:
+                    return True
+        return False
+
+    def match_cleaned(self, cleaned):
+        """
+        Temizlenmiş kelime (clean_word_keep_apostrophe sonrası) için eşleşme.
+        """
+        lowered = cleaned.lower()
+        if len(lowered) != len(cleaned):
+            return self._legacy_match(cleaned)
+
+        names = self.proper_names
+        node = self._trie
+        k = 0
+        for ch in reversed(lowered):
+            node = node.get(ch)
+            if node is None:
+                return False
+            k += 1
+            if _END in node and lowered[:-k] in names:
+                return True
+        return False
+
+    def is_proper_name_with_suffix(self, word):
+        """
+        Eski fonksiyonun yerine doğrudan kullanılabilir (kelimeyi kendisi temizler).
+        """
+        return self.match_cleaned(clean_word_keep_apostrophe(word))
+
+    __call__ = is_proper_name_with_suffix
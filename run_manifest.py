@@ -0,0 +1,167 @@
+import os
+import json
+import hashlib
+
+
+# -------------------------------------------------------
+# Dosya imzası (boyut, mtime, içerik hash'i)
+# -------------------------------------------------------
+def file_signature(path, stat=None):
+    if stat is None:
+        stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def file_hash(path):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _path_key(path):
+    return os.path.normcase(os.path.abspath(path))
+
+
+def _write_json(path, data):
+    # Önce geçici dosyaya yaz, sonra değiştir: yarıda kesilen çalışma manifesti bozmasın
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+# -------------------------------------------------------
+# Çalıştırma manifesti
+# -------------------------------------------------------
+class RunManifest:
+    """
+    Bir aşamanın daha önce işlediği dosyaları hatırlar.
+
+    Her dosya için (boyut, mtime, sha1) ve küçük bir sonuç (örn. blok / cümle sayısı)
+    saklanır. Boyut ve mtime aynıysa dosya değişmemiş sayılır; sadece mtime
+    değişmişse içerik hash'i karşılaştırılır.
+
+    config: Aşamanın ayarları (örn. tokenizer, min_word_length). Kayıtlı ayarlar
+    farklıysa manifest boş başlar ve her dosya yeniden işlenir.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path, config=None):
+        self.path = path
+        self.config = config or {}
+        self.files = {}
+        self.aggregates = {}
+
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == self.VERSION and data.get("config") == self.config:
+                self.files = data.get("files", {})
+                self.aggregates = data.get("aggregates", {})
+
+    def is_unchanged(self, path, stat=None):
+        entry = self.files.get(_path_key(path))
+        if entry is None:
+            return False
+
+        size, mtime_ns = file_signature(path, stat)
+        if entry["size"] != size:
+            return False
+        if entry["mtime_ns"] == mtime_ns:
+            return True
+
+        # Dosyaya dokunulmuş ama içerik aynı olabilir (örn. tekrar kopyalanmış)
+        if file_hash(path) == entry["sha1"]:
+            entry["mtime_ns"] = mtime_ns
+            return True
+        return False
+
+    def is_up_to_date(self, path, outputs=()):
+        """
+        Kaynak dosya değişmemiş ve beklenen çıktı dosyalarının hepsi duruyorsa True.
+        """
+        return self.is_unchanged(path) and all(os.path.exists(p) for p in outputs)
+
+    def get_result(self, path):
+        entry = self.files.get(_path_key(path))
+        return None if entry is None else entry.get("result")
+
+    def record(self, path, result=None, stat=None, sha1=None):
+        """
+        sha1: Dosya zaten okunduysa içeriğin hash'i (verilmezse dosya tekrar okunur)
+        """
+        size, mtime_ns = file_signature(path, stat)
+        self.files[_path_key(path)] = {
+            "size": size,
+            "mtime_ns": mtime_ns,
+            "sha1": sha1 if sha1 is not None else file_hash(path),
+            "result": result,
+        }
+
+    def forget(self, path):
+        return self.files.pop(_path_key(path), None)
+
+    def prune(self, existing_paths):
+        """
+        Artık bulunmayan dosyaların kayıtlarını siler.
+        Silinen (anahtar, kayıt) çiftlerini döndürür.
+        """
+        existing = {_path_key(p) for p in existing_paths}
+        removed = [(key, entry) for key, entry in self.files.items() if key not in existing]
+        for key, _ in removed:
+            del self.files[key]
+        return removed
+
+    def get_aggregate(self, name):
+        return self.aggregates.get(name)
+
+    def set_aggregate(self, name, value):
+        self.aggregates[name] = value
+
+    def save(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        _write_json(self.path, {
+            "version": self.VERSION,
+            "config": self.config,
+            "files": self.files,
+            "aggregates": self.aggregates,
+        })
+
+
+# -------------------------------------------------------
+# Büyük dosya sonuçları için depo (örn. kelime sayaçları)
+# -------------------------------------------------------
+class ResultStore:
+    """
+    Dosya başına büyük sonuçları (örn. token Counter'ları) manifestten ayrı,
+    her kaynak dosya için bir JSON olarak saklar. Sadece ihtiyaç duyulan
+    dosyanın sonucu okunur.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _result_path(self, path):
+        name = hashlib.sha1(_path_key(path).encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, name + ".json")
+
+    def get(self, path):
+        result_path = self._result_path(path)
+        if not os.path.exists(result_path):
+            return None
+        with open(result_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def put(self, path, result):
+        _write_json(self._result_path(path), result)
+
+    def delete(self, path):
+        result_path = self._result_path(path)
+        if os.path.exists(result_path):
+            os.remove(result_path)
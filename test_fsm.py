@@ -2,7 +2,10 @@ import sys
 import os
 import glob
 import pandas as pd
-from MorphologicalAnalysis.FsmMorphologicalAnalyzer import FsmMorphologicalAnalyzer
+from corpus_io import read_text
+from fsm_cache import CachedFsmAnalyzer
+from instrumentation import Instrumentation
+from morphology_db import DEFAULT_DB_PATH
 
 # Suppress standard output temporarily
 class DummyFile(object):
@@ -10,7 +13,7 @@ class DummyFile(object):
     def flush(self): pass
 
 # Morfolojik analizör
-fsm = FsmMorphologicalAnalyzer()
+fsm = CachedFsmAnalyzer(store_path=DEFAULT_DB_PATH)
 
 # Haber klasör yolu
 base_path = r"C:\work\4th-Grade-Fall\CS401\DropboxBackUp\Ekonomi-Yapilmayanlar"
@@ -18,6 +21,9 @@ base_path = r"C:\work\4th-Grade-Fall\CS401\DropboxBackUp\Ekonomi-Yapilmayanlar"
 # Sonuçları saklamak için liste
 results = []
 
+# Aşama süreleri ve sayaçlar (test_fsm_run_report.json)
+instrumentation = Instrumentation("test_fsm")
+
 orig_stdout = sys.stdout
 sys.stdout = DummyFile()  # suppress analyzer output
 
@@ -32,34 +38,46 @@ for channel_folder in os.listdir(base_path):
     txt_files = glob.glob(os.path.join(channel_path, "*.txt"))
     for file_path in txt_files:
         file_name = os.path.basename(file_path)
-        with open(file_path, "r", encoding="utf-8") as f:
-            text = f.read()
+        with instrumentation.stage("read"):
+            text = read_text(file_path)
+        instrumentation.count("files")
 
         # Split by lines instead of sentences (better for transcriptions)
         lines = text.splitlines()
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
+        with instrumentation.stage("analyze"):
+            for line in lines:
+                line = line.strip()
+                if not line:
+                    continue
 
-            words = line.split()
-            for i, word in enumerate(words):
-                fsmParseList = fsm.morphologicalAnalysis(word)
-                if fsmParseList.size() == 0:
-                    # Sliding window context
-                    start = max(0, i - window_size)
-                    end = min(len(words), i + window_size + 1)
-                    context = " ".join(words[start:end])
-                    results.append({
-                        "Haber Kanalı": channel_folder,
-                        "Dosya Adı": file_name,
-                        "Yanlış Yazılmış Kelime": word,
-                        "Bağlam": context
-                    })
+                words = line.split()
+                instrumentation.count("lines")
+                instrumentation.count("words", len(words))
+                for i, word in enumerate(words):
+                    fsmParseList = fsm.morphologicalAnalysis(word)
+                    if fsmParseList.size() == 0:
+                        # Sliding window context
+                        start = max(0, i - window_size)
+                        end = min(len(words), i + window_size + 1)
+                        context = " ".join(words[start:end])
+                        results.append({
+                            "Haber Kanalı": channel_folder,
+                            "Dosya Adı": file_name,
+                            "Yanlış Yazılmış Kelime": word,
+                            "Bağlam": context
+                        })
 
 sys.stdout = orig_stdout  # restore printing
 
 # Save results as a readable CSV
-df = pd.DataFrame(results)
-df.to_csv("yanlis_kelimeler.csv", index=False, encoding="utf-8")
-print("Yanlış yazılmış kelimeler ve bağlamları CSV'ye kaydedildi.")
\ No newline at end of file
+with instrumentation.stage("write"):
+    df = pd.DataFrame(results)
+    df.to_csv("yanlis_kelimeler.csv", index=False, encoding="utf-8")
+print("Yanlış yazılmış kelimeler ve bağlamları CSV'ye kaydedildi.")
+print(fsm.report())
+
+instrumentation.count("wrong_words", len(results))
+instrumentation.add_stats("fsm", fsm.stats())
+instrumentation.write_report("test_fsm_run_report.json")
+print(instrumentation.summary())
+fsm.close()
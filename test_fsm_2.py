@@ -2,8 +2,11 @@ import sys
 import os
 import glob
 import pandas as pd
-import re
-from MorphologicalAnalysis.FsmMorphologicalAnalyzer import FsmMorphologicalAnalyzer
+from fsm_cache import CachedFsmAnalyzer
+from morphology_db import DEFAULT_DB_PATH
+from proper_name_filter import ProperNameFilter, clean_word_keep_apostrophe
+from line_cache import LineCache, read_cleaned_lines
+from instrumentation import Instrumentation
 
 
 # ------------------------
@@ -16,7 +19,7 @@ class DummyFile(object):
 # ------------------------
 # Morfolojik analizör
 # ------------------------
-fsm = FsmMorphologicalAnalyzer()
+fsm = CachedFsmAnalyzer(store_path=DEFAULT_DB_PATH)
 
 # ------------------------
 # Haber klasör yolu
@@ -28,6 +31,9 @@ base_path = r"C:\work\4th-Grade-Fall\CS401\DropboxBackUp\Ekonomi-Yapilmayanlar"
 # ------------------------
 results = []
 
+# Aşama süreleri ve sayaçlar (test_fsm_2_run_report.json)
+instrumentation = Instrumentation("test_fsm_2")
+
 # Fsm çıktısını bastır
 orig_stdout = sys.stdout
 sys.stdout = DummyFile()
@@ -48,27 +54,19 @@ proper_suffixes = [
 ]
 proper_names = set()
 
-def extract_proper_names(text):
-    for w in text.split():
-        w_clean = clean_word(w)
+def extract_proper_names(cleaned_words):
+    # cleaned_words apostroflu temizlenmiş kelimeler; apostrof atılınca sadece harfler kalır
+    for w in cleaned_words:
+        w_clean = w.replace("'", "")
         if len(w_clean) > 1 and w_clean[0].isupper():
             proper_names.add(w_clean)
             proper_names.add(w_clean.lower())  # küçük hali de özel isim olarak kabul edilir
 
 
-# 1. proper_names oluştururken apostrofları koru
-def clean_word_keep_apostrophe(word):
-    return re.sub(r"[^a-zA-ZçÇğĞıİöÖşŞüÜ']", "", word)
-
-# 2. is_proper_name_with_suffix'de kökü doğru al
-def is_proper_name_with_suffix(word):
-    cleaned = clean_word_keep_apostrophe(word)
-    for suf in sorted(proper_suffixes, key=len, reverse=True):
-        if cleaned.lower().endswith(suf):
-            root = cleaned[:-len(suf)]
-            if root.lower() in proper_names:
-                return True
-    return False
+# 1. proper_names oluştururken apostroflar korunur (clean_word_keep_apostrophe, proper_name_filter.py)
+# 2. name_filter.is_proper_name_with_suffix kökü eki atarak doğru alır
+# Ekler bir kez ters trie'ye derlenir; proper_names kümesine canlı referans tutulur
+name_filter = ProperNameFilter(proper_suffixes, proper_names)
 
 
 def is_acronym(word):
@@ -77,11 +75,9 @@ def is_acronym(word):
 # Tüm metinlerde geçen büyük harfle başlayan kelimeler toplanacak
 
 
-# Noktalama ve özel karakter temizleme fonksiyonu
-def clean_word(word):
-    # Sadece harf ve Türkçe karakterleri bırak
-    return re.sub(r"[^a-zA-ZçÇğĞıİöÖşŞüÜ]", "", word)
-
+# Her dosya bir kez okunur: temizlenmiş satırlar önbelleğe alınır, özel isimler toplanır
+# (korpus belleğe sığmıyorsa: LineCache(spill_path="satir_onbellegi.tmp"))
+line_cache = LineCache()
 
 for channel_folder in os.listdir(base_path):
     channel_path = os.path.join(base_path, channel_folder)
@@ -91,30 +87,20 @@ for channel_folder in os.listdir(base_path):
     txt_files = glob.glob(os.path.join(channel_path, "*.txt"))
     for file_path in txt_files:
         file_name = os.path.basename(file_path)
-        with open(file_path, "r", encoding="utf-8") as f:
-            text = f.read()
-            extract_proper_names(text)
-
-for channel_folder in os.listdir(base_path):
-    channel_path = os.path.join(base_path, channel_folder)
-    if not os.path.isdir(channel_path):
-        continue
-
-    txt_files = glob.glob(os.path.join(channel_path, "*.txt"))
-    for file_path in txt_files:
-        file_name = os.path.basename(file_path)
-        with open(file_path, "r", encoding="utf-8") as f:
-            text = f.read()
-
-        lines = text.splitlines()
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-
-            words = line.split()
-            cleaned_words = [clean_word_keep_apostrophe(w) for w in words]
-
+        with instrumentation.stage("read"):
+            lines = read_cleaned_lines(file_path, clean_word_keep_apostrophe)
+        with instrumentation.stage("proper_names"):
+            for words, cleaned_words in lines:
+                extract_proper_names(cleaned_words)
+        instrumentation.count("files")
+        instrumentation.count("lines", len(lines))
+        instrumentation.count("words", sum(len(words) for words, _ in lines))
+        line_cache.add((channel_folder, file_name, lines))
+
+# Yanlış kelimeler önbellekten bulunur (dosyalar tekrar okunmaz)
+with instrumentation.stage("analyze"):
+    for channel_folder, file_name, lines in line_cache:
+        for words, cleaned_words in lines:
             for i, word in enumerate(cleaned_words):
                 if not word:  # boş kelimeyi atla
                     continue
@@ -123,7 +109,7 @@ for channel_folder in os.listdir(base_path):
                 fsmParseList = fsm.morphologicalAnalysis(word)
                 if fsmParseList.size() == 0:  # Boşsa kelime yanlış
                     # Bağlam oluştur (temizlenmiş kelimelerle)
-                    if is_proper_name_with_suffix(cleaned_words[i]):
+                    if name_filter.match_cleaned(cleaned_words[i]):
                         continue
 
                     if is_acronym(words[i]):
@@ -140,12 +126,22 @@ for channel_folder in os.listdir(base_path):
                         "Bağlam": context
                     })
 
+line_cache.close()
+
 # stdout'u geri al
 sys.stdout = orig_stdout
 
 # ------------------------
 # CSV olarak kaydet
 # ------------------------
-df = pd.DataFrame(results)
-df.to_csv("yanlis_kelimeler_temiz-02.csv", index=False, encoding="utf-8-sig")  # Excel uyumlu UTF-8
+with instrumentation.stage("write"):
+    df = pd.DataFrame(results)
+    df.to_csv("yanlis_kelimeler_temiz-02.csv", index=False, encoding="utf-8-sig")  # Excel uyumlu UTF-8
 print(f"{len(results)} adet yanlış yazılmış kelime bulundu ve CSV'ye kaydedildi.")
+print(fsm.report())
+
+instrumentation.count("wrong_words", len(results))
+instrumentation.add_stats("fsm", fsm.stats())
+instrumentation.write_report("test_fsm_2_run_report.json")
+print(instrumentation.summary())
+fsm.close()
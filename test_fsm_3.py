@@ -2,8 +2,11 @@ import sys
 import os
 import glob
 import pandas as pd
-import re
-from MorphologicalAnalysis.FsmMorphologicalAnalyzer import FsmMorphologicalAnalyzer
+from fsm_cache import CachedFsmAnalyzer
+from morphology_db import DEFAULT_DB_PATH
+from proper_name_filter import ProperNameFilter, clean_word_keep_apostrophe
+from line_cache import LineCache, read_cleaned_lines
+from instrumentation import Instrumentation
 
 
 # ------------------------
@@ -18,7 +21,7 @@ class DummyFile(object):
 # ------------------------
 # Morfolojik analizör
 # ------------------------
-fsm = FsmMorphologicalAnalyzer()
+fsm = CachedFsmAnalyzer(store_path=DEFAULT_DB_PATH)
 
 # ------------------------
 # Haber klasör yolu
@@ -30,6 +33,9 @@ base_path = r"C:\work\4th-Grade-Fall\CS401\DropboxBackUp\Ekonomi-Yapilmayanlar"
 # ------------------------
 results = []
 
+# Aşama süreleri ve sayaçlar (test_fsm_3_run_report.json)
+instrumentation = Instrumentation("test_fsm_3")
+
 # Fsm çıktısını bastır
 orig_stdout = sys.stdout
 sys.stdout = DummyFile()
@@ -52,23 +58,11 @@ proper_suffixes = [
 proper_names = set()  # özel isimler (küçük harf ile tutulacak)
 
 
-# ------------------------
-# Noktalama ve özel karakter temizleme
-# ------------------------
-def clean_word(word):
-    return re.sub(r"[^a-zA-ZçÇğĞıİöÖşŞüÜ]", "", word)
-
-
-def clean_word_keep_apostrophe(word):
-    return re.sub(r"[^a-zA-ZçÇğĞıİöÖşŞüÜ']", "", word)
-
-
 # ------------------------
 # Özel isimleri çıkar
 # ------------------------
-def extract_proper_names(text):
-    for w in text.split():
-        w_clean = clean_word_keep_apostrophe(w)
+def extract_proper_names(cleaned_words):
+    for w_clean in cleaned_words:
         if len(w_clean) > 1:
             proper_names.add(w_clean.lower())  # tüm kelimeleri küçük harf olarak ekle
 
@@ -76,17 +70,12 @@ def extract_proper_names(text):
 # ------------------------
 # Özel isim ve ek kontrolleri
 # ------------------------
-def is_proper_name_with_suffix(word):
-    cleaned = clean_word_keep_apostrophe(word)
-    for suf in sorted(proper_suffixes, key=len, reverse=True):
-        if cleaned.lower().endswith(suf):
-            root = cleaned[:-len(suf)]
-            if root.lower() in proper_names:
-                return True
-    return False
+# Ekler bir kez ters trie'ye derlenir; proper_names kümesine canlı referans tutulur
+name_filter = ProperNameFilter(proper_suffixes, proper_names)
+
 
-def is_proper_name_without_suffix(word):
-    cleaned = clean_word_keep_apostrophe(word)
+def is_proper_name_without_suffix(cleaned):
+    # cleaned: clean_word_keep_apostrophe ile temizlenmiş kelime
 
     # Must be longer than 1 character and start uppercase
     if len(cleaned) > 1 and cleaned[0].isupper():
@@ -102,22 +91,12 @@ def is_acronym(word):
 
 
 # ------------------------
-# 1. Tüm metinlerden özel isimleri çıkar
+# 1. Her dosyayı bir kez oku: temizlenmiş satırları önbelleğe al,
+#    özel isimleri çıkar
 # ------------------------
-for channel_folder in os.listdir(base_path):
-    channel_path = os.path.join(base_path, channel_folder)
-    if not os.path.isdir(channel_path):
-        continue
-
-    txt_files = glob.glob(os.path.join(channel_path, "*.txt"))
-    for file_path in txt_files:
-        with open(file_path, "r", encoding="utf-8") as f:
-            text = f.read()
-            extract_proper_names(text)
+# Korpus belleğe sığmıyorsa: LineCache(spill_path="satir_onbellegi.tmp")
+line_cache = LineCache()
 
-# ------------------------
-# 2. Yanlış kelimeleri bul
-# ------------------------
 for channel_folder in os.listdir(base_path):
     channel_path = os.path.join(base_path, channel_folder)
     if not os.path.isdir(channel_path):
@@ -125,19 +104,22 @@ for channel_folder in os.listdir(base_path):
 
     txt_files = glob.glob(os.path.join(channel_path, "*.txt"))
     for file_path in txt_files:
-        file_name = os.path.basename(file_path)
-        with open(file_path, "r", encoding="utf-8") as f:
-            text = f.read()
-
-        lines = text.splitlines()
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-
-            words = line.split()
-            cleaned_words = [clean_word_keep_apostrophe(w) for w in words]
-
+        with instrumentation.stage("read"):
+            lines = read_cleaned_lines(file_path, clean_word_keep_apostrophe)
+        with instrumentation.stage("proper_names"):
+            for words, cleaned_words in lines:
+                extract_proper_names(cleaned_words)
+        instrumentation.count("files")
+        instrumentation.count("lines", len(lines))
+        instrumentation.count("words", sum(len(words) for words, _ in lines))
+        line_cache.add((channel_folder, os.path.basename(file_path), lines))
+
+# ------------------------
+# 2. Yanlış kelimeleri bul (dosyalar tekrar okunmaz, önbellekten)
+# ------------------------
+with instrumentation.stage("analyze"):
+    for channel_folder, file_name, lines in line_cache:
+        for words, cleaned_words in lines:
             for i, word in enumerate(cleaned_words):
                 if not word:
                     continue
@@ -148,8 +130,8 @@ for channel_folder in os.listdir(base_path):
                 if fsmParseList.size() == 0:
 
                     if (
-                            is_proper_name_with_suffix(word)
-                            or is_proper_name_without_suffix(words[i])
+                            name_filter.match_cleaned(word)
+                            or is_proper_name_without_suffix(word)
                             or is_acronym(words[i])
                     ):
                         continue
@@ -165,6 +147,8 @@ for channel_folder in os.listdir(base_path):
                         "Bağlam": context
                     })
 
+line_cache.close()
+
 # ------------------------
 # stdout'u geri al
 # ------------------------
@@ -173,6 +157,14 @@ sys.stdout = orig_stdout
 # ------------------------
 # CSV olarak kaydet
 # ------------------------
-df = pd.DataFrame(results)
-df.to_csv("yanlis_kelimeler_temiz-04.csv", index=False, encoding="utf-8-sig")
+with instrumentation.stage("write"):
+    df = pd.DataFrame(results)
+    df.to_csv("yanlis_kelimeler_temiz-04.csv", index=False, encoding="utf-8-sig")
 print(f"{len(results)} adet yanlış yazılmış kelime bulundu ve CSV'ye kaydedildi.")
+print(fsm.report())
+
+instrumentation.count("wrong_words", len(results))
+instrumentation.add_stats("fsm", fsm.stats())
+instrumentation.write_report("test_fsm_3_run_report.json")
+print(instrumentation.summary())
+fsm.close()
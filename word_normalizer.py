@@ -0,0 +1,156 @@
+import os
+
+from morphology_db import lexicon_version
+
+
+ROOT_LEXICON_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "root_lexicon.txt")
+
+
+# -------------------------------------------------------
+# Kök sözlüğü (FSM'in kabul ettiği sözlük kelimeleri)
+# -------------------------------------------------------
+def build_root_lexicon(fsm):
+    """
+    Analizörün sözlüğündeki kelimelerden FSM'in parse edebildiklerini toplar.
+    (Sözlükte olup tek başına parse edilemeyen kelimeler, örn. küçük harfli
+    özel isimler, kümeye alınmaz; böylece küme FSM ile aynı cevabı verir.)
+    """
+    dictionary = fsm.fsm.getDictionary()
+    roots = set()
+    for i in range(dictionary.size()):
+        name = dictionary.getWordWithIndex(i).getName()
+        try:
+            if fsm.morphologicalAnalysis(name).size() > 0:
+                roots.add(name)
+        except ValueError:
+            # Bazı sözlük kayıtlarında analizör hata veriyor (örn. bayrak tutarsızlığı);
+            # bu kelimeler kümeye alınmaz, sorulursa FSM'e gidilir
+            continue
+    return roots
+
+
+def load_root_lexicon(fsm, path=ROOT_LEXICON_PATH):
+    """
+    Kök sözlüğünü dosyadan okur; dosya yoksa veya sözlük sürümü değiştiyse
+    yeniden oluşturup kaydeder. İlk satır lexicon_version() anahtarıdır.
+    (İlk oluşturma tüm sözlüğü analiz ettiği için birkaç dakika sürer.)
+    """
+    version = lexicon_version()
+
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        if lines and lines[0] == version:
+            return set(lines[1:])
+
+    roots = build_root_lexicon(fsm)
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(version + "\n")
+        for root in sorted(roots):
+            f.write(root + "\n")
+    os.replace(tmp_path, path)
+    return roots
+
+
+# -------------------------------------------------------
+# Normalizasyon motoru
+# -------------------------------------------------------
+class WordNormalizer:
+    """
+    Normalize_Wrong_Words_Only.py'deki normalize() ile aynı sonucu verir:
+
+        kelime parse ediliyorsa      -> kelime
+        KELİME parse ediliyorsa      -> KELİME
+        ilk kök+ek bölünmesinde kök  -> kök'ek   (veya KÖK'ek)
+        hiçbiri                      -> kelime
+
+    Farkı:
+    - Her farklı kelime bir kez normalize edilir (sonuç ezberlenir)
+    - Kökler önce kök sözlüğü kümesinde aranır, sadece kümede yoksa FSM'e sorulur
+    - FSM'e sorulan her kök/kelimenin cevabı da ezberlenir
+
+    fsm  : CachedFsmAnalyzer
+    roots: FSM'in kabul ettiği kök kümesi (verilmezse load_root_lexicon ile okunur)
+    """
+
+    def __init__(self, fsm, roots=None):
+        self.fsm = fsm
+        self.roots = roots if roots is not None else load_root_lexicon(fsm)
+
+        self._words = {}   # kelime -> normalize sonucu
+        self._known = {}   # kök / kelime -> FSM parse ediyor mu
+
+        self.calls = 0
+        self.word_hits = 0
+        self.lexicon_hits = 0
+        self.known_hits = 0
+        self.fsm_checks = 0
+
+    def _parses(self, text):
+        if text in self.roots:
+            self.lexicon_hits += 1
+            return True
+
+        known = self._known.get(text)
+        if known is not None:
+            self.known_hits += 1
+            return known
+
+        self.fsm_checks += 1
+        known = self.fsm.morphologicalAnalysis(text).size() > 0
+        self._known[text] = known
+        return known
+
+    def _normalize(self, word):
+        if self._parses(word):
+            return word
+
+        word_upper = word.upper()
+        if self._parses(word_upper):
+            return word_upper
+
+        for i in range(1, len(word)):
+            root = word[:i]
+            suffix = word[i:]
+
+            if self._parses(root):
+                return root + "'" + suffix
+
+            root_upper = root.upper()
+            if self._parses(root_upper):
+                return root_upper + "'" + suffix
+
+        return word
+
+    def normalize(self, word):
+        self.calls += 1
+        result = self._words.get(word)
+        if result is not None:
+            self.word_hits += 1
+            return result
+
+        result = self._normalize(word)
+        self._words[word] = result
+        return result
+
+    def stats(self):
+        checks = self.lexicon_hits + self.known_hits + self.fsm_checks
+        return {
+            "calls": self.calls,
+            "distinct_words": len(self._words),
+            "word_hit_rate": self.word_hits / self.calls if self.calls else 0.0,
+            "root_checks": checks,
+            "lexicon_hits": self.lexicon_hits,
+            "known_hits": self.known_hits,
+            "fsm_checks": self.fsm_checks,
+            "lexicon_hit_rate": self.lexicon_hits / checks if checks else 0.0,
+        }
+
+    def report(self):
+        s = self.stats()
+        return (f"Normalizasyon: {s['calls']} kelime, {s['distinct_words']} farklı "
+                f"(ezber isabeti %{s['word_hit_rate'] * 100:.1f}); {s['root_checks']} kök kontrolü: "
+                f"{s['lexicon_hits']} kök sözlüğü + {s['known_hits']} ezber, "
+                f"{s['fsm_checks']} FSM sorgusu (sözlük isabeti %{s['lexicon_hit_rate'] * 100:.1f})")